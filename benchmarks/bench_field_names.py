@@ -0,0 +1,46 @@
+"""Micro-benchmark of checkbox field-name parsing in `MCQPDFParser`.
+
+Parses 10k synthetic field names, as returned by `PdfReader.get_fields`,
+into questions.
+
+    python benchmarks/bench_field_names.py
+"""
+
+import argparse
+import timeit
+import uuid
+
+from mcqpy.compile.fields import checkbox_name
+from mcqpy.grade.parse_pdf import MCQPDFParser
+
+
+def synthetic_fields(n_names: int, n_options: int = 5) -> dict:
+    fields = {"studentname": {"/V": "Name"}, "studentid": {"/V": "ID"}}
+    for index in range(n_names // n_options):
+        qid = str(uuid.UUID(int=index))
+        # Every other slug contains the separators the parser must not split on
+        slug = f"question-{index}" if index % 2 else f"opt-qid-question-{index}"
+        for option in range(n_options):
+            value = "/Yes" if option == index % n_options else "/Off"
+            fields[checkbox_name(index, option, slug, qid)] = {"/V": value}
+    return fields
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--names", type=int, default=10_000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    fields = synthetic_fields(args.names)
+    pdf_parser = MCQPDFParser()
+    n_questions = len(pdf_parser._parse_questions(fields))
+
+    times = timeit.repeat(lambda: pdf_parser._parse_questions(fields), number=1, repeat=args.repeat)
+    best = min(times)
+    print(f"{len(fields) - 2} field names, {n_questions} questions")
+    print(f"best of {args.repeat}: {best * 1e3:.2f} ms ({best / (len(fields) - 2) * 1e9:.0f} ns/name)")
+
+
+if __name__ == "__main__":
+    main()
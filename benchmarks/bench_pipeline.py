@@ -0,0 +1,305 @@
+"""Benchmarks of the quiz pipeline on synthetic question banks and cohorts.
+
+Question banks (1k, 10k and 50k questions by default) are written as YAML
+files to a temporary directory, and cohorts (100, 1k and 10k students) are
+drawn with `CohortSimulator`. Measured are loading the bank, selecting
+questions with each filter type, generating the quiz LaTeX (without running
+TeX), parsing a filled-in PDF, grading and building the grade table.
+
+Results are written as JSON, and an earlier run can be compared against:
+
+    python benchmarks/bench_pipeline.py -o baseline.json
+    python benchmarks/bench_pipeline.py --banks 1000 --cohorts 100 --compare baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from pypdf import PdfWriter
+from pypdf.generic import ArrayObject, DictionaryObject, FloatObject, NameObject, TextStringObject
+
+from mcqpy.compile import MultipleChoiceQuiz
+from mcqpy.compile.fields import checkbox_name
+from mcqpy.compile.manifest import Manifest, ManifestItem
+from mcqpy.grade import MCQGrader, get_grade_dataframe
+from mcqpy.grade.export import get_store_grade_dataframe
+from mcqpy.grade.parse_pdf import MCQPDFParser
+from mcqpy.grade.rubric import RubricFactory
+from mcqpy.grade.simulate import CohortSimulator
+from mcqpy.question import QuestionBank
+from mcqpy.question.filter import FilterFactory
+
+DIFFICULTIES = ["very easy", "easy", "medium", "hard", "very hard"]
+
+QUESTION_TEMPLATE = """\
+slug: bench-question-{index}
+text: |
+  Question {index}: which of the following holds for $f(x) = x^{{{power}}} + \\frac{{1}}{{{index_1}}}$?
+choices:
+- $f'(x) = {power} x^{{{power_1}}}$
+- $f(0) = 0$
+- $f$ is periodic
+- None of the above
+correct_answers: [{correct}]
+question_type: {question_type}
+difficulty: {difficulty}
+tags: [topic-{topic}, week-{week}]
+created_date: {day:02d}/{month:02d}/{year}
+explanation: |
+  Differentiate term by term.
+"""
+
+# Questions per page of a synthetic submission PDF.
+QUESTIONS_PER_PAGE = 4
+
+
+def write_bank(directory: Path, n_questions: int):
+    """Write `n_questions` synthetic question files to `directory`."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for index in range(n_questions):
+        multiple = index % 3 == 0
+        text = QUESTION_TEMPLATE.format(
+            index=index,
+            index_1=index + 1,
+            power=index % 7 + 2,
+            power_1=index % 7 + 1,
+            correct="0, 3" if multiple else index % 4,
+            question_type="multiple" if multiple else "single",
+            difficulty=DIFFICULTIES[index % len(DIFFICULTIES)],
+            topic=index % 20,
+            week=index % 12,
+            day=index % 28 + 1,
+            month=index % 12 + 1,
+            year=2020 + index % 5,
+        )
+        (directory / f"question_{index}.yaml").write_text(text, encoding="utf-8")
+
+
+def filter_configs(bank: QuestionBank) -> dict[str, dict]:
+    """One filter config of each type in `FilterFactory`."""
+    excluded = bank.get_all_questions()[: len(bank) // 10]
+    manifest = Manifest(items=[ManifestItem.from_question(question, permutation=None) for question in excluded])
+    return {
+        "difficulty": {"type": "difficulty", "difficulty": "medium", "operator": ">="},
+        "tag": {"type": "tag", "tags": ["topic-1", "topic-2", "week-3"]},
+        "date": {"type": "date", "date_value": ">=01/01/2022"},
+        "stratified": {
+            "type": "stratified",
+            "number_of_questions": 100,
+            "filter_configs": [
+                {"type": "difficulty", "difficulty": difficulty} for difficulty in ("easy", "medium", "hard")
+            ],
+        },
+        "manifest": {"type": "manifest", "manifest": manifest},
+        "composite": {
+            "type": "composite",
+            "filters": [
+                {"type": "difficulty", "difficulty": "hard", "operator": "<="},
+                {"type": "tag", "tags": ["week-1"], "exclude": True},
+            ],
+        },
+    }
+
+
+def build_manifest(questions) -> Manifest:
+    return Manifest(items=[ManifestItem.from_question(question, permutation=question.permutation) for question in questions])
+
+
+def write_submission(manifest: Manifest, parsed_set, path: Path):
+    """Write a PDF with the answer fields of a filled-in quiz, as made by LaTeX."""
+    writer = PdfWriter()
+    fields = ArrayObject()
+
+    def add_widget(page, name: str, field_type: str, value, rect: tuple[float, float, float, float]):
+        annotation = DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Annot"),
+                NameObject("/Subtype"): NameObject("/Widget"),
+                NameObject("/FT"): NameObject(field_type),
+                NameObject("/T"): TextStringObject(name),
+                NameObject("/V"): value,
+                NameObject("/Rect"): ArrayObject([FloatObject(v) for v in rect]),
+            }
+        )
+        reference = writer._add_object(annotation)
+        page[NameObject("/Annots")].append(reference)
+        fields.append(reference)
+
+    def new_page():
+        page = writer.add_blank_page(width=595, height=842)
+        page[NameObject("/Annots")] = ArrayObject()
+        return page
+
+    page = new_page()
+    add_widget(page, "studentname", "/Tx", TextStringObject(parsed_set.student_name), (100, 750, 400, 770))
+    add_widget(page, "studentid", "/Tx", TextStringObject(parsed_set.student_id), (100, 720, 400, 740))
+    for quiz_index, (item, question) in enumerate(zip(manifest.items, parsed_set.questions)):
+        if quiz_index % QUESTIONS_PER_PAGE == 0:
+            page = new_page()
+        top = 700 - 150 * (quiz_index % QUESTIONS_PER_PAGE)
+        for option, selected in enumerate(question.onehot):
+            name = checkbox_name(quiz_index, option, item.slug, item.qid)
+            value = NameObject("/Yes" if selected else "/Off")
+            add_widget(page, name, "/Btn", value, (80, top - 20 * option, 90, top - 20 * option + 10))
+
+    writer._root_object[NameObject("/AcroForm")] = DictionaryObject({NameObject("/Fields"): fields})
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+class Benchmarks:
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.results = []
+
+    def measure(self, name: str, func, repeat: int | None = None, **params):
+        # The filters report their progress on stdout.
+        with contextlib.redirect_stdout(io.StringIO()):
+            times = timeit.repeat(func, number=1, repeat=repeat or self.repeat)
+        self.results.append(
+            {"name": name, "params": params, "best": min(times), "mean": sum(times) / len(times), "times": times}
+        )
+        described = ", ".join(f"{key}={value}" for key, value in params.items())
+        print(f"{name:<26} {described:<48} best {min(times) * 1e3:10.2f} ms", flush=True)
+
+
+def bench_banks(bench: Benchmarks, directory: Path, sizes: list[int]) -> QuestionBank | None:
+    """Load each bank and select from it with every filter type, returns the largest bank."""
+    bank = None
+    for n_questions in sizes:
+        bank_directory = directory / f"bank_{n_questions}"
+        write_bank(bank_directory, n_questions)
+        # Loading is slow for large banks and has little variance, so it is timed once.
+        bench.measure(
+            "bank.from_directories",
+            lambda: QuestionBank.from_directories([bank_directory]),
+            repeat=1,
+            n_questions=n_questions,
+        )
+        bank = QuestionBank.from_directories([bank_directory])
+
+        def select(config):
+            selection = QuestionBank(bank._items, seed=0)
+            if config is not None:
+                selection.add_filter(FilterFactory.from_config(config))
+            return selection.get_filtered_questions(number_of_questions=100, shuffle=True)
+
+        bench.measure("bank.select", lambda: select(None), n_questions=n_questions, filter="none")
+        for filter_type, config in filter_configs(bank).items():
+            bench.measure("bank.select", lambda: select(config), n_questions=n_questions, filter=filter_type)
+    return bank
+
+
+def bench_latex(bench: Benchmarks, questions, quiz_sizes: list[int]):
+    def generate(quiz_questions):
+        quiz = MultipleChoiceQuiz(questions=quiz_questions)
+        quiz.build(generate_pdf=False)
+        return quiz.dumps()
+
+    for quiz_size in quiz_sizes:
+        bench.measure("quiz.latex", lambda: generate(questions[:quiz_size]), n_questions=min(quiz_size, len(questions)))
+
+
+def bench_grading(bench: Benchmarks, directory: Path, questions, cohort_sizes: list[int], rubric: str):
+    manifest = build_manifest(questions)
+
+    # Parsing, from one synthetic submission, by walking the fields and by the recorded geometry.
+    submission = next(CohortSimulator(manifest, 1, seed=0).parsed_sets())
+    pdf_path = directory / "submission.pdf"
+    write_submission(manifest, submission, pdf_path)
+    walking = MCQPDFParser()
+    bench.measure("grade.parse_pdf", lambda: walking.parse_pdf(pdf_path), n_questions=len(questions), geometry=False)
+    geometry_manifest = manifest.model_copy(deep=True)
+    geometry_manifest.add_field_geometry(pdf_path)
+    direct = MCQPDFParser(geometry_manifest)
+    bench.measure("grade.parse_pdf", lambda: direct.parse_pdf(pdf_path), n_questions=len(questions), geometry=True)
+
+    grader = MCQGrader(manifest, RubricFactory.from_config({"type": rubric}))
+    for n_students in cohort_sizes:
+        simulator = CohortSimulator(manifest, n_students, seed=0)
+        parsed_sets = list(simulator.parsed_sets())
+        store = simulator.answer_store()
+        params = {"n_students": n_students, "n_questions": len(questions), "rubric": rubric}
+
+        graded_sets = [grader.grade(parsed_set=parsed_set) for parsed_set in parsed_sets]
+        bench.measure("grade.grade", lambda: [grader.grade(parsed_set=p) for p in parsed_sets], **params)
+        bench.measure("grade.score_store", lambda: grader.score_store(store), **params)
+        bench.measure("grade.get_grade_dataframe", lambda: get_grade_dataframe(graded_sets), **params)
+        points = grader.score_store(store)
+        bench.measure("grade.store_dataframe", lambda: get_store_grade_dataframe(store, manifest, points), **params)
+
+
+def result_key(result: dict) -> str:
+    return result["name"] + "".join(f" {key}={value}" for key, value in sorted(result["params"].items()))
+
+
+def compare(results: list[dict], baseline_path: Path, threshold: float) -> int:
+    """Print the change of each benchmark from a baseline, returns the number of regressions."""
+    baseline = json.loads(baseline_path.read_text())
+    previous = {result_key(result): result for result in baseline["results"]}
+    print(f"\nCompared with {baseline_path} (mcqpy {baseline.get('mcqpy_version')}, {baseline.get('created')}):")
+    regressions = 0
+    for result in results:
+        key = result_key(result)
+        if key not in previous:
+            continue
+        ratio = result["best"] / previous[key]["best"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key:<74} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--banks", type=int, nargs="+", default=[1_000, 10_000, 50_000], help="Question bank sizes")
+    parser.add_argument("--cohorts", type=int, nargs="+", default=[100, 1_000, 10_000], help="Cohort sizes")
+    parser.add_argument("--quiz-sizes", type=int, nargs="+", default=[50, 500], help="Questions in the generated quizzes")
+    parser.add_argument("-q", "--questions", type=int, default=50, help="Questions in the graded quiz")
+    parser.add_argument("--rubric", choices=["strict", "partial"], default="strict", help="Rubric used for grading")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench_pipeline.json"), help="JSON file for the results")
+    parser.add_argument("--compare", type=Path, default=None, help="JSON results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown counted as a regression")
+    args = parser.parse_args()
+
+    bench = Benchmarks(args.repeat)
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        bank = bench_banks(bench, directory, sorted(args.banks))
+        questions = bank.get_all_questions()
+        bench_latex(bench, questions, args.quiz_sizes)
+        bench_grading(bench, directory, questions[: args.questions], sorted(args.cohorts), args.rubric)
+
+    try:
+        mcqpy_version = version("mcqpy")
+    except PackageNotFoundError:
+        mcqpy_version = None
+    report = {
+        "mcqpy_version": mcqpy_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "args": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "results": bench.results,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.compare is not None and compare(bench.results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
 import os
 
+import pytest
+from click.testing import CliRunner
+
+from mcqpy.cli import autofill_command
+
 def test_autofill_exit_code(autofill_invoke) -> None:
     assert autofill_invoke.exit_code == 0
 
@@ -7,4 +12,12 @@ def test_autofill_pdfs_exist(project_config) -> None:
     submission_dir = project_config.submission_directory
     files = os.listdir(submission_dir)
     pdf_files = [f for f in files if f.endswith(".pdf")]
-    assert len(pdf_files) == 5
\ No newline at end of file
+    assert len(pdf_files) == 5
+
+@pytest.mark.parametrize("options", [["--responses", "irt"], ["--blank-rate", "0.2"]])
+def test_autofill_correct_rejects_response_options(tmp_path, options) -> None:
+    config = tmp_path / "config.yaml"
+    config.touch()
+    result = CliRunner().invoke(autofill_command, ["-c", str(config), "--correct", *options])
+    assert result.exit_code == 2
+    assert "--correct cannot be combined" in result.output
@@ -25,3 +25,45 @@ def test_build_manifest_exists(built_manifest_path) -> None:
 def test_build_manifest_non_empty(built_manifest_path) -> None:
     assert built_manifest_path.stat().st_size > 0
 
+
+
+def test_build_locate_errors_output(mocker, config_path, written_questions, question_set) -> None:
+    import subprocess
+    from click.testing import CliRunner
+    from mcqpy.cli import build_command
+    from mcqpy.compile.error_bisect import BisectResult, FragmentFailure, QuizCompileError
+
+    failure = FragmentFailure([0], [question_set[0]], [], "! Undefined control sequence.\nl.42 \\broken")
+    error = QuizCompileError(subprocess.CalledProcessError(1, "latexmk"), BisectResult([failure], rounds=2, compiles=9))
+    build = mocker.patch("mcqpy.compile.MultipleChoiceQuiz.build", side_effect=error)
+
+    result = CliRunner().invoke(build_command, ["--config", str(config_path), "--locate-errors"])
+    assert result.exit_code == 1
+    assert build.call_args.kwargs["bisect_errors"] is True
+    assert f"LaTeX error in question {question_set[0].slug}" in result.output
+    assert "Undefined control sequence" in result.output
+    assert "2 rounds" in result.output
+
+
+def test_build_profile_trace(mocker, tmp_path, project_config, project_dir, written_questions) -> None:
+    import json
+    from click.testing import CliRunner
+    from mcqpy.cli import build_command
+
+    mocker.patch("pylatex.document.Document.generate_pdf")
+    config = project_config.model_copy(
+        update={
+            "root_directory": str(tmp_path),
+            "questions_paths": [str(project_dir / path) for path in project_config.questions_paths],
+        }
+    )
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(config.yaml_dump())
+    trace = tmp_path / "trace.json"
+
+    result = CliRunner().invoke(build_command, ["--config", str(config_path), "--profile", "--profile-trace", str(trace)])
+    assert result.exit_code == 0, result.output
+    assert "Build profile" in result.output
+
+    names = {event["name"] for event in json.loads(trace.read_text())["traceEvents"]}
+    assert {"bank.load", "question.load_yaml", "bank.filter", "quiz.questions", "quiz.manifest", "solution.compile"} <= names
@@ -0,0 +1,41 @@
+import pytest
+from click.testing import CliRunner
+from mcqpy.cli import calibrate_command
+from mcqpy.cli.config import QuizConfig
+from mcqpy.grade.answer_store import AnswerStore
+from mcqpy.grade.irt import ItemParameterBank
+
+
+@pytest.fixture
+def calibrate_project(tmp_path, monkeypatch, grading_manifest, parsed_set_factory):
+    monkeypatch.chdir(tmp_path)
+    for directory in ["output", "submissions", "questions"]:
+        (tmp_path / directory).mkdir()
+    config = QuizConfig(submission_directory="submissions")
+    (tmp_path / "config.yaml").write_text(config.yaml_dump())
+    grading_manifest.save_to_file(tmp_path / "output" / "quiz_manifest.json")
+    parsed_sets = parsed_set_factory(grading_manifest, n_students=200, seed=2)
+    AnswerStore.from_parsed_sets(parsed_sets).save(tmp_path / "output" / "quiz_answers.npz")
+    return tmp_path
+
+
+def test_calibrate_writes_parameters(calibrate_project, grading_manifest):
+    result = CliRunner().invoke(calibrate_command, ["--model", "1PL"])
+    assert result.exit_code == 0
+    parameters = ItemParameterBank.load_from_file(calibrate_project / "questions" / "irt_parameters.json")
+    assert len(parameters) == len(grading_manifest.items)
+    assert parameters.get(grading_manifest.items[0].qid).slug == grading_manifest.items[0].slug
+
+
+def test_calibrate_manifest_mismatch(calibrate_project):
+    store = str(calibrate_project / "output" / "quiz_answers.npz")
+    manifest = str(calibrate_project / "output" / "quiz_manifest.json")
+    result = CliRunner().invoke(calibrate_command, ["-s", store, "-s", store, "-m", manifest])
+    assert result.exit_code != 0
+
+
+def test_calibrate_stores_need_manifests(calibrate_project):
+    store = str(calibrate_project / "output" / "quiz_answers.npz")
+    result = CliRunner().invoke(calibrate_command, ["-s", store, "-s", store])
+    assert result.exit_code == 2
+    assert "Give one --manifest for each --store." in result.output
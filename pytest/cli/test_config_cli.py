@@ -13,3 +13,11 @@ def test_quiz_config_example() -> None:
     config = QuizConfig.generate_example_yaml()
     assert isinstance(config, str)
 
+
+
+def test_grading_config_rubric() -> None:
+    from mcqpy.grade.rubric import PartialCreditRubric, StrictRubric
+
+    config = QuizConfig(grading={"rubric": "partial", "rubric_options": {"penalty": 0.5}})
+    assert isinstance(config.grading.get_rubric(), PartialCreditRubric)
+    assert isinstance(QuizConfig().grading.get_rubric(), StrictRubric)
@@ -11,4 +11,28 @@ def test_grade_file_exists(grade_invoke, project_dir, project_config) -> None:
 
 def test_analysis_directory_exists(grade_invoke, project_dir) -> None:
     analysis_dir = project_dir / "analysis"
-    assert analysis_dir.exists()
\ No newline at end of file
+    assert analysis_dir.exists()
+
+def test_grade_submissions_ragged_rows(tmp_path, grading_manifest, parsed_set_factory) -> None:
+    from rich.console import Console
+    from mcqpy.cli.grade import _grade_submissions
+    from mcqpy.grade import GradeWriter, MCQGrader, get_grade_dataframe
+    from mcqpy.grade.rubric import StrictRubric
+
+    parsed_sets = parsed_set_factory(grading_manifest, n_students=4, seed=1)
+    parsed_sets[2].questions = parsed_sets[2].questions[:-1]
+    submissions = {tmp_path / f"{index}.pdf": parsed_set for index, parsed_set in enumerate(parsed_sets)}
+    grader = MCQGrader(grading_manifest, StrictRubric())
+    grader.parse = submissions.__getitem__
+
+    path = tmp_path / "grades.csv"
+    results = {}
+    writer = _grade_submissions(grader, list(submissions), results, Console(), progress=False, writer=GradeWriter(path))
+
+    # Streaming is abandoned and every submission is graded in memory instead.
+    assert writer is None
+    assert not path.exists()
+    graded_sets = [graded_set for _, graded_set in results.values()]
+    assert len(graded_sets) == 4 and None not in graded_sets
+    df = get_grade_dataframe(graded_sets)
+    assert df[f"Q{len(grading_manifest.items)}_points"].isna().sum() == 1
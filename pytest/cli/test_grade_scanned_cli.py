@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+from PIL import Image, ImageDraw
+from pypdf import PdfWriter
+from pypdf.generic import ArrayObject, DictionaryObject, FloatObject, NameObject, TextStringObject
+
+from mcqpy.cli import grade_command
+from mcqpy.cli.config import QuizConfig
+
+DPI = 100
+WIDTH, HEIGHT = 595, 842
+
+
+def option_rect(question, option):
+    x0, y0 = 100 + 40 * option, 780 - 40 * question
+    return (x0, y0, x0 + 12, y0 + 12)
+
+
+def write_template(path, manifest):
+    writer = PdfWriter()
+    writer.add_blank_page(width=WIDTH, height=HEIGHT)
+    for index, item in enumerate(manifest.items):
+        for option in range(len(item.correct_onehot)):
+            annotation = DictionaryObject(
+                {
+                    NameObject("/Type"): NameObject("/Annot"),
+                    NameObject("/Subtype"): NameObject("/Widget"),
+                    NameObject("/FT"): NameObject("/Btn"),
+                    NameObject("/T"): TextStringObject(f"Q{index}-opt={option}-slug={item.slug}-qid={item.qid}"),
+                    NameObject("/Rect"): ArrayObject([FloatObject(v) for v in option_rect(index, option)]),
+                }
+            )
+            writer.add_annotation(0, annotation)
+    writer.write(path)
+
+
+def draw_sheet(manifest, answers):
+    image = Image.new("L", (int(WIDTH / 72 * DPI), int(HEIGHT / 72 * DPI)), 255)
+    draw = ImageDraw.Draw(image)
+    scale = DPI / 72
+    for index, item in enumerate(manifest.items):
+        for option in range(len(item.correct_onehot)):
+            x0, y0, x1, y1 = option_rect(index, option)
+            xy = [x0 * scale, (HEIGHT - y1) * scale, x1 * scale, (HEIGHT - y0) * scale]
+            fill = 0 if answers[index][option] else None
+            draw.rectangle(xy, outline=0, fill=fill)
+    return image
+
+
+@pytest.fixture
+def scanned_project(tmp_path, monkeypatch, grading_manifest):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "output").mkdir()
+    (tmp_path / "submissions").mkdir()
+    config = QuizConfig(submission_directory="submissions")
+    (tmp_path / "config.yaml").write_text(config.yaml_dump())
+    grading_manifest.save_to_file(tmp_path / "output" / "quiz_manifest.json")
+    write_template(tmp_path / "output" / config.file_name, grading_manifest)
+
+    correct = [item.correct_onehot for item in grading_manifest.items]
+    blank = [[0] * len(item.correct_onehot) for item in grading_manifest.items]
+    sheets = [draw_sheet(grading_manifest, correct), draw_sheet(grading_manifest, blank)]
+    sheets[0].save(tmp_path / "submissions" / "scan.pdf", save_all=True, append_images=sheets[1:], resolution=DPI)
+    return tmp_path
+
+
+def test_grade_scanned(scanned_project, grading_manifest):
+    result = CliRunner().invoke(grade_command, ["--scanned", "-f", "csv"])
+    assert result.exit_code == 0, result.output
+
+    grades = pd.read_csv(scanned_project / "quiz_grades.csv").set_index("student_id")
+    max_points = sum(item.point_value for item in grading_manifest.items)
+    assert grades.loc["scan-1", "total_points"] == max_points
+    assert grades.loc["scan-2", "total_points"] == 0
+
+
+def test_grade_scanned_watch_not_allowed(scanned_project):
+    result = CliRunner().invoke(grade_command, ["--scanned", "--watch"])
+    assert result.exit_code != 0
@@ -39,11 +39,22 @@ def test_validate_exit_code(validate_question) -> None:
     assert validate_question.exit_code == 0
 
 def test_invalidate_exit_code(invalidate_question) -> None:
-    assert invalidate_question.exit_code == 0
+    assert invalidate_question.exit_code == 1
 
 def test_invalidate_output(invalidate_question) -> None:
     assert "Error loading question" in invalidate_question.output
 
+def test_validate_directory(written_questions) -> None:
+    result = CliRunner().invoke(validate_command, [str(written_questions[0].parent), "--verbose"])
+    assert result.exit_code == 0
+    assert result.output.count("Valid question file") == len(written_questions)
+    assert f"{len(written_questions)}/{len(written_questions)} question files valid" in result.output
+
+def test_validate_no_files(tmp_path) -> None:
+    result = CliRunner().invoke(validate_command, [str(tmp_path / "*.yaml")])
+    assert result.exit_code == 1
+    assert "No question files found" in result.output
+
 def test_init_exit_code(initted_question) -> None:
     assert initted_question[0].exit_code == 0
 
@@ -62,6 +73,14 @@ def test_render_fail_load(mocker, written_questions) -> None:
     result = runner.invoke(render_command, [path])
     assert "Error loading question" in result.output
 
+def test_render_many(mocker, written_questions, tmp_path) -> None:
+    generate_pdf = mocker.patch("pylatex.document.Document.generate_pdf")
+    output = tmp_path / "review.pdf"
+    result = CliRunner().invoke(render_command, [str(written_questions[0].parent), "-o", str(output)])
+    assert result.exit_code == 0
+    assert generate_pdf.call_count == 1
+    assert f"Generated question PDF at: {output}" in result.output.replace("\n", "")
+
 def test_render_fail_render_latex(mocker, written_questions) -> None:
     runner = CliRunner()
     mocker.patch("pylatex.document.Document.generate_pdf", side_effect=CalledProcessError(1, "cmd", "Render failed"))
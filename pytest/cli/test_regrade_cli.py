@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+from mcqpy.cli import regrade_command
+from mcqpy.cli.config import QuizConfig
+from mcqpy.grade.answer_store import AnswerStore
+
+
+@pytest.fixture
+def regrade_project(tmp_path, monkeypatch, grading_manifest, parsed_sets):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "output").mkdir()
+    (tmp_path / "submissions").mkdir()
+    config = QuizConfig(submission_directory="submissions")
+    (tmp_path / "config.yaml").write_text(config.yaml_dump())
+    grading_manifest.save_to_file(tmp_path / "output" / "quiz_manifest.json")
+    AnswerStore.from_parsed_sets(parsed_sets).save(tmp_path / "output" / "quiz_answers.npz")
+    return tmp_path
+
+
+def test_regrade_exit_code(regrade_project):
+    result = CliRunner().invoke(regrade_command, ["-f", "csv"])
+    assert result.exit_code == 0
+
+
+def test_regrade_grades(regrade_project, parsed_sets):
+    CliRunner().invoke(regrade_command, ["-f", "csv"])
+    df = pd.read_csv(regrade_project / "quiz_grades.csv")
+    assert len(df) == len(parsed_sets)
+    assert (df["total_points"] <= df["max_points"]).all()
+
+
+def test_regrade_missing_store(regrade_project):
+    (regrade_project / "output" / "quiz_answers.npz").unlink()
+    result = CliRunner().invoke(regrade_command, ["-f", "csv"])
+    assert result.exit_code != 0
+    assert "run `mcqpy grade` first" in result.output
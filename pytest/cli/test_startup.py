@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time of the CLI, generous enough for slow CI machines
+# while still catching a heavy dependency imported at startup (about 1 s).
+STARTUP_BUDGET = 0.35
+
+HEAVY_MODULES = ["numpy", "pandas", "matplotlib", "pypdf", "pylatex", "pydantic", "yaml"]
+
+
+def import_times(code: str) -> list[tuple[int, float, str]]:
+    """Run `code` under `python -X importtime`, returning (depth, cumulative seconds, module)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        times.append((depth, int(cumulative) / 1e6, name.strip()))
+    return times
+
+
+def test_help_imports_no_heavy_modules():
+    code = (
+        "import sys\n"
+        "from mcqpy.cli.main import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+@pytest.mark.parametrize("code", ["import mcqpy.cli.main", "from mcqpy.cli import main; main.get_command(None, 'question')"])
+def test_startup_budget(code):
+    times = import_times(code)
+    mcqpy_time = sum(cumulative for depth, cumulative, name in times if depth == 0 and name.startswith("mcqpy"))
+    slowest = sorted(times, key=lambda t: t[1], reverse=True)[:10]
+    assert mcqpy_time < STARTUP_BUDGET, f"CLI startup took {mcqpy_time:.3f} s, slowest imports: {slowest}"
@@ -0,0 +1,109 @@
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from mcqpy.compile import MultipleChoiceQuiz
+from mcqpy.compile.error_bisect import QuizCompileError, bisect_compile_errors, split_fragments
+
+
+def quiz_source(questions):
+    quiz = MultipleChoiceQuiz(questions=questions)
+    quiz.build()
+    return quiz.dumps()
+
+
+def fake_compile(tex, name, directory, cwd, compiler):
+    """Fails on \\broken, or when \\pairA and \\pairB are compiled together."""
+    broken = r"\broken" in tex or (r"\pairA" in tex and r"\pairB" in tex) or r"\badpreamble" in tex
+    log = "This is pdfTeX\n! Undefined control sequence.\nl.42 \\broken\n" if broken else "This is pdfTeX\n"
+    return not broken, log
+
+
+@pytest.fixture()
+def fake_compiler(monkeypatch):
+    import mcqpy.compile.error_bisect as error_bisect
+
+    monkeypatch.setattr(error_bisect, "_compile_fragment", fake_compile)
+    monkeypatch.setattr(error_bisect, "process_pool", lambda workers: ThreadPoolExecutor(workers))
+
+
+@pytest.fixture()
+def questions(question_factory):
+    return [question_factory() for _ in range(20)]
+
+
+def with_text(question, text):
+    return question.model_copy(update={"text": text})
+
+
+def test_markers_use_slugs(questions, tmp_path):
+    questions = [
+        question.model_copy(update={"path": tmp_path / f"q{index}.yaml"})
+        for index, question in enumerate(questions)
+    ]
+    tex = quiz_source(questions)
+    assert str(tmp_path) not in tex
+    assert f"%mcqpy-question:0:{questions[0].slug}" in tex
+
+
+def test_split_fragments(questions):
+    head, fragments, tail = split_fragments(quiz_source(questions))
+    assert r"\begin{document}" in head and "Question 1 " not in head
+    assert len(fragments) == len(questions)
+    assert all(f"Question {index + 1} " in fragment for index, fragment in enumerate(fragments))
+    assert tail.startswith(r"\end{document}")
+
+
+@pytest.mark.parametrize("workers, max_rounds", [(1, 6), (4, 3)])
+def test_bisect_finds_broken_question(fake_compiler, questions, workers, max_rounds):
+    questions[13] = with_text(questions[13], r"What is \broken?")
+    result = bisect_compile_errors(quiz_source(questions), questions, workers=workers)
+
+    assert [failure.indices for failure in result.failures] == [[13]]
+    failure = result.failures[0]
+    assert failure.slugs == [questions[13].slug]
+    assert failure.errors[0].message == "Undefined control sequence."
+    assert failure.excerpt.startswith("! Undefined control sequence.")
+    assert result.rounds <= max_rounds
+
+
+def test_bisect_finds_several_questions(fake_compiler, questions):
+    for index in (2, 3, 17):
+        questions[index] = with_text(questions[index], r"What is \broken?")
+    result = bisect_compile_errors(quiz_source(questions), questions, workers=4)
+    assert [failure.indices for failure in result.failures] == [[2], [3], [17]]
+
+
+def test_bisect_questions_failing_together(fake_compiler, questions):
+    questions[0] = with_text(questions[0], r"\pairA")
+    questions[1] = with_text(questions[1], r"\pairB")
+    result = bisect_compile_errors(quiz_source(questions), questions, workers=4)
+    assert [failure.indices for failure in result.failures] == [[0, 1]]
+
+
+def test_bisect_preamble(fake_compiler, questions):
+    tex = quiz_source(questions).replace(r"\begin{document}", "\\badpreamble\n\\begin{document}")
+    result = bisect_compile_errors(tex, questions, workers=4)
+    assert result.rounds == 1
+    assert [failure.questions for failure in result.failures] == [[]]
+
+
+def test_build_bisects_errors(fake_compiler, mocker, questions, tmp_path):
+    questions[5] = with_text(questions[5], r"What is \broken?")
+    mocker.patch(
+        "pylatex.document.Document.generate_pdf",
+        side_effect=subprocess.CalledProcessError(1, "latexmk", b""),
+    )
+    quiz = MultipleChoiceQuiz(file=tmp_path / "quiz.pdf", questions=questions)
+    with pytest.raises(QuizCompileError) as info:
+        quiz.build(generate_pdf=True, bisect_errors=True)
+    assert [failure.indices for failure in info.value.result.failures] == [[5]]
+    assert questions[5].slug in str(info.value)
+
+
+@pytest.mark.requires_latex
+def test_bisect_compiles(questions, tmp_path):
+    questions[7] = with_text(questions[7], r"What is \undefinedmacro?")
+    result = bisect_compile_errors(quiz_source(questions[:10]), questions[:10], cwd=tmp_path)
+    assert [failure.indices for failure in result.failures] == [[7]]
+    assert "Undefined control sequence" in result.failures[0].excerpt
@@ -30,3 +30,9 @@ def test_manifest_get_item(loaded_manifest):
 def test_manifest_get_item_not_found(loaded_manifest):
     with pytest.raises(ValueError, match="Item with qid non_existent_qid not found in manifest"):
         loaded_manifest.get_item_by_qid("non_existent_qid")
+
+@pytest.mark.requires_latex
+def test_manifest_field_geometry(loaded_manifest):
+    assert loaded_manifest.has_field_geometry
+    for item in loaded_manifest.items:
+        assert len(item.option_widgets) == len(item.correct_onehot)
@@ -0,0 +1,106 @@
+import subprocess
+
+import pytest
+from mcqpy.compile.latex_errors import LatexError, locate_errors, parse_latex_log
+from mcqpy.compile.review import QuestionReview, render_questions, render_review
+from mcqpy.question import Question
+
+LOG = r"""This is pdfTeX, Version 3.141592653
+! Undefined control sequence.
+<recently read> \foo
+
+l.LINE What is \foo
+                     ?
+! LaTeX Error: Environment bar undefined.
+
+See the LaTeX manual or LaTeX Companion for explanation.
+l.OTHER \begin{bar}
+
+! Emergency stop.
+"""
+
+
+def make_log(line: int, other: int) -> str:
+    return LOG.replace("LINE", str(line)).replace("OTHER", str(other))
+
+
+@pytest.fixture()
+def review_questions(question_factory, tmp_path):
+    questions = []
+    for index in range(3):
+        path = tmp_path / f"question_{index}.yaml"
+        question_factory().save(path)
+        questions.append(Question.load_yaml(path))
+    return questions
+
+
+def marker_line(tex: str, index: int) -> int:
+    lines = tex.splitlines()
+    return next(n for n, line in enumerate(lines, start=1) if line.startswith(f"%mcqpy-question:{index}:"))
+
+
+def test_parse_latex_log():
+    errors = parse_latex_log(make_log(10, 20))
+    assert errors == [
+        LatexError("Undefined control sequence.", 10, "What is \\foo"),
+        LatexError("LaTeX Error: Environment bar undefined.", 20, "\\begin{bar}"),
+        LatexError("Emergency stop."),
+    ]
+    assert parse_latex_log("./questions.tex:7: Undefined control sequence.\n") == [
+        LatexError("Undefined control sequence.", 7)
+    ]
+
+
+def test_review_document(review_questions):
+    document = QuestionReview(review_questions)
+    document.build()
+    tex = document.dumps()
+    for index, question in enumerate(review_questions):
+        assert marker_line(tex, index) > 0
+        assert rf"\pdfbookmark[0]{{{index + 1}. {question.slug}}}{{question-{index}}}" in tex
+
+
+def test_locate_errors(review_questions):
+    document = QuestionReview(review_questions)
+    document.build()
+    tex = document.dumps()
+    errors = parse_latex_log(make_log(marker_line(tex, 1) + 3, marker_line(tex, 2) + 1))
+    assert [index for index, _ in locate_errors(tex, errors)] == [1, 2, None]
+    assert locate_errors(tex, [LatexError("preamble", 1)]) == [(None, LatexError("preamble", 1))]
+
+
+def test_render_review_maps_errors(mocker, review_questions, tmp_path):
+    def fail(document, filepath, **kwargs):
+        document.generate_tex(str(filepath))
+        tex = filepath.with_suffix(".tex").read_text()
+        filepath.with_suffix(".log").write_text(make_log(marker_line(tex, 2) + 2, marker_line(tex, 0) + 2))
+        raise subprocess.CalledProcessError(1, "latexmk", b"output")
+
+    mocker.patch("pylatex.document.Document.generate_pdf", autospec=True, side_effect=fail)
+    result = render_review(review_questions, tmp_path / "review.pdf")
+    assert result.status == "invalid"
+    assert [(index, error.message) for index, error in result.errors] == [
+        (2, "Undefined control sequence."),
+        (0, "LaTeX Error: Environment bar undefined."),
+        (None, "Emergency stop."),
+    ]
+
+
+def test_render_questions_chunks(mocker, review_questions, tmp_path):
+    generate_pdf = mocker.patch("pylatex.document.Document.generate_pdf", autospec=True)
+    results = render_questions(review_questions, tmp_path / "review.pdf", chunk_size=2, workers=1)
+    assert [result.file.name for result in results] == ["review_1.pdf", "review_2.pdf"]
+    assert [len(result.questions) for result in results] == [2, 1]
+    assert all(result.ok for result in results)
+    assert generate_pdf.call_count == 2
+
+
+@pytest.mark.requires_latex
+def test_render_review_compiles(review_questions, question_factory, tmp_path):
+    result = render_review(review_questions, tmp_path / "review.pdf")
+    assert result.ok and result.file.exists()
+
+    broken = review_questions[1].model_copy(update={"text": r"What is \undefinedmacro?"})
+    result = render_review([review_questions[0], broken, review_questions[2]], tmp_path / "broken.pdf")
+    assert result.status == "invalid"
+    assert result.errors[0][0] == 1
@@ -192,3 +192,116 @@ def built_mcq(mcq):
     mcq.build(generate_pdf=True)
     return mcq
 
+
+################################################################################
+# Synthetic grading fixtures (no LaTeX required)
+################################################################################
+
+@pytest.fixture(scope="session")
+def grading_questions(question_factory):
+    return [question_factory() for _ in range(6)]
+
+
+@pytest.fixture(scope="session")
+def grading_manifest(grading_questions):
+    from mcqpy.compile.manifest import Manifest, ManifestItem
+
+    items = [ManifestItem.from_question(q, permutation=q.permutation) for q in grading_questions]
+    return Manifest(items=items)
+
+
+def make_parsed_sets(manifest, n_students=20, seed=0, shuffle_questions=False):
+    import numpy as np
+    from mcqpy.grade.utils import ParsedQuestion, ParsedSet
+
+    rng = np.random.default_rng(seed)
+    parsed_sets = []
+    for student in range(n_students):
+        questions = []
+        for item in manifest.items:
+            n_options = len(item.correct_onehot)
+            if rng.random() < 0.5:
+                onehot = list(item.correct_onehot)
+            else:
+                onehot = [0] * n_options
+                onehot[rng.integers(n_options)] = 1
+            answers = [i for i, v in enumerate(onehot) if v]
+            questions.append(ParsedQuestion(qid=item.qid, slug=item.slug, answers=answers, onehot=onehot))
+        if shuffle_questions:
+            questions = [questions[i] for i in rng.permutation(len(questions))]
+        parsed_sets.append(
+            ParsedSet(student_id=f"TID{student}", student_name=f"Student {student}", questions=questions)
+        )
+    return parsed_sets
+
+
+@pytest.fixture(scope="session")
+def parsed_sets(grading_manifest):
+    return make_parsed_sets(grading_manifest)
+
+
+@pytest.fixture(scope="session")
+def parsed_set_factory():
+    return make_parsed_sets
+
+
+def make_form_pdf(path, manifest, questions_per_page=3):
+    """Quiz-like PDF with the form fields of `manifest`, without LaTeX."""
+    from pypdf import PdfWriter
+    from pypdf.generic import (
+        ArrayObject,
+        DictionaryObject,
+        FloatObject,
+        NameObject,
+        NumberObject,
+        StreamObject,
+        TextStringObject,
+    )
+
+    def field(name, field_type, rect, value):
+        annotation = DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Annot"),
+                NameObject("/Subtype"): NameObject("/Widget"),
+                NameObject("/FT"): NameObject(field_type),
+                NameObject("/T"): TextStringObject(name),
+                NameObject("/Rect"): ArrayObject([FloatObject(v) for v in rect]),
+                NameObject("/V"): value,
+                NameObject("/F"): NumberObject(4),
+            }
+        )
+        if field_type == "/Btn":
+            appearances = DictionaryObject(
+                {NameObject("/Yes"): StreamObject(), NameObject("/Off"): StreamObject()}
+            )
+            annotation[NameObject("/AP")] = DictionaryObject({NameObject("/N"): appearances})
+            annotation[NameObject("/AS")] = NameObject("/Off")
+        return annotation
+
+    writer = PdfWriter()
+    n_pages = 1 + (len(manifest.items) - 1) // questions_per_page
+    for _ in range(n_pages):
+        writer.add_blank_page(width=595, height=842)
+
+    annotations = [
+        (0, field("studentname", "/Tx", (100, 800, 300, 815), TextStringObject(""))),
+        (0, field("studentid", "/Tx", (100, 780, 300, 795), TextStringObject(""))),
+    ]
+    for index, item in enumerate(manifest.items):
+        page, row = divmod(index, questions_per_page)
+        for option in range(len(item.correct_onehot)):
+            x0, y0 = 100 + 40 * option, 700 - 150 * row
+            name = f"Q{index}-opt={option}-slug={item.slug}-qid={item.qid}"
+            annotations.append((page, field(name, "/Btn", (x0, y0, x0 + 12, y0 + 12), NameObject("/Off"))))
+
+    fields = ArrayObject()
+    for page, annotation in annotations:
+        fields.append(writer.add_annotation(page, annotation).indirect_reference)
+    writer._root_object[NameObject("/AcroForm")] = DictionaryObject({NameObject("/Fields"): fields})
+    writer.write(path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def form_quiz(tmp_path_factory, grading_manifest):
+    return make_form_pdf(tmp_path_factory.mktemp("form_quiz") / "quiz.pdf", grading_manifest)
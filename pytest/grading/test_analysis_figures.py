@@ -0,0 +1,113 @@
+import json
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from mcqpy.grade import MCQGrader
+from mcqpy.grade.analysis import (
+    FIGURE_HASHES_FILE,
+    QuestionFigureData,
+    QuizAnalysis,
+    question_analysis,
+    render_question_figures,
+)
+from mcqpy.grade.cohort import Cohort
+from mcqpy.grade.rubric import StrictRubric
+from mcqpy.question import QuestionBank
+
+
+@pytest.fixture(scope="module")
+def figure_data(grading_manifest, parsed_set_factory):
+    grader = MCQGrader(grading_manifest, StrictRubric())
+    graded_sets = [grader.grade(parsed_set=ps) for ps in parsed_set_factory(grading_manifest, seed=5)]
+    n_questions = len(graded_sets[0].graded_questions)
+    return [
+        QuestionFigureData.from_graded_questions([gs.graded_questions[i] for gs in graded_sets])
+        for i in range(n_questions)
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_render_question_figures(figure_data, tmp_path, workers):
+    names = render_question_figures(figure_data, tmp_path, workers=workers)
+    assert names == [data.name for data in figure_data]
+    for name in names:
+        assert (tmp_path / name).exists()
+    hashes = json.loads((tmp_path / FIGURE_HASHES_FILE).read_text())
+    assert hashes[names[0]] == figure_data[0].digest()
+
+
+@pytest.mark.parametrize("reuse_figure", [True, False])
+def test_render_in_process_leaves_pyplot_alone(figure_data, tmp_path, monkeypatch, reuse_figure):
+    def use(backend, *args, **kwargs):
+        raise AssertionError(f"backend switched to {backend}")
+
+    monkeypatch.setattr(matplotlib, "use", use)
+    figures = plt.get_fignums()
+    render_question_figures(figure_data, tmp_path, workers=1, reuse_figure=reuse_figure)
+    assert plt.get_fignums() == figures
+    for data in figure_data:
+        assert (tmp_path / data.name).exists()
+
+
+def test_render_skips_unchanged(figure_data, tmp_path):
+    render_question_figures(figure_data, tmp_path, workers=1)
+    mtimes = {data.name: (tmp_path / data.name).stat().st_mtime_ns for data in figure_data}
+
+    changed = figure_data[0]
+    changed = QuestionFigureData(changed.slug, changed.answer_sums + 1, changed.correct_answers, changed.scores)
+    render_question_figures([changed] + figure_data[1:], tmp_path, workers=1)
+
+    assert (tmp_path / changed.name).stat().st_mtime_ns != mtimes[changed.name]
+    for data in figure_data[1:]:
+        assert (tmp_path / data.name).stat().st_mtime_ns == mtimes[data.name]
+
+
+def test_render_missing_file_is_rerendered(figure_data, tmp_path):
+    render_question_figures(figure_data, tmp_path, workers=1)
+    (tmp_path / figure_data[0].name).unlink()
+    render_question_figures(figure_data, tmp_path, workers=1)
+    assert (tmp_path / figure_data[0].name).exists()
+
+
+def test_question_analysis(grading_manifest, parsed_sets, tmp_path):
+    grader = MCQGrader(grading_manifest, StrictRubric())
+    graded_questions = [grader.grade(parsed_set=ps).graded_questions[0] for ps in parsed_sets]
+    name = question_analysis(graded_questions, out_directory=tmp_path)
+    assert (tmp_path / name).exists()
+
+
+@pytest.fixture(scope="module")
+def variant_graded_sets(grading_manifest, parsed_set_factory):
+    grader = MCQGrader(grading_manifest, StrictRubric())
+    parsed_sets = parsed_set_factory(grading_manifest, seed=8, shuffle_questions=True)
+    return [grader.grade(parsed_set=ps) for ps in parsed_sets]
+
+
+def test_figure_data_from_cohort_aligns_by_qid(variant_graded_sets):
+    cohort = Cohort.from_graded_sets(variant_graded_sets)
+    for index, qid in enumerate(cohort.qids):
+        graded_questions = [q for gs in variant_graded_sets for q in gs.graded_questions if q.qid == qid]
+        expected = QuestionFigureData.from_graded_questions(graded_questions)
+        data = QuestionFigureData.from_cohort(cohort, index)
+        assert data.digest() == expected.digest()
+
+
+def test_cohort_question_selections_is_view(variant_graded_sets):
+    cohort = Cohort.from_graded_sets(variant_graded_sets)
+    assert np.shares_memory(cohort.question_selections(0), cohort.selections)
+
+
+def test_build_question_analyses_variants(variant_graded_sets, grading_questions, tmp_path):
+    analysis = QuizAnalysis(
+        variant_graded_sets,
+        question_bank=QuestionBank.from_questions(grading_questions),
+        output_dir=tmp_path,
+        workers=1,
+    )
+    analysis.build_question_analyses()
+    for question in grading_questions:
+        assert (tmp_path / "figures" / f"{question.slug}.pdf").exists()
+    latex = analysis.dumps()
+    assert latex.count(r"\section{Question") == len(grading_questions)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from mcqpy.grade.answer_store import AnswerStore
+
+
+@pytest.fixture
+def store(parsed_sets):
+    return AnswerStore.from_parsed_sets(parsed_sets)
+
+
+def test_store_shapes(store, parsed_sets, grading_manifest):
+    assert store.n_students == len(parsed_sets)
+    assert store.n_questions == len(grading_manifest.items)
+    assert store.bits.shape == (len(parsed_sets), store.n_options.sum())
+    assert store.answered.all()
+
+
+def test_store_roundtrip(store, parsed_sets):
+    assert store.to_parsed_sets() == parsed_sets
+
+
+def test_store_save_load(store, parsed_sets, tmp_path):
+    path = tmp_path / "answers.npz"
+    store.save(path)
+    loaded = AnswerStore.load(path)
+    assert np.array_equal(loaded.bits, store.bits)
+    assert loaded.to_parsed_sets() == parsed_sets
+
+
+def test_store_selections_view(store, grading_manifest, parsed_sets):
+    item = grading_manifest.items[2]
+    selections = store.selections(item.qid)
+    assert np.shares_memory(selections, store.bits)
+    assert selections[0].tolist() == [bool(v) for v in parsed_sets[0].questions[2].onehot]
+
+
+def test_store_aligns_by_qid(grading_manifest, parsed_set_factory):
+    ordered = parsed_set_factory(grading_manifest, n_students=5, seed=1)
+    shuffled = parsed_set_factory(grading_manifest, n_students=5, seed=1, shuffle_questions=True)
+    store = AnswerStore.from_parsed_sets(ordered[:1] + shuffled[1:])
+    reference = AnswerStore.from_parsed_sets(ordered)
+    assert np.array_equal(store.bits[0], reference.bits[0])
+    for item in grading_manifest.items:
+        assert store.selections(item.qid).shape[1] == len(item.correct_onehot)
+
+
+def test_store_missing_question(grading_manifest, parsed_set_factory):
+    parsed_sets = parsed_set_factory(grading_manifest, n_students=3)
+    parsed_sets[1].questions.pop(0)
+    parsed_sets[2].student_name = None
+    store = AnswerStore.from_parsed_sets(parsed_sets)
+    assert not store.answered[1, 0]
+    assert store.to_parsed_sets() == parsed_sets
+
+
+def test_store_unknown_qid(store):
+    with pytest.raises(KeyError):
+        store.selections("not-a-qid")
+
+
+def test_store_keeps_question_order(grading_manifest, parsed_set_factory, tmp_path):
+    parsed_sets = parsed_set_factory(grading_manifest, n_students=4, seed=2, shuffle_questions=True)
+    store = AnswerStore.from_parsed_sets(parsed_sets)
+    store.save(tmp_path / "answers.npz")
+    assert AnswerStore.load(tmp_path / "answers.npz").to_parsed_sets() == parsed_sets
+
+    # Without an order the questions follow the columns, i.e. the first submission.
+    legacy = AnswerStore.from_parsed_sets(parsed_sets[:1])
+    legacy.order = None
+    combined = AnswerStore.concatenate([store, legacy])
+    assert combined.to_parsed_sets() == parsed_sets + parsed_sets[:1]
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from mcqpy.compile.manifest import Manifest, ManifestItem
+from mcqpy.grade.answer_store import AnswerStore
+from mcqpy.grade.collusion import (
+    binomial_sf_table,
+    detect_collusion,
+    incorrect_patterns,
+)
+from mcqpy.grade.utils import ParsedQuestion, ParsedSet
+
+
+def make_cohort(n_students=200, n_questions=40, n_options=5, seed=0):
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(n_options, size=n_questions)
+    items = []
+    for index, key in enumerate(keys):
+        onehot = [int(i == key) for i in range(n_options)]
+        items.append(
+            ManifestItem(
+                qid=f"qid-{index}",
+                slug=f"question-{index}",
+                non_permuted_correct_answers=[int(key)],
+                permutation=list(range(n_options)),
+                permuted_correct_answers=[int(key)],
+                correct_onehot=onehot,
+                sha256=None,
+                point_value=1,
+            )
+        )
+
+    ability = rng.normal(size=n_students)
+    p_correct = 1 / (1 + np.exp(-ability[:, None]))
+    choices = np.where(rng.random((n_students, n_questions)) < p_correct, keys, rng.integers(n_options, size=(n_students, n_questions)))
+    # Student 1 copies student 0 on all but a few questions
+    choices[1] = choices[0]
+    choices[1, :5] = keys[:5]
+    # Student 0 answers a lot incorrectly
+    choices[0, 5:30] = (keys[5:30] + 1) % n_options
+    choices[1, 5:30] = choices[0, 5:30]
+
+    parsed_sets = []
+    for student in range(n_students):
+        questions = []
+        for index, item in enumerate(items):
+            onehot = [int(i == choices[student, index]) for i in range(n_options)]
+            questions.append(ParsedQuestion(qid=item.qid, slug=item.slug, answers=[int(choices[student, index])], onehot=onehot))
+        parsed_sets.append(ParsedSet(student_id=f"TID{student}", student_name=f"Student {student}", questions=questions))
+    return AnswerStore.from_parsed_sets(parsed_sets), Manifest(items=items)
+
+
+@pytest.fixture(scope="module")
+def cohort():
+    return make_cohort()
+
+
+def test_detect_collusion_flags_copier(cohort):
+    store, manifest = cohort
+    pairs = detect_collusion(store, manifest)
+    assert len(pairs) >= 1
+    top = pairs.iloc[0]
+    assert {top.student_id_a, top.student_id_b} == {"TID0", "TID1"}
+    assert top.shared_incorrect >= 25
+    assert top.adjusted_p_value < 0.001
+
+
+def test_detect_collusion_block_size_invariant(cohort):
+    store, manifest = cohort
+    full = detect_collusion(store, manifest, alpha=np.inf, min_shared=1)
+    blocked = detect_collusion(store, manifest, alpha=np.inf, min_shared=1, block_size=7)
+    assert len(full) == len(blocked)
+    assert np.allclose(np.sort(full.p_value), np.sort(blocked.p_value))
+
+
+def test_shared_counts_match_dense(cohort):
+    store, manifest = cohort
+    patterns, incorrect, _ = incorrect_patterns(store, manifest)
+    pairs = detect_collusion(store, manifest, alpha=np.inf, min_shared=1, block_size=13)
+    index = {sid: i for i, sid in enumerate(store.student_ids)}
+    shared = patterns.astype(int) @ patterns.T.astype(int)
+    both = incorrect.astype(int) @ incorrect.T.astype(int)
+    for row in pairs.head(50).itertuples():
+        a, b = index[row.student_id_a], index[row.student_id_b]
+        assert row.shared_incorrect == shared[a, b]
+        assert row.both_incorrect == both[a, b]
+    assert len(pairs) == np.triu(shared >= 1, k=1).sum()
+
+
+def test_blank_answers_not_incorrect(grading_manifest):
+    questions = [
+        ParsedQuestion(qid=item.qid, slug=item.slug, answers=[], onehot=[0] * len(item.correct_onehot))
+        for item in grading_manifest.items
+    ]
+    parsed_sets = [ParsedSet(student_id=str(i), student_name=None, questions=questions) for i in range(3)]
+    store = AnswerStore.from_parsed_sets(parsed_sets)
+    patterns, incorrect, _ = incorrect_patterns(store, grading_manifest)
+    assert patterns.shape == (3, 0)
+    assert not incorrect.any()
+    assert detect_collusion(store, grading_manifest).empty
+
+
+def test_binomial_sf_table():
+    table = binomial_sf_table(4, 0.5)
+    assert table[4, 0] == pytest.approx(1.0)
+    assert table[4, 4] == pytest.approx(1 / 16)
+    assert table[4, 3] == pytest.approx(5 / 16)
+    assert table[2, 3] == 0.0
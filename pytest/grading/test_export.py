@@ -0,0 +1,96 @@
+import pytest
+from mcqpy.grade import GradeWriter, MCQGrader, get_grade_dataframe
+from mcqpy.grade.answer_store import AnswerStore
+from mcqpy.grade.export import get_selection_dataframe, write_grades
+from mcqpy.grade.rubric import StrictRubric
+
+
+@pytest.fixture(scope="module")
+def graded_sets(grading_manifest, parsed_set_factory):
+    grader = MCQGrader(grading_manifest, StrictRubric())
+    parsed_sets = parsed_set_factory(grading_manifest, n_students=25, seed=3)
+    parsed_sets[4].student_name = None
+    parsed_sets[7].student_name = "Doe, Jane"
+    return [grader.grade(parsed_set=ps) for ps in parsed_sets[::-1]]
+
+
+def test_grade_dataframe_columns(graded_sets, grading_manifest):
+    df = get_grade_dataframe(graded_sets)
+    assert len(df) == len(graded_sets)
+    assert f"Q{len(grading_manifest.items)}_points" in df.columns
+
+
+@pytest.mark.parametrize("sort", [True, False])
+def test_grade_writer_matches_dataframe(graded_sets, tmp_path, sort):
+    expected_path = tmp_path / "expected.csv"
+    get_grade_dataframe(graded_sets, sort=sort).to_csv(expected_path, index=False)
+
+    path = tmp_path / "streamed.csv"
+    with GradeWriter(path) as writer:
+        for graded_set in graded_sets:
+            writer.write(graded_set)
+        writer.close(sort_by="student_name" if sort else None)
+
+    assert writer.rows == len(graded_sets)
+    assert path.read_bytes() == expected_path.read_bytes()
+
+
+def test_regrade_table_matches_grade(grading_manifest, parsed_set_factory, tmp_path):
+    # Every student sees the questions in their own order, as with shuffled variants.
+    parsed_sets = parsed_set_factory(grading_manifest, n_students=15, seed=8, shuffle_questions=True)
+    grader = MCQGrader(grading_manifest, StrictRubric())
+    graded = get_grade_dataframe([grader.grade(parsed_set=ps) for ps in parsed_sets])
+
+    path = tmp_path / "answers.npz"
+    AnswerStore.from_parsed_sets(parsed_sets).save(path)
+    regraded = get_grade_dataframe(grader.grade_store(AnswerStore.load(path)))
+    assert regraded.equals(graded)
+
+
+def test_grade_writer_rejects_ragged_rows(graded_sets, tmp_path):
+    short = graded_sets[1]
+    short = type(short)(
+        student_id=short.student_id,
+        student_name=short.student_name,
+        graded_questions=short.graded_questions[:-1],
+    )
+    with GradeWriter(tmp_path / "grades.csv") as writer:
+        writer.write(graded_sets[0])
+        with pytest.raises(ValueError):
+            writer.write(short)
+
+
+def test_selection_dataframe(graded_sets, grading_manifest):
+    df = get_selection_dataframe(graded_sets)
+    assert len(df) == len(graded_sets) * len(grading_manifest.items)
+    assert df["qid"].dtype == "category"
+    assert df["selected"].dtype == "uint32"
+
+    first = graded_sets[0].graded_questions[0]
+    row = df.iloc[0]
+    assert row["selected"] == sum(1 << i for i, v in enumerate(first.student_answers) if v)
+    assert row["correct"] == sum(1 << i for i, v in enumerate(first.correct_answers) if v)
+    assert row["points"] == first.point_value
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "feather"])
+def test_write_columnar_grades(graded_sets, tmp_path, file_format):
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    path = tmp_path / f"grades.{file_format}"
+    write_grades(graded_sets, path, file_format)
+
+    read = pd.read_parquet if file_format == "parquet" else pd.read_feather
+    grades = read(path)
+    expected = get_grade_dataframe(graded_sets).reset_index(drop=True)
+    assert grades["student_id"].tolist() == expected["student_id"].tolist()
+    assert grades["total_points"].tolist() == expected["total_points"].tolist()
+
+    selections = read(tmp_path / f"grades_selections.{file_format}")
+    assert len(selections) == len(get_selection_dataframe(graded_sets))
+
+
+def test_write_grades_unknown_format(graded_sets, tmp_path):
+    with pytest.raises(ValueError):
+        write_grades(graded_sets, tmp_path / "grades.txt", "txt")
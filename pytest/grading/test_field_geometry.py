@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from pypdf import PdfWriter
+from mcqpy.compile.manifest import Manifest
+from mcqpy.grade.omr import SheetLayout
+from mcqpy.grade.parse_pdf import MCQPDFParser
+
+
+@pytest.fixture(scope="module")
+def geometry_manifest(grading_manifest, form_quiz):
+    manifest = grading_manifest.model_copy(deep=True)
+    manifest.add_field_geometry(form_quiz)
+    return manifest
+
+
+def fill_form(form_quiz, path, manifest, seed=0):
+    rng = np.random.default_rng(seed)
+    writer = PdfWriter(clone_from=form_quiz)
+    values = {"studentname": "Student Name", "studentid": "TID1"}
+    for index, item in enumerate(manifest.items):
+        option = int(rng.integers(len(item.correct_onehot)))
+        values[f"Q{index}-opt={option}-slug={item.slug}-qid={item.qid}"] = "/Yes"
+    writer.update_page_form_field_values(None, values, auto_regenerate=False)
+    writer.write(path)
+    return path
+
+
+def test_add_field_geometry(geometry_manifest, grading_manifest):
+    assert not grading_manifest.has_field_geometry
+    assert geometry_manifest.has_field_geometry
+    assert len(geometry_manifest.page_boxes) == 2
+    assert set(geometry_manifest.text_fields) == {"studentname", "studentid"}
+    for item in geometry_manifest.items:
+        assert len(item.option_widgets) == len(item.correct_onehot)
+        page, annotation, x0, y0, x1, y1 = item.option_widgets[0]
+        assert x1 - x0 == pytest.approx(12)
+
+
+def test_field_geometry_round_trip(geometry_manifest, tmp_path):
+    path = tmp_path / "manifest.json"
+    geometry_manifest.save_to_file(path)
+    loaded = Manifest.load_from_file(path)
+    assert loaded.has_field_geometry
+    assert loaded.items[0].option_widgets == geometry_manifest.items[0].option_widgets
+
+
+def answers(parsed_set):
+    return sorted((q.qid, q.answers, q.onehot) for q in parsed_set.questions)
+
+
+def test_parser_with_geometry_matches_field_walk(geometry_manifest, form_quiz, tmp_path):
+    path = fill_form(form_quiz, tmp_path / "filled.pdf", geometry_manifest)
+    direct = MCQPDFParser(geometry_manifest).parse_pdf(path)
+    walked = MCQPDFParser().parse_pdf(path)
+    assert direct.student_name == walked.student_name == "Student Name"
+    assert direct.student_id == walked.student_id == "TID1"
+    assert direct.questions == walked.questions
+    assert [q.slug for q in direct.questions] == [item.slug for item in geometry_manifest.items]
+
+
+def test_parser_falls_back_when_fields_moved(geometry_manifest, form_quiz, tmp_path):
+    path = fill_form(form_quiz, tmp_path / "filled.pdf", geometry_manifest, seed=3)
+    moved = geometry_manifest.model_copy(deep=True)
+    moved.items = [
+        item.model_copy(update={"option_widgets": [(p, a + 1, *r) for p, a, *r in item.option_widgets]})
+        for item in moved.items
+    ]
+    parsed = MCQPDFParser(moved).parse_pdf(path)
+    expected = MCQPDFParser().parse_pdf(path)
+    assert answers(parsed) == answers(expected)
+
+
+def test_parser_falls_back_on_truncated_submission(geometry_manifest, form_quiz, tmp_path):
+    path = fill_form(form_quiz, tmp_path / "filled.pdf", geometry_manifest, seed=4)
+    writer = PdfWriter(clone_from=path)
+    del writer.pages[-1]
+    writer.write(path)
+    parsed = MCQPDFParser(geometry_manifest).parse_pdf(path)
+    expected = MCQPDFParser().parse_pdf(path)
+    assert answers(parsed) == answers(expected)
+
+
+def test_sheet_layout_from_manifest(geometry_manifest, form_quiz):
+    from_manifest = SheetLayout.from_manifest(geometry_manifest)
+    from_pdf = SheetLayout.from_pdf(form_quiz)
+    assert from_manifest.qids == from_pdf.qids
+    assert np.array_equal(from_manifest.box_page, from_pdf.box_page)
+    assert np.allclose(from_manifest.box_rect, from_pdf.box_rect)
+
+
+def test_sheet_layout_requires_geometry(grading_manifest):
+    with pytest.raises(ValueError):
+        SheetLayout.from_manifest(grading_manifest)
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from mcqpy.grade.answer_store import AnswerStore
+from mcqpy.grade.irt import (
+    ItemParameterBank,
+    fit_irt,
+    responses_from_store,
+    stack_responses,
+)
+
+
+def simulate_responses(n_persons, n_items, seed=0, missing=0.0):
+    rng = np.random.default_rng(seed)
+    discrimination = rng.lognormal(0, 0.3, n_items)
+    difficulty = rng.normal(0, 1, n_items)
+    ability = rng.normal(0, 1, n_persons)
+    p = 1 / (1 + np.exp(-discrimination * (ability[:, None] - difficulty)))
+    responses = (rng.random(p.shape) < p).astype(float)
+    responses[rng.random(p.shape) < missing] = np.nan
+    return discrimination, difficulty, responses
+
+
+@pytest.fixture(scope="module")
+def simulated():
+    return simulate_responses(3000, 25, missing=0.2)
+
+
+def test_fit_2pl_recovers_parameters(simulated):
+    discrimination, difficulty, responses = simulated
+    result = fit_irt(responses, model="2PL")
+    assert result.converged
+    assert np.corrcoef(difficulty, result.difficulty)[0, 1] > 0.98
+    assert np.corrcoef(discrimination, result.discrimination)[0, 1] > 0.8
+    assert np.abs(difficulty - result.difficulty).mean() < 0.2
+
+
+def test_fit_1pl(simulated):
+    _, difficulty, responses = simulated
+    result = fit_irt(responses, model="1PL")
+    assert np.all(result.discrimination == 1)
+    assert np.corrcoef(difficulty, result.difficulty)[0, 1] > 0.95
+
+
+def test_fit_counts_responses(simulated):
+    _, _, responses = simulated
+    result = fit_irt(responses, max_iter=2)
+    assert np.array_equal(result.n_responses, (~np.isnan(responses)).sum(axis=0))
+
+
+def test_fit_unknown_model(simulated):
+    with pytest.raises(ValueError):
+        fit_irt(simulated[2], model="3PL")
+
+
+def test_responses_from_store(grading_manifest, parsed_sets):
+    store = AnswerStore.from_parsed_sets(parsed_sets)
+    qids, responses = responses_from_store(store, grading_manifest)
+    assert qids == [item.qid for item in grading_manifest.items]
+    expected = [
+        float(q.onehot == item.correct_onehot)
+        for q, item in zip(parsed_sets[0].questions, grading_manifest.items)
+    ]
+    assert responses[0].tolist() == expected
+
+
+def test_stack_responses():
+    qids, responses = stack_responses(
+        [(["a", "b"], np.array([[1.0, 0.0]])), (["b", "c"], np.array([[1.0, 1.0], [0.0, 1.0]]))]
+    )
+    assert qids == ["a", "b", "c"]
+    assert responses.shape == (3, 3)
+    assert np.isnan(responses[0, 2]) and np.isnan(responses[1, 0])
+    assert responses[:, 1].tolist() == [0.0, 1.0, 0.0]
+
+
+def test_item_parameter_bank(simulated, tmp_path):
+    result = fit_irt(simulated[2][:, :3], max_iter=5)
+    bank = ItemParameterBank()
+    bank.update(["a", "b", "c"], result, slugs=["slug-a", None, "slug-c"])
+    path = tmp_path / "irt_parameters.json"
+    bank.save_to_file(path)
+
+    loaded = ItemParameterBank.load_from_file(path)
+    assert len(loaded) == 3
+    assert "b" in loaded
+    assert loaded.get("a").slug == "slug-a"
+    assert loaded.get("c").difficulty == pytest.approx(result.difficulty[2])
@@ -0,0 +1,136 @@
+import time
+
+import numpy as np
+import pytest
+from mcqpy.grade import MCQGrader
+from mcqpy.grade.cohort import Cohort
+from mcqpy.grade.item_statistics import item_statistics, reliability_statistics
+from mcqpy.grade.rubric import StrictRubric
+
+
+@pytest.fixture(scope="module")
+def graded_sets(grading_manifest, parsed_set_factory):
+    grader = MCQGrader(grading_manifest, StrictRubric())
+    parsed_sets = parsed_set_factory(grading_manifest, n_students=40, seed=11)
+    return [grader.grade(parsed_set=ps) for ps in parsed_sets]
+
+
+@pytest.fixture(scope="module")
+def cohort(graded_sets):
+    return Cohort.from_graded_sets(graded_sets)
+
+
+def random_cohort(n_students, n_questions, n_options=4, seed=0):
+    rng = np.random.default_rng(seed)
+    ability = rng.normal(size=(n_students, 1))
+    difficulty = rng.normal(size=(1, n_questions))
+    correct = rng.random((n_students, n_questions)) < 1 / (1 + np.exp(difficulty - ability))
+    keys = np.zeros((n_questions, n_options), dtype=bool)
+    keys[:, 0] = True
+    selections = np.zeros((n_students, n_questions, n_options), dtype=bool)
+    wrong = rng.integers(1, n_options, size=(n_students, n_questions))
+    choice = np.where(correct, 0, wrong)
+    np.put_along_axis(selections, choice[..., None], True, axis=2)
+    return Cohort(
+        student_ids=[f"TID{i}" for i in range(n_students)],
+        student_names=[f"Student {i}" for i in range(n_students)],
+        qids=[f"q{i}" for i in range(n_questions)],
+        slugs=[f"slug-{i}" for i in range(n_questions)],
+        n_options=np.full(n_questions, n_options),
+        selections=selections,
+        keys=keys,
+        points=correct.astype(float),
+        max_points=np.ones(n_questions),
+        answered=np.ones((n_students, n_questions), dtype=bool),
+    )
+
+
+def test_cohort_shapes(cohort, graded_sets, grading_manifest):
+    assert cohort.points.shape == (len(graded_sets), len(grading_manifest.items))
+    assert np.allclose(cohort.totals, [gs.points for gs in graded_sets])
+
+
+def test_cohort_aligns_by_qid(graded_sets, cohort):
+    reordered = [
+        type(gs)(gs.student_id, gs.student_name, gs.graded_questions[::-1], gs.points, gs.max_points)
+        for gs in graded_sets
+    ]
+    reordered_cohort = Cohort.from_graded_sets(graded_sets[:1] + reordered[1:])
+    assert reordered_cohort.qids == cohort.qids
+    assert np.array_equal(reordered_cohort.selections, cohort.selections)
+
+
+def test_item_statistics_difficulty(cohort, graded_sets):
+    df = item_statistics(cohort)
+    expected = np.mean([gs.graded_questions[0].point_value / gs.graded_questions[0].max_point_value for gs in graded_sets])
+    assert df.loc[0, "difficulty"] == pytest.approx(expected)
+
+
+def test_item_statistics_point_biserial(cohort):
+    df = item_statistics(cohort)
+    item = cohort.points[:, 2]
+    rest = cohort.totals - item
+    assert df.loc[2, "point_biserial"] == pytest.approx(np.corrcoef(item, rest)[0, 1])
+
+
+def test_item_statistics_option_rates(cohort):
+    df = item_statistics(cohort)
+    rates = df.loc[:, [c for c in df.columns if c.startswith("option_")]].to_numpy()
+    assert np.allclose(rates, cohort.selections.mean(axis=0))
+
+
+def test_item_statistics_discrimination():
+    cohort = random_cohort(400, 20)
+    df = item_statistics(cohort)
+    assert (df["discrimination"] > 0).mean() > 0.9
+    assert (df["point_biserial"] > 0).mean() > 0.9
+
+
+def test_item_statistics_missing_question():
+    cohort = random_cohort(200, 5, seed=4)
+    missing = np.arange(cohort.n_students) % 4 == 0
+    cohort.answered[missing, 1] = False
+    cohort.points[missing, 1] = 0.0
+    cohort.selections[missing, 1] = False
+
+    df = item_statistics(cohort, group_fraction=0.5)
+    present = ~missing
+    assert df.loc[1, "n_answered"] == present.sum()
+    assert df.loc[1, "difficulty"] == pytest.approx(cohort.points[present, 1].mean())
+    rates = df.loc[1, [c for c in df.columns if c.startswith("option_")]].to_numpy(dtype=float)
+    assert np.allclose(rates, cohort.selections[present, 1].mean(axis=0))
+    rest = cohort.totals - cohort.points[:, 1]
+    assert df.loc[1, "point_biserial"] == pytest.approx(np.corrcoef(cohort.points[present, 1], rest[present])[0, 1])
+
+    order = np.argsort(cohort.totals, kind="stable")
+    upper, lower = order[100:], order[:100]
+    expected = cohort.points[upper[present[upper]], 1].mean() - cohort.points[lower[present[lower]], 1].mean()
+    assert df.loc[1, "discrimination"] == pytest.approx(expected)
+
+
+def test_reliability_statistics():
+    cohort = random_cohort(400, 20)
+    summary = reliability_statistics(cohort)
+    # Dichotomous items: KR-20 and alpha coincide
+    assert summary["kr20"] == pytest.approx(summary["cronbach_alpha"])
+    assert 0 < summary["cronbach_alpha"] < 1
+    assert summary["sem"] == pytest.approx(summary["std"] * np.sqrt(1 - summary["cronbach_alpha"]))
+
+
+def test_item_statistics_scales():
+    cohort = random_cohort(5000, 200)
+    start = time.perf_counter()
+    item_statistics(cohort)
+    reliability_statistics(cohort)
+    assert time.perf_counter() - start < 5
+
+
+def test_quiz_analysis_item_section(graded_sets, tmp_path):
+    from mcqpy.grade.analysis import QuizAnalysis
+    from mcqpy.question import QuestionBank
+
+    analysis = QuizAnalysis(graded_sets, question_bank=QuestionBank([]), output_dir=tmp_path)
+    analysis.build_item_statistics()
+    latex = analysis.dumps()
+    assert "Item Statistics" in latex
+    assert "Cronbach" in latex
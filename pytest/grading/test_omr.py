@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, DictionaryObject, FloatObject, NameObject, TextStringObject
+
+from mcqpy.compile.fields import parse_checkbox_name, read_checkbox_widgets
+from mcqpy.grade.omr import OMRParser, SheetLayout, fill_ratios
+
+DPI = 100
+PAGE = (0.0, 0.0, 595.0, 842.0)
+
+
+def checkbox_name(index, option, slug, qid):
+    return f"Q{index}-opt={option}-slug={slug}-qid={qid}"
+
+
+@pytest.fixture(scope="module")
+def layout():
+    # Two pages with three questions of four options, the first page holds one
+    rng = np.random.default_rng(0)
+    widgets_per_page = {0: [0], 1: [1, 2]}
+    names, page_boxes, rects, pages = [], [PAGE, PAGE], [], []
+    for page, questions in widgets_per_page.items():
+        for row, index in enumerate(questions):
+            for option in range(4):
+                x0, y0 = 100 + 60 * option, 700 - 120 * row
+                rects.append((x0, y0, x0 + 12, y0 + 12))
+                names.append(checkbox_name(index, option, f"slug-{index}", f"qid{rng.integers(1000)}-{index}"))
+                pages.append(page)
+
+    from mcqpy.compile.fields import CheckboxWidget
+    widgets = [CheckboxWidget(name, page, 0, rect, *parse_checkbox_name(name)) for name, page, rect in zip(names, pages, rects)]
+    return SheetLayout.from_widgets(widgets, page_boxes)
+
+
+def draw_sheet(layout, selected, marks="fill"):
+    """Images of one answer sheet with the `selected` boxes marked."""
+    width, height = int(PAGE[2] / 72 * DPI), int(PAGE[3] / 72 * DPI)
+    images = [Image.new("L", (width, height), 255) for _ in range(layout.n_pages)]
+    draws = [ImageDraw.Draw(image) for image in images]
+    scale = DPI / 72
+    for box, (x0, y0, x1, y1) in enumerate(layout.box_rect):
+        draw = draws[layout.box_page[box]]
+        xy = [x0 * scale, (PAGE[3] - y1) * scale, x1 * scale, (PAGE[3] - y0) * scale]
+        draw.rectangle(xy, outline=0, width=1)
+        if selected[box]:
+            if marks == "fill":
+                draw.rectangle(xy, fill=30)
+            else:
+                draw.line(xy, fill=0, width=4)
+                draw.line([xy[0], xy[3], xy[2], xy[1]], fill=0, width=4)
+    return images
+
+
+def write_scan(path, sheets):
+    pages = [image for sheet in sheets for image in sheet]
+    pages[0].save(path, save_all=True, append_images=pages[1:], resolution=DPI)
+
+
+@pytest.fixture(scope="module")
+def scan(layout, tmp_path_factory):
+    rng = np.random.default_rng(1)
+    selections = rng.random((5, len(layout.box_page))) < 0.3
+    sheets = [draw_sheet(layout, sel, marks="fill" if i % 2 else "cross") for i, sel in enumerate(selections)]
+    path = tmp_path_factory.mktemp("scans") / "batch.pdf"
+    write_scan(path, sheets)
+    return path, selections
+
+
+def test_layout_from_widgets(layout):
+    assert layout.n_pages == 2
+    assert layout.slugs == ["slug-0", "slug-1", "slug-2"]
+    assert layout.n_options.tolist() == [4, 4, 4]
+    assert layout.box_page.tolist() == [0] * 4 + [1] * 8
+
+
+def test_fill_ratios(layout):
+    selected = np.zeros(len(layout.box_page), dtype=bool)
+    selected[[0, 3]] = True
+    image = np.asarray(draw_sheet(layout, selected)[0])
+    boxes = layout.box_page == 0
+    ratios = fill_ratios(image, PAGE, layout.box_rect[boxes])
+    assert ratios[0] > 0.9 and ratios[3] > 0.9
+    assert ratios[1] < 0.05 and ratios[2] < 0.05
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_batch(layout, scan, workers):
+    path, selections = scan
+    parsed_sets = OMRParser(layout, workers=workers).parse_batch([path])
+    assert len(parsed_sets) == len(selections)
+    for sheet, (parsed_set, selected) in enumerate(zip(parsed_sets, selections)):
+        assert parsed_set.student_id == f"batch-{sheet + 1}"
+        assert [q.qid for q in parsed_set.questions] == layout.qids
+        onehot = np.concatenate([q.onehot for q in parsed_set.questions])
+        assert onehot.tolist() == selected.astype(int).tolist()
+        for question in parsed_set.questions:
+            assert question.answers == np.flatnonzero(question.onehot).tolist()
+
+
+def test_parse_incomplete_sheet(layout, tmp_path):
+    path = tmp_path / "partial.pdf"
+    write_scan(path, [draw_sheet(layout, np.zeros(len(layout.box_page), dtype=bool))[:1]])
+    with pytest.raises(ValueError):
+        OMRParser(layout, workers=1).parse_pdf(path)
+
+
+def test_read_checkbox_widgets(tmp_path):
+    writer = PdfWriter()
+    writer.add_blank_page(width=PAGE[2], height=PAGE[3])
+    writer.add_blank_page(width=PAGE[2], height=PAGE[3])
+    names = [checkbox_name(0, 0, "a-qid-opt=1", "x1"), checkbox_name(0, 1, "a-qid-opt=1", "x1"), "studentname"]
+    for page, (name, rect) in enumerate(zip(names, [(10, 20, 22, 32), (40, 20, 52, 32), (10, 50, 200, 70)])):
+        annotation = DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Annot"),
+                NameObject("/Subtype"): NameObject("/Widget"),
+                NameObject("/FT"): NameObject("/Btn"),
+                NameObject("/T"): TextStringObject(name),
+                NameObject("/Rect"): ArrayObject([FloatObject(v) for v in rect]),
+            }
+        )
+        writer.add_annotation(min(page, 1), annotation)
+    path = tmp_path / "quiz.pdf"
+    writer.write(path)
+
+    widgets, page_boxes = read_checkbox_widgets(PdfReader(path))
+    assert len(page_boxes) == 2
+    assert [(w.page, w.option, w.slug, w.qid) for w in widgets] == [(0, 0, "a-qid-opt=1", "x1"), (1, 1, "a-qid-opt=1", "x1")]
+    assert widgets[0].rect == (10, 20, 22, 32)
+
+
+def test_parse_checkbox_name():
+    assert parse_checkbox_name("Q12-opt=3-slug=my-slug-qid=abc-123") == (12, 3, "my-slug", "abc-123")
+    assert parse_checkbox_name("studentname") is None
@@ -0,0 +1,99 @@
+import pytest
+from mcqpy.grade.cache import ParseCache, compute_file_sha256
+from mcqpy.grade.utils import ParsedQuestion, ParsedSet
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        return ParsedSet(
+            student_id=f"ID-{path.stem}",
+            student_name="Test Student",
+            questions=[ParsedQuestion(qid="q1", slug="s1", answers=[1], onehot=[0, 1])],
+            file=str(path),
+        )
+
+
+@pytest.fixture
+def submissions(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"submission_{i}.pdf"
+        path.write_bytes(f"content {i}".encode())
+        paths.append(path)
+    return paths
+
+
+def test_file_sha256_depends_on_content(submissions):
+    hashes = {compute_file_sha256(p) for p in submissions}
+    assert len(hashes) == len(submissions)
+
+
+def test_cache_reuses_parsed_sets(tmp_path, submissions):
+    parser = CountingParser()
+    cache_path = tmp_path / "cache.json"
+
+    cache = ParseCache(cache_path, parser_version="1")
+    first = [cache.parse(p, parser) for p in submissions]
+    cache.save()
+    assert parser.calls == 3
+
+    cache = ParseCache(cache_path, parser_version="1")
+    second = [cache.parse(p, parser) for p in submissions]
+    assert parser.calls == 3
+    assert cache.hits == 3
+    assert first == second
+
+
+def test_cache_reparses_changed_file(tmp_path, submissions):
+    parser = CountingParser()
+    cache_path = tmp_path / "cache.json"
+
+    cache = ParseCache(cache_path, parser_version="1")
+    for p in submissions:
+        cache.parse(p, parser)
+    cache.save()
+
+    submissions[0].write_bytes(b"late resubmission")
+    cache = ParseCache(cache_path, parser_version="1")
+    for p in submissions:
+        cache.parse(p, parser)
+    assert parser.calls == 4
+    assert cache.misses == 1
+
+
+def test_cache_invalidated_by_parser_version(tmp_path, submissions):
+    parser = CountingParser()
+    cache_path = tmp_path / "cache.json"
+
+    cache = ParseCache(cache_path, parser_version="1")
+    cache.parse(submissions[0], parser)
+    cache.save()
+
+    cache = ParseCache(cache_path, parser_version="2")
+    assert len(cache) == 0
+
+
+def test_cache_prunes_unused_entries(tmp_path, submissions):
+    parser = CountingParser()
+    cache_path = tmp_path / "cache.json"
+
+    cache = ParseCache(cache_path, parser_version="1")
+    for p in submissions:
+        cache.parse(p, parser)
+    cache.save()
+
+    cache = ParseCache(cache_path, parser_version="1")
+    cache.parse(submissions[0], parser)
+    cache.save()
+    assert len(ParseCache(cache_path, parser_version="1")) == 1
+
+
+def test_cache_ignores_corrupt_file(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    cache_path.write_text("{not json")
+    cache = ParseCache(cache_path, parser_version="1")
+    assert len(cache) == 0
@@ -0,0 +1,45 @@
+import pytest
+from mcqpy.compile.fields import checkbox_name, parse_checkbox_name
+from mcqpy.grade.parse_pdf import MCQPDFParser
+
+
+def make_fields(questions):
+    """Field dictionary like `PdfReader.get_fields` for (slug, qid, selections)."""
+    fields = {"studentname": {"/V": "Name"}, "studentid": {"/V": "ID"}}
+    for index, (slug, qid, selections) in enumerate(questions):
+        for option, selected in enumerate(selections):
+            fields[checkbox_name(index, option, slug, qid)] = {"/V": "/Yes" if selected else "/Off"}
+    return fields
+
+
+@pytest.mark.parametrize(
+    "slug",
+    ["plain", "has-qid-inside", "opt=3-and-qid=7", "slug=nested", "Q1-opt=2"],
+)
+def test_parse_questions_awkward_slugs(slug):
+    fields = make_fields([(slug, "abc-123", [0, 1, 0]), ("other", "def-456", [1, 0, 1, 0])])
+    questions = MCQPDFParser()._parse_questions(fields)
+
+    assert [q.qid for q in questions] == ["abc-123", "def-456"]
+    assert questions[0].slug == slug
+    assert questions[0].onehot == [0, 1, 0]
+    assert questions[0].answers == [1]
+    assert questions[1].onehot == [1, 0, 1, 0]
+    assert questions[1].answers == [0, 2]
+
+
+def test_parse_questions_option_order():
+    fields = make_fields([("slug", "qid", [1, 0, 0])])
+    reordered = dict(reversed(list(fields.items())))
+    question = MCQPDFParser()._parse_questions(reordered)[0]
+    assert question.onehot == [1, 0, 0]
+
+
+def test_parse_field_names_skips_other_fields():
+    parsed = list(MCQPDFParser._parse_field_names(make_fields([("s", "q", [1])])))
+    assert parsed == [(0, 0, "s", "q", True)]
+
+
+def test_checkbox_name_round_trip():
+    name = checkbox_name(4, 2, "a-qid=b", "c")
+    assert parse_checkbox_name(name) == (4, 2, "a-qid=b", "c")
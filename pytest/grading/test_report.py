@@ -0,0 +1,51 @@
+import json
+
+import pytest
+from mcqpy.grade import MCQGrader
+from mcqpy.grade.cohort import Cohort
+from mcqpy.grade.item_statistics import reliability_statistics
+from mcqpy.grade.report import analysis_summary, svg_bar_chart, write_html_report
+from mcqpy.grade.rubric import StrictRubric
+from mcqpy.question import QuestionBank
+
+
+@pytest.fixture(scope="module")
+def graded_sets(grading_manifest, parsed_set_factory):
+    grader = MCQGrader(grading_manifest, StrictRubric())
+    parsed_sets = parsed_set_factory(grading_manifest, n_students=30, seed=4, shuffle_questions=True)
+    return [grader.grade(parsed_set=ps) for ps in parsed_sets]
+
+
+def test_write_html_report(graded_sets, grading_questions, tmp_path):
+    bank = QuestionBank.from_questions(grading_questions)
+    html_path, json_path = write_html_report(graded_sets, tmp_path, question_bank=bank)
+
+    text = html_path.read_text()
+    assert text.startswith("<!DOCTYPE html>")
+    assert text.count("<svg") == 1 + 2 * len(grading_questions)
+    assert "<img" not in text and "http" not in text.replace("http://www.w3.org/2000/svg", "")
+
+    summary = json.loads(json_path.read_text())
+    assert len(summary["questions"]) == len(grading_questions)
+    assert len(summary["grades"]) == len(graded_sets)
+
+
+def test_summary_matches_pdf_statistics(graded_sets):
+    summary = analysis_summary(graded_sets)
+    expected = reliability_statistics(Cohort.from_graded_sets(graded_sets))
+    for key, value in expected.items():
+        assert summary["reliability"][key] == pytest.approx(value)
+
+    assert sum(summary["total_points"]["counts"]) == len(graded_sets)
+    for question in summary["questions"]:
+        selections = [
+            q.student_answers for gs in graded_sets for q in gs.graded_questions if q.qid == question["qid"]
+        ]
+        assert question["answer_counts"] == [sum(column) for column in zip(*selections)]
+
+
+def test_svg_bar_chart_escapes_labels():
+    svg = svg_bar_chart(["<A>", "B"], [1, 0], "Title & more", "x", "y")
+    assert "&lt;A&gt;" in svg
+    assert "Title &amp; more" in svg
+    assert svg.count("<rect") == 2
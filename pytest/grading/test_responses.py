@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from mcqpy.compile.manifest import Manifest, ManifestItem
+from mcqpy.grade.irt import ItemParameterBank, ItemParameters
+from mcqpy.grade.responses import (
+    CorrectResponses,
+    IRTResponses,
+    OptionLayout,
+    PointValueResponses,
+)
+from mcqpy.grade.rubric import PartialCreditRubric
+
+
+@pytest.fixture(scope="module")
+def mixed_manifest():
+    """Single-choice questions and multiple-choice questions with several keys."""
+    keys = [[1, 0, 0, 0], [0, 1, 1, 0, 0], [0, 0, 1], [1, 1, 0, 1]]
+    items = [
+        ManifestItem(
+            qid=f"qid-{index}",
+            slug=f"question-{index}",
+            non_permuted_correct_answers=[i for i, v in enumerate(key) if v],
+            permutation=list(range(len(key))),
+            permuted_correct_answers=[i for i, v in enumerate(key) if v],
+            correct_onehot=key,
+            sha256=None,
+            point_value=index + 1,
+            question_type="multiple" if sum(key) > 1 else "single",
+        )
+        for index, key in enumerate(keys)
+    ]
+    return Manifest(items=items)
+
+
+def split(manifest, selections):
+    layout = OptionLayout.from_manifest(manifest)
+    return [selections[:, layout.offsets[k] : layout.offsets[k + 1]] for k in range(layout.n_questions)]
+
+
+def test_option_layout(mixed_manifest):
+    layout = OptionLayout.from_manifest(mixed_manifest)
+    assert layout.offsets.tolist() == [0, 4, 9, 12, 16]
+    assert layout.multiple.tolist() == [False, True, False, True]
+    assert np.flatnonzero(layout.first_keys()).tolist() == [0, 5, 11, 12]
+
+    picked = layout.pick_one(np.random.default_rng(0).random((50, 16)), ~layout.keys[None])
+    for question in split(mixed_manifest, picked):
+        assert np.all(question.sum(axis=1) == 1)
+    assert not (picked & layout.keys).any()
+
+
+def test_correct_responses(mixed_manifest):
+    selections = CorrectResponses().draw(mixed_manifest, 3, np.random.default_rng(0))
+    for item, question in zip(mixed_manifest.items, split(mixed_manifest, selections)):
+        assert np.all(question == item.correct_onehot)
+
+
+def test_point_value_responses(mixed_manifest):
+    selections = PointValueResponses().draw(mixed_manifest, 4000, np.random.default_rng(0))
+    layout = OptionLayout.from_manifest(mixed_manifest)
+    first_keys = split(mixed_manifest, layout.first_keys()[None])
+    for index, question in enumerate(split(mixed_manifest, selections)):
+        assert np.all(question.sum(axis=1) == 1)
+        point_value = mixed_manifest.items[index].point_value
+        expected = 1 / point_value if point_value > 1 else 0.5
+        assert np.all(question == first_keys[index], axis=1).mean() == pytest.approx(expected, abs=0.03)
+
+
+def test_irt_responses_cover_rubric_paths(mixed_manifest):
+    model = IRTResponses(blank_rate=0.1)
+    selections = model.draw(mixed_manifest, 5000, np.random.default_rng(1))
+    questions = split(mixed_manifest, selections)
+    n_selected = [question.sum(axis=1) for question in questions]
+
+    # Single-choice questions get one box unless left blank
+    for counts in (n_selected[0], n_selected[2]):
+        assert counts.max() == 1
+        assert (counts == 0).mean() == pytest.approx(0.1, abs=0.03)
+    # Multiple-choice questions get partial and over-complete answers
+    assert n_selected[1].max() > 2 and n_selected[3].max() == 4
+
+    rubric = PartialCreditRubric()
+    for item, question in zip(mixed_manifest.items, questions):
+        points = rubric.score_matrix(question, item.correct_onehot, item.point_value, item.question_type == "single")
+        assert points.min() == 0 and points.max() == item.point_value
+        if item.question_type == "multiple":
+            assert np.any((points > 0) & (points < item.point_value))
+
+
+def test_irt_responses_follow_ability(mixed_manifest):
+    def mean_exact(**kwargs):
+        selections = IRTResponses(**kwargs).draw(mixed_manifest, 3000, np.random.default_rng(0))
+        return np.mean([
+            np.all(question == item.correct_onehot, axis=1).mean()
+            for item, question in zip(mixed_manifest.items, split(mixed_manifest, selections))
+        ])
+
+    assert mean_exact(ability_mean=2.0) > mean_exact() > mean_exact(ability_mean=-2.0)
+    assert mean_exact(difficulty=-10.0, discrimination=5.0) == pytest.approx(1.0)
+    assert mean_exact(difficulty=10.0, discrimination=5.0, false_selection=0.0) == pytest.approx(0.0)
+
+
+def test_irt_parameters(mixed_manifest):
+    bank = ItemParameterBank(
+        items={"qid-1": ItemParameters(qid="qid-1", model="2PL", discrimination=2.5, difficulty=1.5)}
+    )
+    layout = OptionLayout.from_manifest(mixed_manifest)
+    difficulty, discrimination = IRTResponses(difficulty=0.0, item_parameters=bank).parameters(layout)
+    assert difficulty.tolist() == [0.0, 1.5, 0.0, 0.0]
+    assert discrimination.tolist() == [1.0, 2.5, 1.0, 1.0]
+
+    difficulty, _ = IRTResponses().parameters(layout)
+    assert np.all(np.diff(difficulty) > 0) and difficulty.mean() == pytest.approx(0.0)
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from mcqpy.grade import MCQGrader
+from mcqpy.grade.answer_store import AnswerStore
+from mcqpy.grade.rubric import PartialCreditRubric, RubricFactory, StrictRubric
+from mcqpy.grade.utils import GradedQuestion
+
+
+def make_question(answers, key, question_type="multiple", points=4):
+    return GradedQuestion(
+        qid="qid",
+        slug="slug",
+        student_answers=answers,
+        correct_answers=key,
+        max_point_value=points,
+        question_type=question_type,
+    )
+
+
+@pytest.mark.parametrize(
+    "answers, expected",
+    [
+        ([1, 1, 0, 0], 4.0),  # All correct
+        ([1, 0, 0, 0], 2.0),  # Half the correct options
+        ([1, 0, 1, 0], 0.0),  # One correct, one wrong
+        ([1, 1, 1, 0], 2.0),  # All correct, one wrong
+        ([1, 1, 1, 1], 0.0),  # Everything selected
+        ([0, 0, 1, 0], 0.0),  # Floored at zero
+        ([0, 0, 0, 0], 0.0),  # Blank
+    ],
+)
+def test_partial_credit_multiple(answers, expected):
+    rubric = PartialCreditRubric()
+    assert rubric.score_question(make_question(answers, [1, 1, 0, 0])) == expected
+
+
+def test_partial_credit_without_penalty():
+    rubric = PartialCreditRubric(penalty=0)
+    assert rubric.score_question(make_question([1, 0, 1, 1], [1, 1, 0, 0])) == 2.0
+
+
+def test_partial_credit_single_is_all_or_nothing():
+    rubric = PartialCreditRubric()
+    assert rubric.score_question(make_question([0, 1, 0, 0], [0, 1, 0, 0], "single")) == 4.0
+    assert rubric.score_question(make_question([1, 1, 0, 0], [0, 1, 0, 0], "single")) == 0.0
+
+
+def test_partial_credit_infers_single_from_key():
+    rubric = PartialCreditRubric()
+    question = make_question([1, 1, 0, 0], [0, 1, 0, 0], question_type=None)
+    assert rubric.score_question(question) == 0.0
+
+
+def test_partial_credit_negative_penalty():
+    with pytest.raises(ValueError):
+        PartialCreditRubric(penalty=-1)
+
+
+@pytest.mark.parametrize("rubric", [StrictRubric(), PartialCreditRubric(), PartialCreditRubric(penalty=0.5)])
+def test_score_matrix_matches_score_question(rubric):
+    rng = np.random.default_rng(0)
+    answers = rng.integers(0, 2, size=(50, 5))
+    key = np.array([1, 0, 1, 0, 0])
+    scores = rubric.score_matrix(answers, key, 3, single=False)
+    expected = [
+        rubric.score_question(make_question(a.tolist(), key.tolist(), "multiple", points=3))
+        for a in answers
+    ]
+    assert np.allclose(scores, expected)
+
+
+def test_score_matrix_broadcasts_over_questions():
+    rubric = PartialCreditRubric()
+    answers = np.zeros((10, 3, 4), dtype=bool)
+    answers[:, 0, 0] = True
+    key = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [1, 1, 0, 0]])
+    points = np.array([1, 2, 4])
+    scores = rubric.score_matrix(answers, key, points)
+    assert scores.shape == (10, 3)
+    assert np.allclose(scores[0], [1, 0, 0])
+
+
+@pytest.mark.parametrize("rubric", [StrictRubric(), PartialCreditRubric()])
+def test_grade_store_matches_grade(rubric, grading_manifest, parsed_set_factory):
+    parsed_sets = parsed_set_factory(grading_manifest, n_students=30, seed=5, shuffle_questions=True)
+    grader = MCQGrader(grading_manifest, rubric)
+    expected = {gs.student_id: gs for gs in (grader.grade(parsed_set=ps) for ps in parsed_sets)}
+
+    store = AnswerStore.from_parsed_sets(parsed_sets)
+    for graded_set in grader.grade_store(store):
+        reference = expected[graded_set.student_id]
+        assert graded_set.points == reference.points
+        assert graded_set.max_points == reference.max_points
+        by_qid = {q.qid: q.point_value for q in reference.graded_questions}
+        assert {q.qid: q.point_value for q in graded_set.graded_questions} == by_qid
+
+
+def test_rubric_factory():
+    rubric = RubricFactory.from_config({"type": "partial", "penalty": 0.25})
+    assert isinstance(rubric, PartialCreditRubric)
+    assert rubric.penalty == 0.25
+    assert isinstance(RubricFactory.from_config({"type": "strict"}), StrictRubric)
+    with pytest.raises(ValueError):
+        RubricFactory.from_config({"type": "unknown"})
+
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+from mcqpy.grade import MCQGrader, get_grade_dataframe
+from mcqpy.grade.answer_store import AnswerStore
+from mcqpy.grade.cohort import Cohort
+from mcqpy.grade.export import get_store_grade_dataframe
+from mcqpy.grade.responses import IRTResponses
+from mcqpy.grade.rubric import PartialCreditRubric, StrictRubric
+from mcqpy.grade.simulate import CohortSimulator
+
+
+def test_simulated_store_shapes(grading_manifest):
+    store = CohortSimulator(grading_manifest, 25, seed=0, block_size=10).answer_store()
+    assert store.n_students == 25
+    assert store.qids.tolist() == [item.qid for item in grading_manifest.items]
+    assert store.answered.all()
+    assert len(set(store.student_ids.tolist())) == 25
+
+
+def test_simulation_is_reproducible(grading_manifest):
+    first = CohortSimulator(grading_manifest, 30, seed=3, block_size=8)
+    second = CohortSimulator(grading_manifest, 30, seed=3, block_size=8)
+    other = CohortSimulator(grading_manifest, 30, seed=4, block_size=8)
+
+    store = first.answer_store()
+    assert np.array_equal(store.bits, second.answer_store().bits)
+    assert not np.array_equal(store.bits, other.answer_store().bits)
+
+    streamed = AnswerStore.concatenate(list(first.answer_stores()))
+    assert np.array_equal(streamed.bits, store.bits)
+    assert list(first.parsed_sets()) == store.to_parsed_sets()
+
+
+def test_simulator_uses_response_model(grading_manifest):
+    def mean_correct(**kwargs):
+        simulator = CohortSimulator(grading_manifest, 2000, seed=0, response_model=IRTResponses(**kwargs))
+        grader = MCQGrader(grading_manifest, StrictRubric())
+        max_points = np.array([item.point_value for item in grading_manifest.items])
+        return (grader.score_store(simulator.answer_store()) / max_points).mean()
+
+    assert mean_correct(ability_mean=2.0) > mean_correct() > mean_correct(ability_mean=-2.0)
+
+
+def test_simulated_cohort_grading_paths_agree(grading_manifest):
+    store = CohortSimulator(grading_manifest, 40, seed=1, block_size=16).answer_store()
+    grader = MCQGrader(grading_manifest, PartialCreditRubric())
+    graded_sets = [grader.grade(parsed_set=parsed_set) for parsed_set in store.to_parsed_sets()]
+    points = grader.score_store(store)
+
+    assert [gs.points for gs in graded_sets] == pytest.approx(points.sum(axis=1).tolist())
+
+    from_graded = Cohort.from_graded_sets(graded_sets)
+    from_store = Cohort.from_store(store, grading_manifest, points)
+    assert from_store.student_ids == from_graded.student_ids
+    assert np.array_equal(from_store.selections, from_graded.selections)
+    assert np.array_equal(from_store.keys, from_graded.keys)
+    assert np.allclose(from_store.points, from_graded.points)
+
+    pd.testing.assert_frame_equal(
+        get_store_grade_dataframe(store, grading_manifest, points).reset_index(drop=True),
+        get_grade_dataframe(graded_sets).reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_concatenate_requires_same_questions(grading_manifest, parsed_sets):
+    simulated = CohortSimulator(grading_manifest, 5, seed=0).answer_store()
+    other = AnswerStore.from_parsed_sets([
+        ps.__class__(ps.student_id, ps.student_name, ps.questions[:-1]) for ps in parsed_sets
+    ])
+    with pytest.raises(ValueError):
+        AnswerStore.concatenate([simulated, other])
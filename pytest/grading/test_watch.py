@@ -0,0 +1,85 @@
+import os
+
+import pytest
+from mcqpy.grade.watch import SubmissionWatcher
+
+
+def write(path, content, mtime_ns=None):
+    path.write_bytes(content)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def directory(tmp_path):
+    write(tmp_path / "a.pdf", b"a")
+    write(tmp_path / "notes.txt", b"ignored")
+    return tmp_path
+
+
+def test_watcher_reports_existing_files(directory):
+    watcher = SubmissionWatcher(directory, settle=False)
+    changed, removed = watcher.poll()
+    assert changed == [directory / "a.pdf"]
+    assert removed == []
+
+
+def test_watcher_reports_each_file_once(directory):
+    watcher = SubmissionWatcher(directory, settle=False)
+    watcher.poll()
+    assert watcher.poll() == ([], [])
+
+
+def test_watcher_mark_seen(directory):
+    watcher = SubmissionWatcher(directory, settle=False)
+    watcher.mark_seen([directory / "a.pdf"])
+    assert watcher.poll() == ([], [])
+
+
+def test_watcher_settles_new_files(directory):
+    watcher = SubmissionWatcher(directory)
+    watcher.mark_seen([directory / "a.pdf"])
+    write(directory / "b.pdf", b"half", mtime_ns=1_000)
+    assert watcher.poll() == ([], [])
+
+    write(directory / "b.pdf", b"half written", mtime_ns=2_000)
+    assert watcher.poll() == ([], [])
+    assert watcher.poll() == ([directory / "b.pdf"], [])
+
+
+def test_watcher_changed_and_removed(directory):
+    watcher = SubmissionWatcher(directory, settle=False)
+    watcher.poll()
+    write(directory / "a.pdf", b"resubmitted", mtime_ns=5_000)
+    assert watcher.poll() == ([directory / "a.pdf"], [])
+
+    (directory / "a.pdf").unlink()
+    assert watcher.poll() == ([], [directory / "a.pdf"])
+
+
+def test_watch_loop_grades_new_submissions(directory, mocker):
+    from rich.console import Console
+    from mcqpy.cli.grade import _watch_submissions
+
+    class FakeGrader:
+        def parse(self, path):
+            if path.name == "broken.pdf":
+                raise ValueError("not a pdf")
+            return path.name
+
+        def grade(self, parsed_set):
+            return parsed_set.upper()
+
+    watcher = SubmissionWatcher(directory, settle=False)
+    watcher.mark_seen([directory / "a.pdf"])
+    write(directory / "b.pdf", b"b")
+    write(directory / "broken.pdf", b"x")
+
+    mocker.patch("mcqpy.cli.grade.time.sleep", side_effect=[None, KeyboardInterrupt])
+    writes = []
+    results = {directory / "a.pdf": ("a.pdf", "A.PDF")}
+    _watch_submissions(FakeGrader(), watcher, results, lambda: writes.append(len(results)), 0, Console())
+
+    assert results[directory / "b.pdf"] == ("b.pdf", "B.PDF")
+    assert directory / "broken.pdf" not in results
+    assert writes == [2]
@@ -0,0 +1,69 @@
+import pytest
+from mcqpy.question.latex_lint import _skeleton, lint_latex, lint_question
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "Plain text without any markup.",
+        r"What is $\frac{1}{2} + \frac 12$ in \textbf{decimal} form?",
+        r"Consider \[ x_1 = \sqrt{2} \] and \(y^2\), which costs 50\% \& more.",
+        r"\begin{align} a_b &= c \\ d &= e \end{align}",
+        r"$\begin{pmatrix} a & b \end{pmatrix}$ and \begin{tabular}{ll} a & b \end{tabular}",
+        r"\verb|a_b| and \begin{verbatim} 50% a_b \end{verbatim}",
+        r"\begin{itemize} \item first \item second \end{itemize}",
+        r"See \label{eq:a_b}, \ref{fig_1}, \eqref{eq_2} and \cite{key_3}.",
+        r"\includegraphics{a_b.png} and \includegraphics[width=0.5\textwidth]{dir_1/a_b.pdf}",
+        r"Call \mintinline{python}{a_b()} or \input{snippets/a_b}.",
+        r"Visit \href{http://a_b.com}{the site} or \url{http://a_b.com/x_y}.",
+    ],
+)
+def test_valid_latex(source):
+    assert lint_latex(source) == []
+
+
+@pytest.mark.parametrize(
+    "source, column, message",
+    [
+        ("Some words here a {b", 21, "expecting '}'; still open: open brace at 1:19"),
+        ("a } b", 3, "mismatching closing brace"),
+        (r"\begin{itemize} x \end{enumerate}", 19, "mismatching closing environment"),
+        (r"\begin{foo} x \end{foo}", 1, "unknown environment 'foo'"),
+        ("Some words then $x", 19, "expecting '$'"),
+        (r"x\)", 2, "closing math mode"),
+        (r"$x \[y\] z$", 4, r"math delimiter '\[' inside math mode"),
+        (r"$\begin{align} x \end{align}$", 2, "environment 'align' cannot be used inside math mode"),
+        ("It is 50% of the answer", 9, "unescaped '%'"),
+        ("Cats & dogs", 6, "unescaped '&'"),
+        ("Use the variable x_1 here", 19, "unescaped '_'"),
+        (r"$\text{a_b}$", 9, "unescaped '_'"),
+        (r"\href{http://a_b.com}{x_y}", 24, "unescaped '_'"),
+    ],
+)
+def test_invalid_latex(source, column, message):
+    issues = lint_latex(source, field="text")
+    assert len(issues) == 1
+    assert (issues[0].line, issues[0].column) == (1, column)
+    assert message in issues[0].message
+
+
+def test_issue_positions_on_later_lines():
+    source = "A first line of prose\nthen a second line with $x + {y$ and more"
+    issue = lint_latex(source, field="explanation")[0]
+    assert str(issue).startswith("explanation:2:")
+    assert issue.column == len("then a second line with $x + {y$ and more") + 1
+
+
+def test_skeleton_keeps_structure():
+    source = r"\frac 12345 of some longer prose \begin{itemize} \item text \end{itemize}"
+    skeleton, _, _ = _skeleton(source)
+    assert len(skeleton) < len(source)
+    assert r"\frac 12" in skeleton and r"\begin{itemize}" in skeleton and r"\end{itemize}" in skeleton
+
+
+def test_lint_question_fields(question_factory):
+    question = question_factory().model_copy(
+        update={"choices": ["$x$", "50% off", "a {b"], "explanation": r"\begin{foo}\end{foo}"}
+    )
+    issues = lint_question(question)
+    assert [issue.field for issue in issues] == ["choices[1]", "choices[2]", "explanation"]
@@ -1,4 +1,4 @@
-from mcqpy.question.question import Question, qid_from_slug
+from mcqpy.question.question import ImageNotFoundError, Question, qid_from_slug
 import pytest
 
 ### Test cases for Question._derive_qid
@@ -69,7 +69,7 @@ def test_validate_image_invalid_extension(info, tmp_path):
 
 def test_validate_image_nonexistent_file(info):
     v = "nonexistent_image.png"
-    with pytest.raises(FileNotFoundError, match="Image not found"):
+    with pytest.raises(ImageNotFoundError, match="Image not found"):
         Question.validate_image(v, info=info)
 
 def test_validate_image_https(info):
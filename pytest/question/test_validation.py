@@ -0,0 +1,71 @@
+import pytest
+import yaml
+from mcqpy.question.validation import find_question_files, validate_questions
+
+
+@pytest.fixture()
+def question_dir(tmp_path, question_factory):
+    nested = tmp_path / "bank" / "nested"
+    nested.mkdir(parents=True)
+    for index in range(4):
+        question = question_factory()
+        directory = nested if index % 2 else tmp_path / "bank"
+        question.save(directory / f"{question.slug}.yaml")
+    (tmp_path / "bank" / "notes.txt").write_text("not a question")
+    return tmp_path / "bank"
+
+
+def test_find_question_files(question_dir):
+    files = find_question_files([question_dir])
+    assert len(files) == 4
+    assert files == sorted(files)
+    assert find_question_files([str(question_dir / "**" / "*.yaml"), files[0]]) == files
+    assert find_question_files([str(question_dir / "*.yaml")]) == [f for f in files if f.parent == question_dir]
+
+
+def test_validate_valid_bank(question_dir):
+    report = validate_questions([question_dir])
+    assert report.ok
+    assert report.n_valid == report.n_files == 4
+
+
+def test_validate_reports_issues(question_dir, question_factory):
+    original = find_question_files([question_dir])[0]
+    (question_dir / "copy.yaml").write_text(original.read_text())
+    (question_dir / "broken.yaml").write_text("invalid: yaml: content")
+    (question_dir / "missing.yaml").write_text("slug: missing\ntext: text\n")
+    imaged = question_factory(image=True).model_dump()
+    imaged["image"] = ["gone.png"]
+    (question_dir / "imaged.yaml").write_text(yaml.safe_dump(imaged))
+
+    report = validate_questions([question_dir])
+    assert not report.ok
+    assert report.n_files == 8
+    assert report.n_valid == 3
+    assert report.counts() == {"duplicate slug": 2, "invalid yaml": 1, "invalid question": 1, "missing image": 1}
+    missing = next(issue for issue in report.issues if issue.path.name == "missing.yaml")
+    assert "choices" in missing.message
+
+
+def test_validate_in_parallel(question_dir, monkeypatch):
+    import mcqpy.question.validation as validation
+
+    monkeypatch.setattr(validation, "MIN_FILES_PER_WORKER", 1)
+    serial = validate_questions([question_dir], workers=1)
+    pooled = validate_questions([question_dir], workers=2)
+    assert pooled.valid_paths == serial.valid_paths
+    assert pooled.ok
+
+
+def test_validate_latex(question_dir, question_factory):
+    question = question_factory().model_dump(exclude={"qid", "path"})
+    question["text"] = "What is 50% of $x_1$?"
+    (question_dir / "latex.yaml").write_text(yaml.safe_dump(question))
+    question.update(slug="more-latex", explanation="Take x_1 / 2.")
+    (question_dir / "more.yaml").write_text(yaml.safe_dump(question))
+
+    assert validate_questions([question_dir]).ok
+    report = validate_questions([question_dir], latex=True)
+    assert report.counts() == {"latex": 3}
+    assert [issue.path.name for issue in report.issues] == ["latex.yaml", "more.yaml", "more.yaml"]
+    assert report.n_valid == 4
@@ -0,0 +1,160 @@
+import struct
+from io import BytesIO
+
+import numpy as np
+import pytest
+from pypdf import PdfReader
+from pypdf.generic import ArrayObject, NameObject, NumberObject, StreamObject
+from mcqpy.grade.parse_pdf import MCQPDFParser
+from mcqpy.utils.fill_form import FormTemplate, fill_pdf_form, fill_pdf_forms
+
+
+def test_form_template_questions(form_quiz, grading_manifest):
+    template = FormTemplate(form_quiz)
+    assert list(template.questions) == [item.qid for item in grading_manifest.items]
+    for item in grading_manifest.items:
+        names = template.questions[item.qid]
+        assert len(names) == len(item.correct_onehot)
+        assert all(f"-opt={option}-" in name for option, name in enumerate(names))
+
+
+def test_fill_is_incremental_update(form_quiz, tmp_path):
+    template = FormTemplate(form_quiz)
+    name = next(iter(template.questions.values()))[1]
+    path = template.write(tmp_path / "filled.pdf", {name: "/Yes", "studentid": "TID7"})
+
+    data = path.read_bytes()
+    assert data.startswith(form_quiz.read_bytes())
+    reader = PdfReader(path, strict=True)
+    fields = reader.get_fields()
+    assert fields[name]["/V"] == "/Yes"
+    assert fields["studentid"]["/V"] == "TID7"
+    assert reader.trailer["/Root"]["/AcroForm"]["/NeedAppearances"]
+    annotations = [a.get_object() for page in reader.pages for a in page["/Annots"]]
+    assert next(a for a in annotations if a["/T"] == name)["/AS"] == "/Yes"
+
+
+def write_object_streams(source, path):
+    """Rewrite `source` as PDF 1.5 writers do: dictionaries in an object stream,
+    cross-references in an xref stream."""
+    reader = PdfReader(source)
+    size = int(reader.trailer["/Size"])
+    out = BytesIO()
+    out.write(b"%PDF-1.5\n")
+
+    def write_object(idnum, obj):
+        offset = out.tell()
+        out.write(b"%d 0 obj\n" % idnum)
+        obj.write_to_stream(out)
+        out.write(b"\nendobj\n")
+        return offset
+
+    entries, header, body = {}, [], BytesIO()
+    objstm = size
+    for idnum in range(1, size):
+        obj = reader.get_object(idnum)
+        if isinstance(obj, StreamObject):
+            entries[idnum] = (1, write_object(idnum, obj), 0)
+        elif obj is not None:
+            entries[idnum] = (2, objstm, len(header) // 2)
+            header += [str(idnum), str(body.tell())]
+            obj.write_to_stream(body)
+            body.write(b"\n")
+    first = " ".join(header).encode() + b"\n"
+    stream = StreamObject()
+    stream.set_data(first + body.getvalue())
+    stream[NameObject("/Type")] = NameObject("/ObjStm")
+    stream[NameObject("/N")] = NumberObject(len(header) // 2)
+    stream[NameObject("/First")] = NumberObject(len(first))
+    entries[objstm] = (1, write_object(objstm, stream), 0)
+
+    xref = StreamObject()
+    entries[objstm + 1] = (1, out.tell(), 0)
+    rows = [struct.pack(">BIH", 0, 0, 65535)]
+    for idnum in range(1, objstm + 2):
+        rows.append(struct.pack(">BIH", *entries.get(idnum, (0, 0, 0))))
+    xref.set_data(b"".join(rows))
+    xref[NameObject("/Type")] = NameObject("/XRef")
+    xref[NameObject("/Size")] = NumberObject(objstm + 2)
+    xref[NameObject("/W")] = ArrayObject([NumberObject(1), NumberObject(4), NumberObject(2)])
+    xref[NameObject("/Root")] = reader.trailer.raw_get("/Root")
+    offset = write_object(objstm + 1, xref)
+    out.write(b"startxref\n%d\n%%%%EOF\n" % offset)
+    path.write_bytes(out.getvalue())
+    return path
+
+
+@pytest.fixture(scope="module")
+def object_stream_quiz(form_quiz, tmp_path_factory):
+    return write_object_streams(form_quiz, tmp_path_factory.mktemp("objstm") / "quiz.pdf")
+
+
+def test_fill_object_stream_template(object_stream_quiz, grading_manifest, tmp_path):
+    template = FormTemplate(object_stream_quiz)
+    assert list(template.questions) == [item.qid for item in grading_manifest.items]
+    name = next(iter(template.questions.values()))[1]
+    path = template.write(tmp_path / "filled.pdf", {name: "/Yes", "studentid": "TID7"})
+
+    data = path.read_bytes()
+    assert data.startswith(object_stream_quiz.read_bytes())
+    # The update continues the template's cross-reference streams
+    startxref = int(data.rsplit(b"startxref", 1)[1].split()[0])
+    assert not data[startxref:].startswith(b"xref")
+    reader = PdfReader(path, strict=True)
+    fields = reader.get_fields()
+    assert fields[name]["/V"] == "/Yes"
+    assert fields["studentid"]["/V"] == "TID7"
+    assert reader.trailer["/Root"]["/AcroForm"]["/NeedAppearances"]
+    assert MCQPDFParser().parse_pdf(path).student_id == "TID7"
+
+
+def test_fill_pdf_form_parses(form_quiz, grading_manifest, tmp_path):
+    path = fill_pdf_form(form_quiz, tmp_path, index=3, manifest=grading_manifest, correct_only=True)
+    assert path.name == "quiz_autofill_3.pdf"
+
+    parsed = MCQPDFParser().parse_pdf(path)
+    assert parsed.student_id == "TID3"
+    for question in parsed.questions:
+        item = grading_manifest.get_item_by_qid(question.qid)
+        assert question.answers == [int(np.argmax(item.correct_onehot))]
+
+
+def test_fill_pdf_form_without_manifest(form_quiz, grading_manifest, tmp_path):
+    path = fill_pdf_form(form_quiz, tmp_path, rng=np.random.default_rng(0))
+    parsed = MCQPDFParser().parse_pdf(path)
+    assert len(parsed.questions) == len(grading_manifest.items)
+    assert all(len(question.answers) == 1 for question in parsed.questions)
+
+
+def test_fill_pdf_forms_seeded(form_quiz, grading_manifest, tmp_path):
+    serial = fill_pdf_forms(form_quiz, tmp_path / "serial", 6, manifest=grading_manifest, seed=5, workers=1)
+    pooled = fill_pdf_forms(form_quiz, tmp_path / "pooled", 6, manifest=grading_manifest, seed=5, workers=2)
+
+    assert [p.name for p in serial] == [f"quiz_autofill_{i}.pdf" for i in range(6)]
+    for a, b in zip(serial, pooled):
+        assert a.read_bytes() == b.read_bytes()
+    names = {MCQPDFParser().parse_pdf(p).student_name for p in serial}
+    assert len(names) > 1
+
+
+def test_fill_pdf_forms_response_model(form_quiz, grading_manifest, tmp_path):
+    from mcqpy.grade import MCQGrader
+    from mcqpy.grade.responses import IRTResponses
+    from mcqpy.grade.rubric import PartialCreditRubric
+
+    paths = fill_pdf_forms(
+        form_quiz,
+        tmp_path,
+        20,
+        manifest=grading_manifest,
+        seed=0,
+        workers=1,
+        response_model=IRTResponses(blank_rate=0.3),
+    )
+    grader = MCQGrader(grading_manifest, PartialCreditRubric())
+    parsed = [grader.parse(path) for path in paths]
+    answers = [question.answers for parsed_set in parsed for question in parsed_set.questions]
+    assert [] in answers
+    assert any(len(a) > 1 for a in answers)
+    assert all(len(parsed_set.questions) == len(grading_manifest.items) for parsed_set in parsed)
+    assert len({grader.grade(parsed_set=parsed_set).points for parsed_set in parsed}) > 1
@@ -0,0 +1,19 @@
+import pytest
+from mcqpy.utils.parallel import resolve_workers, split_chunks
+
+
+@pytest.mark.parametrize("n_items, n_chunks", [(10, 3), (3, 10), (0, 4), (7, 1)])
+def test_split_chunks(n_items, n_chunks):
+    items = list(range(n_items))
+    chunks = split_chunks(items, n_chunks)
+    assert [item for chunk in chunks for item in chunk] == items
+    assert len(chunks) <= n_chunks
+    if chunks:
+        sizes = [len(chunk) for chunk in chunks]
+        assert max(sizes) - min(sizes) <= 1
+
+
+def test_resolve_workers():
+    assert resolve_workers(4, 2) == 2
+    assert resolve_workers(4, 0) == 1
+    assert resolve_workers(None, 1000) >= 1
@@ -0,0 +1,62 @@
+import json
+import time
+
+from rich.console import Console
+
+from mcqpy.utils.profiling import Profiler, profile_command, profiling, stage
+
+
+def test_stage_inactive():
+    with stage("noop", value=1):
+        pass
+
+
+def test_profiler_records_stages():
+    with profiling() as profiler:
+        with stage("outer"):
+            for _ in range(3):
+                with stage("inner", n=2):
+                    time.sleep(0.001)
+
+    summary = {entry.name: entry for entry in profiler.summary()}
+    assert [entry.name for entry in profiler.summary()] == ["outer", "inner"]
+    assert summary["inner"].calls == 3
+    assert summary["inner"].depth == 1
+    assert summary["outer"].total >= summary["inner"].total >= 0.003
+    assert profiler.wall_time() >= summary["inner"].total
+
+    # Stages outside the block are not recorded.
+    with stage("after"):
+        pass
+    assert len(profiler.events) == 4
+
+
+def test_chrome_trace(tmp_path):
+    profiler = Profiler()
+    with profiling(profiler):
+        with stage("bank.load", directories=2):
+            pass
+
+    path = profiler.write_trace(tmp_path / "trace.json")
+    (event,) = json.loads(path.read_text())["traceEvents"]
+    assert event["name"] == "bank.load"
+    assert event["cat"] == "bank"
+    assert event["ph"] == "X"
+    assert event["args"] == {"directories": "2"}
+    assert event["dur"] >= 0
+
+
+def test_profile_command(tmp_path):
+    console = Console(record=True, width=120)
+    with profile_command(False, None, console) as profiler:
+        assert profiler is None
+
+    trace = tmp_path / "trace.json"
+    with profile_command(True, trace, console, title="Test profile"):
+        with stage("question.load_yaml"):
+            pass
+
+    output = console.export_text()
+    assert "Test profile" in output
+    assert "question.load_yaml" in output
+    assert json.loads(trace.read_text())["traceEvents"][0]["name"] == "question.load_yaml"
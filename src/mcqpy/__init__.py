@@ -1,2 +1,8 @@
-from .question import Question
+# `Question` is imported on first access, so importing a submodule such as
+# the CLI does not load the question models and their dependencies.
+def __getattr__(name: str):
+    if name == "Question":
+        from .question import Question
 
+        return Question
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,22 @@
+import importlib
+
 from mcqpy.cli.main import main
-from mcqpy.cli.init import init_command
-from mcqpy.cli.build import build_command
-from mcqpy.cli.grade import grade_command
-from mcqpy.cli.autofill import autofill_command
-from mcqpy.cli.question import question_group
-from mcqpy.cli.check_latex import check_latex_command
+
+# Command objects are importable from here, but their modules are only
+# imported on first access so `mcqpy --help` stays fast.
+_COMMAND_MODULES = {
+    "init_command": "mcqpy.cli.init",
+    "build_command": "mcqpy.cli.build",
+    "grade_command": "mcqpy.cli.grade",
+    "regrade_command": "mcqpy.cli.regrade",
+    "calibrate_command": "mcqpy.cli.calibrate",
+    "autofill_command": "mcqpy.cli.autofill",
+    "question_group": "mcqpy.cli.question.main",
+    "check_latex_command": "mcqpy.cli.check_latex",
+}
+
+
+def __getattr__(name: str):
+    if name in _COMMAND_MODULES:
+        return getattr(importlib.import_module(_COMMAND_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,9 @@
-import contextlib
-import io
 from pathlib import Path
 
 import rich_click as click
-from rich.progress import track
 
-from mcqpy.cli.config import QuizConfig
-from mcqpy.cli.main import main
-from mcqpy.compile.manifest import Manifest
-from mcqpy.utils.fill_form import fill_pdf_form
 
-
-@main.command(
+@click.command(
     name="test-autofill",
     help="Make answered versions of quiz to test mcqpy functionality",
 )
@@ -32,8 +24,40 @@ from mcqpy.utils.fill_form import fill_pdf_form
     show_default=True,
 )
 @click.option('--correct', is_flag=True, help="Fill forms with correct answers")
-def autofill_command(config, num_forms, correct):
-    print(correct)
+@click.option("--seed", type=int, default=None, help="Random seed, forms are reproducible for a given seed")
+@click.option(
+    "-w",
+    "--workers",
+    type=int,
+    default=None,
+    help="Number of processes filling forms, defaults to the number of CPUs",
+)
+@click.option(
+    "--responses",
+    type=click.Choice(["points", "irt"]),
+    default="points",
+    help="How answers are drawn: one box per question favoured by point value, "
+    "or by student ability under a 2PL model with partial multi-select answers",
+    show_default=True,
+)
+@click.option(
+    "--blank-rate",
+    type=click.FloatRange(0, 1),
+    default=0.0,
+    help="Probability of leaving a question blank",
+    show_default=True,
+)
+def autofill_command(config, num_forms, correct, seed, workers, responses, blank_rate):
+    from mcqpy.cli.config import QuizConfig
+    from mcqpy.compile.manifest import Manifest
+    from mcqpy.grade.responses import IRTResponses, PointValueResponses
+    from mcqpy.utils.fill_form import fill_pdf_forms
+
+    if correct and (responses != "points" or blank_rate > 0):
+        raise click.UsageError(
+            "--correct cannot be combined with --responses or --blank-rate."
+        )
+
     # Directories & files
     config = QuizConfig.read_yaml(config)
     file_path = Path(config.output_directory) / config.file_name
@@ -43,15 +67,20 @@ def autofill_command(config, num_forms, correct):
     manifest_path = Path(config.output_directory) / f"{file_name}_manifest.json"
     manifest = Manifest.load_from_file(manifest_path)
 
-    # In the autofill_command function
-    for i in track(range(num_forms), description="Generating filled forms..."):
-        stdout_capture = io.StringIO()
-        stderr_capture = io.StringIO()
+    if responses == "irt":
+        response_model = IRTResponses(blank_rate=blank_rate)
+    else:
+        response_model = PointValueResponses(blank_rate=blank_rate)
 
-        with (
-            contextlib.redirect_stdout(stdout_capture),
-            contextlib.redirect_stderr(stderr_capture),
-        ):
-            fill_pdf_form(file_path, out_path=output_dir, index=i, manifest=manifest, correct_only=correct)
+    fill_pdf_forms(
+        file_path,
+        output_dir,
+        num_forms,
+        manifest=manifest,
+        correct_only=correct,
+        seed=seed,
+        workers=workers,
+        response_model=None if correct else response_model,
+    )
 
     click.echo(f"Generated {num_forms} filled forms based on {file_path}")
@@ -1,17 +1,18 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import rich_click as click
-import numpy as np
-from mcqpy.cli.main import main
-from mcqpy.cli.config import QuizConfig, SelectionConfig
 from pathlib import Path
-from mcqpy.question.filter import FilterFactory
-
-from mcqpy.compile import MultipleChoiceQuiz
-from mcqpy.question import QuestionBank
-from mcqpy.compile.manifest import Manifest
 
 from rich.pretty import Pretty
 from rich.console import Console
 
+if TYPE_CHECKING:
+    from mcqpy.cli.config import SelectionConfig
+    from mcqpy.compile.error_bisect import QuizCompileError
+    from mcqpy.question import QuestionBank
+
 
 def build_solution(questions, manifest, output_path: Path):
     from mcqpy.compile.solution_pdf import SolutionPDF
@@ -20,6 +21,8 @@ def build_solution(questions, manifest, output_path: Path):
 
 
 def _select_questions(question_bank: QuestionBank, selection_config: SelectionConfig):
+    from mcqpy.question.filter import FilterFactory
+
     ## Setup filters:
     if selection_config.filters:
         filter_objs = []
@@ -38,7 +41,27 @@ def _select_questions(question_bank: QuestionBank, selection_config: SelectionCo
     return questions
 
 
-@main.command(name="build", help="Build the quiz PDF from question files")
+def _print_compile_failures(console: Console, error: QuizCompileError):
+    from rich.markup import escape
+    from rich.panel import Panel
+
+    result = error.result
+    console.print(
+        f"[bold red]Quiz failed to compile[/bold red], "
+        f"checked in {result.rounds} rounds of parallel compiles ({result.compiles} compiles)."
+    )
+    if not result.failures:
+        console.print("[bold red]No failing question was found.[/bold red]")
+    for failure in result.failures:
+        if failure.questions:
+            culprit = ", ".join(f"{q.slug} ({q.path})" if q.path else q.slug for q in failure.questions)
+            title = f"LaTeX error in question {culprit}" if len(failure.questions) == 1 else f"LaTeX error in questions {culprit}, which only fail together"
+        else:
+            title = "LaTeX error in the preamble or front matter"
+        console.print(Panel(escape(failure.excerpt or "(empty log)"), title=escape(title), title_align="left", border_style="red"))
+
+
+@click.command(name="build", help="Build the quiz PDF from question files")
 @click.option(
     "-c",
     "--config",
@@ -47,12 +70,39 @@ def _select_questions(question_bank: QuestionBank, selection_config: SelectionCo
     help="Path to the config file",
     show_default=True,
 )
-def build_command(config):
-    config = QuizConfig.read_yaml(config)
+@click.option(
+    "--locate-errors",
+    is_flag=True,
+    help="If the quiz fails to compile, compile parts of it in parallel to find the failing questions",
+)
+@click.option("--profile", is_flag=True, help="Print the time spent in each stage of the build")
+@click.option(
+    "--profile-trace",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Write the timed stages to a Chrome trace event JSON file, viewable in chrome://tracing or Perfetto",
+)
+def build_command(config, locate_errors, profile, profile_trace):
+    from mcqpy.utils.profiling import profile_command
+
+    console = Console()
+    with profile_command(profile, profile_trace, console, title="Build profile"):
+        _build(config, locate_errors, console)
+
+
+def _build(config: Path, locate_errors: bool, console: Console):
+    from mcqpy.cli.config import QuizConfig
+    from mcqpy.compile import MultipleChoiceQuiz
+    from mcqpy.compile.error_bisect import QuizCompileError
+    from mcqpy.compile.manifest import Manifest
+    from mcqpy.question import QuestionBank
+    from mcqpy.utils.profiling import stage
+
+    with stage("build.config"):
+        config = QuizConfig.read_yaml(config)
     question_bank = QuestionBank.from_directories(config.questions_paths, seed=config.selection.seed)
     questions = _select_questions(question_bank, config.selection)
 
-    console = Console()
     console.print("[bold green]Quiz Configuration:[/bold green]")
     console.print(Pretty(config))
     console.print(f"[bold green]Total questions in bank:[/bold green] {len(question_bank)}")
@@ -77,7 +127,12 @@ def build_command(config):
         header_footer=config.header,
     )
 
-    mcq.build(generate_pdf=True)
+    try:
+        with stage("build.quiz"):
+            mcq.build(generate_pdf=True, bisect_errors=locate_errors)
+    except QuizCompileError as error:
+        _print_compile_failures(console, error)
+        raise SystemExit(1)
 
     # Build solution PDF
     manifest_path = mcq.get_manifest_path()
@@ -85,4 +140,5 @@ def build_command(config):
     solution_output_path = (
         output_dir / f"{config.file_name.replace('.pdf', '')}_solution.pdf"
     )
-    build_solution(questions, manifest, solution_output_path)
+    with stage("build.solution"):
+        build_solution(questions, manifest, solution_output_path)
@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import rich_click as click
+
+
+@click.command(
+    name="calibrate", help="Calibrate IRT item parameters from stored answers"
+)
+@click.option(
+    "-c",
+    "--config",
+    type=click.Path(exists=True, path_type=Path),
+    default="config.yaml",
+    help="Path to the config file",
+    show_default=True,
+)
+@click.option(
+    "-s",
+    "--store",
+    "store_paths",
+    type=click.Path(exists=True, path_type=Path),
+    multiple=True,
+    help="Answer store(s) written by `mcqpy grade`, repeat for several exams "
+    "[default: answer store in the output directory]",
+)
+@click.option(
+    "-m",
+    "--manifest",
+    "manifest_paths",
+    type=click.Path(exists=True, path_type=Path),
+    multiple=True,
+    help="Manifest of each --store, in the same order "
+    "[default: manifest in the output directory]",
+)
+@click.option(
+    "--model",
+    type=click.Choice(["1PL", "2PL"]),
+    default="2PL",
+    help="IRT model to fit",
+    show_default=True,
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Parameter file to update "
+    "[default: irt_parameters.json in the first questions directory]",
+)
+def calibrate_command(
+    config, store_paths, manifest_paths, model: str, output: Path | None
+):
+    from rich.console import Console
+
+    from mcqpy.cli.config import QuizConfig
+    from mcqpy.compile.manifest import Manifest
+    from mcqpy.grade.answer_store import AnswerStore
+    from mcqpy.grade.irt import (
+        ITEM_PARAMETERS_FILE,
+        ItemParameterBank,
+        fit_irt,
+        responses_from_store,
+        stack_responses,
+    )
+
+    console = Console()
+    config = QuizConfig.read_yaml(config)
+    file_name = Path(config.file_name).stem
+    output_directory = Path(config.output_directory)
+
+    if not store_paths:
+        store_paths = [output_directory / f"{file_name}_answers.npz"]
+    if not manifest_paths and len(store_paths) == 1:
+        manifest_paths = [output_directory / f"{file_name}_manifest.json"]
+    if len(manifest_paths) != len(store_paths):
+        raise click.UsageError("Give one --manifest for each --store.")
+
+    blocks, slugs = [], {}
+    for store_path, manifest_path in zip(store_paths, manifest_paths):
+        store = AnswerStore.load(store_path)
+        manifest = Manifest.load_from_file(manifest_path)
+        blocks.append(responses_from_store(store, manifest))
+        slugs.update({item.qid: item.slug for item in manifest.items})
+
+    qids, responses = stack_responses(blocks)
+    console.print(
+        f"Calibrating {model} on {responses.shape[0]} submissions "
+        f"and {len(qids)} questions"
+    )
+    result = fit_irt(responses, model=model)
+    if not result.converged:
+        console.print(
+            "[bold yellow]Warning:[/bold yellow] did not converge in "
+            f"{result.n_iterations} iterations"
+        )
+
+    if output is None:
+        questions_paths = config.questions_paths
+        if isinstance(questions_paths, str):
+            questions_paths = [questions_paths]
+        output = Path(questions_paths[0]) / ITEM_PARAMETERS_FILE
+
+    parameters = (
+        ItemParameterBank.load_from_file(output)
+        if output.exists()
+        else ItemParameterBank()
+    )
+    parameters.update(qids, result, slugs=[slugs.get(qid) for qid in qids])
+    parameters.save_to_file(output)
+    console.print(
+        f"[bold green]Saved parameters of {len(qids)} questions to:[/bold green] "
+        f"{output}"
+    )
@@ -1,6 +1,6 @@
-from mcqpy.cli import main
+import rich_click as click
 
-@main.command('check-latex', help="Check LaTeX installation and configuration.")
+@click.command('check-latex', help="Check LaTeX installation and configuration.")
 def check_latex_command():
     from mcqpy.utils.check_latex import check_latex_installation
     from rich.console import Console
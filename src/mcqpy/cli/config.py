@@ -11,6 +11,15 @@ class SelectionConfig(BaseModel):
     shuffle: bool = Field(default=False, description="Whether to shuffle selected questions")
     sort_type: Literal['slug', 'none'] = Field(default='none', description="Sort type for selected questions")
 
+class GradingConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid", validate_assignment=True)
+    rubric: Literal['strict', 'partial'] = Field(default='strict', description="Rubric used to score questions")
+    rubric_options: dict[str, Any] = Field(default_factory=dict, description="Options passed to the rubric, e.g. penalty for 'partial'")
+
+    def get_rubric(self):
+        from mcqpy.grade.rubric import RubricFactory
+        return RubricFactory.from_config({"type": self.rubric, **self.rubric_options})
+
 class QuizConfig(BaseModel):
     model_config = ConfigDict(extra="forbid", validate_assignment=True)
     questions_paths: list[str] | str = Field(default=["questions"], description="Paths to question files or directories")
@@ -21,6 +30,7 @@ class QuizConfig(BaseModel):
     front_matter: FrontMatterOptions = Field(default_factory=FrontMatterOptions)
     header: HeaderFooterOptions = Field(default_factory=HeaderFooterOptions)
     selection: SelectionConfig = Field(default_factory=SelectionConfig)
+    grading: GradingConfig = Field(default_factory=GradingConfig)
 
     def yaml_dump(self) -> str:
         """Dump the current configuration to a YAML string"""
@@ -1,22 +1,351 @@
-import rich_click as click
-from mcqpy.cli.main import main
-from mcqpy.cli.config import QuizConfig
+from __future__ import annotations
+
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+import rich_click as click
+from rich.console import Console
+
+# Grading pulls in numpy, pandas and pypdf, which are imported when the
+# command runs rather than when the CLI starts.
+if TYPE_CHECKING:
+    from mcqpy.compile.manifest import Manifest
+    from mcqpy.grade import GradeWriter, MCQGrader
+    from mcqpy.grade.watch import SubmissionWatcher
+
+
+GRADE_FILE_FORMATS = ["xlsx", "csv", "parquet", "feather"]
+
+
+def _export_grades(graded_sets, output_path: Path, file_format: str, sort: bool = True):
+    from mcqpy.grade.export import write_grades
+
+    try:
+        write_grades(graded_sets, output_path, file_format, sort=sort)
+    except ImportError as e:
+        raise click.ClickException(str(e))
+
+
+def _record_graded(
+    grader: MCQGrader,
+    results: dict,
+    key,
+    parsed_set,
+    graded_set,
+    console: Console,
+    writer: GradeWriter | None,
+) -> GradeWriter | None:
+    """Store a graded submission in `results`, streaming its row to `writer` if given.
+
+    A submission with a different number of questions than the streamed rows
+    does not fit the CSV, so streaming is abandoned: the partial file is
+    removed, the streamed submissions are graded again and kept in memory, and
+    None is returned as the writer. The grades are then exported from memory,
+    with the missing questions left empty.
+    """
+    if writer is not None:
+        try:
+            # Streamed rows are not kept, only the much smaller parsed answers
+            writer.write(graded_set)
+            graded_set = None
+        except ValueError as e:
+            console.log(
+                f"[bold yellow]{e}[/bold yellow] Grades are exported once all "
+                "submissions are graded instead."
+            )
+            writer.close()
+            writer.path.unlink(missing_ok=True)
+            writer = None
+            for other, (other_parsed, other_graded) in results.items():
+                if other_graded is None:
+                    results[other] = (
+                        other_parsed,
+                        grader.grade(parsed_set=other_parsed),
+                    )
+    results[key] = (parsed_set, graded_set)
+    return writer
+
+
+def _grade_submissions(
+    grader: MCQGrader,
+    submissions: list[Path],
+    results: dict,
+    console: Console,
+    progress: bool = True,
+    writer: GradeWriter | None = None,
+) -> GradeWriter | None:
+    if progress:
+        from rich.progress import track
+
+        submissions = track(
+            submissions,
+            description=f"Grading submissions ({len(submissions)})",
+            total=len(submissions),
+        )
+    for submission in submissions:
+        try:
+            parsed_set = grader.parse(submission)
+        except Exception as e:
+            if progress:
+                raise
+            console.log(f"[bold red]Could not parse {submission}:[/bold red] {e}")
+            continue
+        graded_set = grader.grade(parsed_set=parsed_set)
+        writer = _record_graded(
+            grader, results, submission, parsed_set, graded_set, console, writer
+        )
+    return writer
+
+
+def _grade_scans(
+    grader: MCQGrader,
+    quiz_path: Path,
+    scans: list[Path],
+    results: dict,
+    console: Console,
+    writer: GradeWriter | None = None,
+) -> GradeWriter | None:
+    from mcqpy.grade.omr import OMRParser, SheetLayout
+
+    # Quizzes built before the manifest recorded field geometry are read from the PDF
+    if grader.manifest.has_field_geometry:
+        layout = SheetLayout.from_manifest(grader.manifest)
+    else:
+        layout = SheetLayout.from_pdf(quiz_path)
+    parser = OMRParser(layout)
+    with console.status(f"Reading scanned answer sheets ({len(scans)} files)"):
+        parsed_sets = parser.parse_batch(scans)
+    for parsed_set in parsed_sets:
+        graded_set = grader.grade(parsed_set=parsed_set)
+        writer = _record_graded(
+            grader,
+            results,
+            (parsed_set.file, parsed_set.student_id),
+            parsed_set,
+            graded_set,
+            console,
+            writer,
+        )
+    return writer
+
+
+def _watch_submissions(
+    grader: MCQGrader,
+    watcher: SubmissionWatcher,
+    results: dict,
+    write_outputs,
+    interval: float,
+    console: Console,
+):
+    console.print(
+        f"Watching {watcher.directory} for new submissions, press Ctrl+C to stop."
+    )
+    try:
+        while True:
+            time.sleep(interval)
+            changed, removed = watcher.poll()
+            if not changed and not removed:
+                continue
+            for path in removed:
+                results.pop(path, None)
+            _grade_submissions(grader, changed, results, console, progress=False)
+            write_outputs()
+            console.log(
+                f"Graded {len(changed)} new or changed submission(s), "
+                f"{len(results)} in total"
+            )
+    except KeyboardInterrupt:
+        console.print("Stopped watching.")
 
-from mcqpy.grade import MCQGrader, get_grade_dataframe
-from mcqpy.compile.manifest import Manifest
-from mcqpy.grade.rubric import StrictRubric
-from rich.progress import track
 
-from mcqpy.question.question_bank import QuestionBank
+def _report_collusion(
+    results: dict,
+    manifest: Manifest,
+    output_path: Path,
+    console: Console,
+    n_show: int = 10,
+):
+    from rich.table import Table
 
+    from mcqpy.grade.answer_store import AnswerStore
+    from mcqpy.grade.collusion import detect_collusion
 
-@main.command(name="grade", help="Grade student submissions")
-@click.option("-c", "--config", type=click.Path(exists=True, path_type=Path), default="config.yaml", help="Path to the config file", show_default=True)
+    store = AnswerStore.from_parsed_sets(
+        [parsed_set for parsed_set, _ in results.values()]
+    )
+    pairs = detect_collusion(store, manifest)
+    pairs.to_csv(output_path, index=False)
+
+    if pairs.empty:
+        console.print("No suspicious answer patterns found.")
+        return
+
+    table = Table(title=f"Flagged pairs ({len(pairs)})")
+    for column in [
+        "Student A",
+        "Student B",
+        "Shared incorrect",
+        "Both incorrect",
+        "Adjusted p-value",
+    ]:
+        table.add_column(column)
+    for row in pairs.head(n_show).itertuples():
+        table.add_row(
+            f"{row.student_name_a} ({row.student_id_a})",
+            f"{row.student_name_b} ({row.student_id_b})",
+            str(row.shared_incorrect),
+            str(row.both_incorrect),
+            f"{row.adjusted_p_value:.2e}",
+        )
+    console.print(table)
+    console.print(f"[bold green]Flagged pairs written to:[/bold green] {output_path}")
+
+
+@click.command(name="grade", help="Grade student submissions")
+@click.option(
+    "-c",
+    "--config",
+    type=click.Path(exists=True, path_type=Path),
+    default="config.yaml",
+    help="Path to the config file",
+    show_default=True,
+)
 @click.option("-v", "--verbose", is_flag=True, help="Enable verbose output")
-@click.option("-f", "--file-format", type=click.Choice(["xlsx", "csv"]), default="xlsx", help="Output format for the grades", show_default=True)
-@click.option('-a', '--analysis', is_flag=True, help="Generate question analysis reports", default=False)
-def grade_command(config, verbose: bool, file_format: str, analysis: bool):
+@click.option(
+    "-f",
+    "--file-format",
+    type=click.Choice(GRADE_FILE_FORMATS),
+    default="xlsx",
+    help="Output format for the grades, parquet and feather also write a "
+    "per-question selections table",
+    show_default=True,
+)
+@click.option(
+    "-a",
+    "--analysis",
+    is_flag=True,
+    help="Generate question analysis reports",
+    default=False,
+)
+@click.option(
+    "--analysis-format",
+    type=click.Choice(["pdf", "html"]),
+    default="pdf",
+    help="Analysis report as a LaTeX PDF or as HTML with a JSON summary, "
+    "which needs no LaTeX",
+    show_default=True,
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Re-parse all submissions instead of reusing cached answers",
+    default=False,
+)
+@click.option(
+    "-w",
+    "--watch",
+    is_flag=True,
+    help="Keep running and grade new submissions as they arrive",
+    default=False,
+)
+@click.option(
+    "--interval",
+    type=float,
+    default=2.0,
+    help="Seconds between checks for new submissions in watch mode",
+    show_default=True,
+)
+@click.option(
+    "--sort/--no-sort",
+    default=True,
+    help="Sort the exported grades by student name",
+    show_default=True,
+)
+@click.option(
+    "--scanned",
+    is_flag=True,
+    help="Submissions are scans of printed answer sheets, read the marked checkboxes",
+    default=False,
+)
+@click.option(
+    "--collusion",
+    is_flag=True,
+    help="Flag pairs of students with improbably many identical incorrect answers",
+    default=False,
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Print the time spent in each stage of grading",
+    default=False,
+)
+@click.option(
+    "--profile-trace",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Write the timed stages to a Chrome trace event JSON file, "
+    "viewable in chrome://tracing or Perfetto",
+)
+def grade_command(
+    config,
+    verbose: bool,
+    file_format: str,
+    analysis: bool,
+    no_cache: bool,
+    watch: bool,
+    interval: float,
+    sort: bool,
+    collusion: bool,
+    analysis_format: str,
+    scanned: bool,
+    profile: bool,
+    profile_trace: Path | None,
+):
+    from mcqpy.utils.profiling import profile_command
+
+    with profile_command(profile, profile_trace, Console(), title="Grade profile"):
+        _grade(
+            config,
+            verbose,
+            file_format,
+            analysis,
+            no_cache,
+            watch,
+            interval,
+            sort,
+            collusion,
+            analysis_format,
+            scanned,
+        )
+
+
+def _grade(
+    config,
+    verbose: bool,
+    file_format: str,
+    analysis: bool,
+    no_cache: bool,
+    watch: bool,
+    interval: float,
+    sort: bool,
+    collusion: bool,
+    analysis_format: str,
+    scanned: bool,
+):
+    from mcqpy.cli.config import QuizConfig
+    from mcqpy.compile.manifest import Manifest
+    from mcqpy.grade import GradeWriter, MCQGrader
+    from mcqpy.grade.answer_store import AnswerStore
+    from mcqpy.grade.cache import ParseCache
+    from mcqpy.grade.parse_pdf import MCQPDFParser
+    from mcqpy.grade.watch import SubmissionWatcher
+    from mcqpy.question.question_bank import QuestionBank
+    from mcqpy.utils.profiling import stage
+
+    console = Console()
+    if scanned and watch:
+        raise click.UsageError("--scanned cannot be combined with --watch.")
 
     # Load config
     config = QuizConfig.read_yaml(config)
@@ -24,29 +353,103 @@ def grade_command(config, verbose: bool, file_format: str, analysis: bool):
     manifest_path = Path(config.output_directory) / f"{file_name}_manifest.json"
     manifest = Manifest.load_from_file(manifest_path)
 
+    # Parsed answers are cached by file content, so re-runs only parse new or
+    # changed submissions
+    cache = None
+    if not (no_cache or scanned):
+        cache_path = Path(config.output_directory) / f"{file_name}_parse_cache.json"
+        cache = ParseCache(cache_path, parser_version=MCQPDFParser.version)
+
+    output_path = (
+        Path(config.submission_directory).parent / f"{file_name}_grades.{file_format}"
+    )
+    store_path = Path(config.output_directory) / f"{file_name}_answers.npz"
+
+    # CSV grades are streamed to disk as submissions are graded, unless they
+    # are needed again for the analysis or for rewriting in watch mode.
+    writer = None
+    if file_format == "csv" and not (watch or analysis):
+        writer = GradeWriter(output_path)
+
     # Read & Grade submissions
-    graded_sets = []    
+    results = {}
     submissions = list(Path(config.submission_directory).glob("*.pdf"))
-    for submission in track(submissions, description=f"Grading submissions ({len(submissions)})", total=len(submissions)):
-        grader = MCQGrader(manifest, StrictRubric())
-        graded_set = grader.grade(submission)
-        graded_sets.append(graded_set)
-
-    # Export grades to dataframe
-    df = get_grade_dataframe(graded_sets)
-    output_path = Path(config.submission_directory).parent / f"{file_name}_grades.{file_format}"
-    if file_format == "xlsx":
-        df.to_excel(output_path, index=False)
-    elif file_format == "csv":
-        df.to_csv(output_path, index=False)
+    grader = MCQGrader(manifest, config.grading.get_rubric(), cache=cache)
+
+    def write_outputs():
+        with stage("grade.write_outputs"):
+            parsed_sets = [parsed_set for parsed_set, _ in results.values()]
+            graded_sets = [graded_set for _, graded_set in results.values()]
+
+            if cache is not None:
+                cache.save()
+                if verbose:
+                    print(f"Parse cache: {cache.hits} reused, {cache.misses} parsed")
+
+            # Store the answers so `mcqpy regrade` can re-score without the PDFs
+            AnswerStore.from_parsed_sets(parsed_sets).save(store_path)
+
+            # Export grades to dataframe
+            if writer is not None:
+                writer.close(sort_by="student_name" if sort else None)
+            else:
+                _export_grades(graded_sets, output_path, file_format, sort=sort)
+
+    # The writer is closed even if grading fails, so the CSV is not left open.
+    try:
+        with stage("grade.submissions", n_submissions=len(submissions)):
+            if scanned:
+                quiz_path = Path(config.output_directory) / config.file_name
+                writer = _grade_scans(
+                    grader, quiz_path, submissions, results, console, writer=writer
+                )
+            else:
+                writer = _grade_submissions(
+                    grader, submissions, results, console, writer=writer
+                )
+        write_outputs()
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if watch:
+        watcher = SubmissionWatcher(config.submission_directory)
+        watcher.mark_seen(submissions)
+        _watch_submissions(grader, watcher, results, write_outputs, interval, console)
+
+    if collusion:
+        _report_collusion(
+            results,
+            manifest,
+            Path(config.submission_directory).parent / f"{file_name}_collusion.csv",
+            console,
+        )
+
+    graded_sets = [graded_set for _, graded_set in results.values()]
 
     if analysis:
-        from mcqpy.grade.analysis import QuizAnalysis
-        analysis_directory = Path('analysis/')
+        analysis_directory = Path("analysis/")
         analysis_directory.mkdir(exist_ok=True)
 
         question_bank = QuestionBank.from_directories(config.questions_paths)
         print(f"Question bank loaded for analysis - {len(question_bank)}")
 
-        quiz_analysis = QuizAnalysis(graded_sets, question_bank=question_bank, output_dir=analysis_directory)
-        quiz_analysis.build()
+        with stage("grade.analysis", format=analysis_format):
+            if analysis_format == "html":
+                from mcqpy.grade.report import write_html_report
+
+                html_path, _ = write_html_report(
+                    graded_sets, analysis_directory, question_bank=question_bank
+                )
+                console.print(
+                    f"[bold green]Analysis report written to:[/bold green] {html_path}"
+                )
+            else:
+                from mcqpy.grade.analysis import QuizAnalysis
+
+                quiz_analysis = QuizAnalysis(
+                    graded_sets,
+                    question_bank=question_bank,
+                    output_dir=analysis_directory,
+                )
+                quiz_analysis.build()
@@ -1,11 +1,9 @@
 import rich_click as click
-from mcqpy.cli.main import main
-from mcqpy.cli.config import QuizConfig
 
 from pathlib import Path
 
 
-@main.command(name="init", help="Initialize a new quiz project")
+@click.command(name="init", help="Initialize a new quiz project")
 @click.argument("name", type=str, help="The name of the quiz project")
 @click.option(
     "-f",
@@ -45,6 +43,8 @@ def init_command(
     output_directory: str,
     submission_directory: str,
 ):
+    from mcqpy.cli.config import QuizConfig
+
     # Create project directory
     project_path = Path(name)
     project_path.mkdir(parents=True, exist_ok=False)
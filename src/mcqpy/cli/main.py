@@ -1,10 +1,47 @@
+import importlib
+
 import rich_click as click
 
-@click.group(name="mcqpy")
+
+class LazyGroup(click.RichGroup):
+    """Group whose subcommands are imported the first time they are used.
+
+    Subcommands are given as `{name: "module:attribute"}`, so running one
+    command does not import the modules, and their dependencies, of all the
+    others. Command modules keep their heavy imports inside the command
+    functions, so listing the commands in `--help` stays cheap as well.
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict[str, str] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx) -> list[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name: str):
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            module_name, attribute = self.lazy_subcommands[cmd_name].split(":")
+            self.add_command(getattr(importlib.import_module(module_name), attribute), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+COMMANDS = {
+    "init": "mcqpy.cli.init:init_command",
+    "build": "mcqpy.cli.build:build_command",
+    "grade": "mcqpy.cli.grade:grade_command",
+    "regrade": "mcqpy.cli.regrade:regrade_command",
+    "calibrate": "mcqpy.cli.calibrate:calibrate_command",
+    "test-autofill": "mcqpy.cli.autofill:autofill_command",
+    "question": "mcqpy.cli.question.main:question_group",
+    "check-latex": "mcqpy.cli.check_latex:check_latex_command",
+}
+
+
+@click.group(name="mcqpy", cls=LazyGroup, lazy_subcommands=COMMANDS)
 @click.version_option()
 def main() -> None:
     """
     Command line interface for mcqpy.
     """
     return None # pragma: no cover
-
@@ -1,4 +1,15 @@
+import importlib
+
 from .main import question_group
-from .validate import validate_command
-from .init import init_command
-from .render import render_command
\ No newline at end of file
+
+_COMMAND_MODULES = {
+    "validate_command": "mcqpy.cli.question.validate",
+    "init_command": "mcqpy.cli.question.init",
+    "render_command": "mcqpy.cli.question.render",
+}
+
+
+def __getattr__(name: str):
+    if name in _COMMAND_MODULES:
+        return getattr(importlib.import_module(_COMMAND_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,7 @@
 import rich_click as click
 
 
-from mcqpy.cli.question.main import question_group
-
-
-@question_group.command(name="init", help="Initialize question file.")
+@click.command(name="init", help="Initialize question file.")
 @click.argument("path", type=click.Path(exists=False))
 def init_command(path):
     from mcqpy.question import Question
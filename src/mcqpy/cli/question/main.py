@@ -1,7 +1,14 @@
 import rich_click as click
-from mcqpy.cli.main import main
+from mcqpy.cli.main import LazyGroup
 
-@main.group(name="question")
+COMMANDS = {
+    "validate": "mcqpy.cli.question.validate:validate_command",
+    "init": "mcqpy.cli.question.init:init_command",
+    "render": "mcqpy.cli.question.render:render_command",
+}
+
+
+@click.group(name="question", cls=LazyGroup, lazy_subcommands=COMMANDS)
 def question_group() -> None:
     """
     Commands related to question management.
@@ -1,60 +1,70 @@
 import rich_click as click
 
 
-from mcqpy.cli.question.main import question_group
-
-def _render_question(name, question):
-    from pylatex import Document
-    from mcqpy.compile.latex_questions import build_question
-    from mcqpy.compile.preamble import add_preamble
-
-    document = Document(
-        documentclass="article",
-        geometry_options={
-            "paper": "a4paper",
-            "includeheadfoot": True,
-            "left": "2cm",
-            "right": "3cm",
-            "top": "2.5cm",
-            "bottom": "2.5cm",
-        },
-    )
-
-    add_preamble(document)
-    build_question(document, question, quiz_index=0)
-    document.generate_pdf(f"{name}", clean_tex=True)
-
-    return name
-
-
+@click.command(
+    name="render",
+    help="Render questions as PDF, one page and bookmark per question. Useful to check LaTeX formatting. "
+    "Accepts question files, directories (searched recursively) and glob patterns.",
+)
+@click.argument("paths", nargs=-1, required=True)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(),
+    default=None,
+    help="Output PDF, defaults to the question name for a single question and questions.pdf otherwise",
+)
+@click.option(
+    "-c",
+    "--chunk-size",
+    type=int,
+    default=None,
+    help="Questions per PDF, chunks are compiled in parallel. Defaults to a single PDF",
+)
+@click.option("-w", "--workers", type=int, default=None, help="Number of worker processes, defaults to all CPUs")
+def render_command(paths, output, chunk_size, workers):
+    from pathlib import Path
 
-@question_group.command(name="render", help="Render a question as PDF. Useful to check LaTeX formatting.")
-@click.argument("path", type=click.Path(exists=True))
-def render_command(path):
+    from mcqpy.compile.review import render_questions
     from mcqpy.question import Question
+    from mcqpy.question.validation import find_question_files
     from rich.console import Console
-    import subprocess
-    from pathlib import Path
+    from rich.markup import escape
 
     console = Console()
-    try:
-        question = Question.load_yaml(path)
-    except Exception as e:
-        console.print(f"[bold red]Error loading question from {path}:[/bold red]")
-        console.print(e)
-        return 
-    
-    name = Path(path).stem
-
-    try:
-       _render_question(name, question)
-    except subprocess.CalledProcessError as e:
-        console.print(f"[bold red]Invalid latex for question {path}[/bold red]")
-    except Exception as e:
-        console.print(f"[bold red]Error generating question PDF for {path}:[/bold red]")
-        console.print(e)
-    else:
-        console.print(f"[bold green]Generated question PDF at: {name}.pdf[/bold green]")
+    files = find_question_files(paths)
+    if not files:
+        console.print("[bold red]No question files found.[/bold red]")
+        return
 
+    questions = []
+    for path in files:
+        try:
+            questions.append(Question.load_yaml(path))
+        except Exception as e:
+            console.print(f"[bold red]Error loading question from {escape(str(path))}:[/bold red]")
+            console.print(e)
+    if not questions:
+        return
 
+    if output is None:
+        output = f"{files[0].stem}.pdf" if len(files) == 1 else "questions.pdf"
 
+    for result in render_questions(questions, Path(output), chunk_size=chunk_size, workers=workers):
+        if result.ok:
+            console.print(f"[bold green]Generated question PDF at: {escape(str(result.file))}[/bold green]")
+        elif result.status == "error":
+            console.print(f"[bold red]Error generating question PDF for {escape(str(result.file))}:[/bold red]")
+            console.print(result.message)
+        elif not result.errors:
+            console.print(
+                f"[bold red]Invalid latex for questions in {escape(str(result.file))}[/bold red], "
+                f"see {escape(str(result.log))}"
+            )
+        else:
+            for index, error in result.errors:
+                source = result.questions[index].path if index is not None else f"questions in {result.file}"
+                console.print(
+                    f"[bold red]Invalid latex for question {escape(str(source))}:[/bold red] {escape(str(error))}",
+                    soft_wrap=True,
+                )
@@ -1,25 +1,36 @@
 import rich_click as click
 
 
-from mcqpy.cli.question.main import question_group
-
-
-@question_group.command(name="validate", help="Validate question files")
-@click.argument("paths", type=click.Path(exists=True), nargs=-1)
-def validate_command(paths):
-    from mcqpy.question import Question
+@click.command(name="validate", help="Validate question files, directories (searched recursively) or glob patterns")
+@click.argument("paths", nargs=-1, required=True)
+@click.option("-w", "--workers", type=int, default=None, help="Number of worker processes, defaults to all CPUs")
+@click.option("-v", "--verbose", is_flag=True, help="Also list valid question files")
+@click.option("--latex", is_flag=True, help="Also check the LaTeX of text, choices and explanations without compiling")
+def validate_command(paths, workers, verbose, latex):
+    from mcqpy.question.validation import validate_questions
     from rich.console import Console
-    from rich.pretty import Pretty
+    from rich.markup import escape
 
     console = Console()
+    report = validate_questions(paths, workers=workers, latex=latex)
+
+    if verbose:
+        for path in report.valid_paths:
+            console.print(f"[bold green]Valid question file:[/bold green] {escape(str(path))}")
+    for issue in report.issues:
+        console.print(
+            f"[bold red]Error loading question from {escape(str(issue.path))}:[/bold red] "
+            f"[red]{issue.kind}[/red] - {escape(issue.message)}",
+            soft_wrap=True,
+        )
 
-    for path in paths:
-        try:
-            question = Question.load_yaml(path)
-            console.print(f"[bold green]Valid question file:[/bold green] {path}")
-        except Exception as e:
-            console.print(f"[bold red]Error loading question from {path}:[/bold red]")
-            console.print(e)
+    if report.n_files == 0:
+        console.print("[bold red]No question files found.[/bold red]")
+    else:
+        counts = ", ".join(f"{n} {kind}" for kind, n in sorted(report.counts().items()))
+        style = "bold green" if report.ok else "bold red"
+        summary = f"{report.n_valid}/{report.n_files} question files valid"
+        console.print(f"[{style}]{summary}[/{style}]" + (f" ({counts})" if counts else ""))
 
-        console.print()
-            
\ No newline at end of file
+    if not report.ok:
+        raise SystemExit(1)
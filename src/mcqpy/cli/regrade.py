@@ -0,0 +1,38 @@
+import rich_click as click
+from pathlib import Path
+
+from mcqpy.cli.grade import GRADE_FILE_FORMATS
+
+
+@click.command(name="regrade", help="Re-score stored answers, e.g. after fixing the key, without parsing the PDFs again")
+@click.option("-c", "--config", type=click.Path(exists=True, path_type=Path), default="config.yaml", help="Path to the config file", show_default=True)
+@click.option("-f", "--file-format", type=click.Choice(GRADE_FILE_FORMATS), default="xlsx", help="Output format for the grades", show_default=True)
+@click.option("-m", "--manifest", "manifest_path", type=click.Path(exists=True, path_type=Path), default=None, help="Manifest to grade against [default: manifest in the output directory]")
+@click.option("-s", "--store", "store_path", type=click.Path(exists=True, path_type=Path), default=None, help="Answer store written by `mcqpy grade` [default: answer store in the output directory]")
+def regrade_command(config, file_format: str, manifest_path: Path | None, store_path: Path | None):
+    from mcqpy.cli.config import QuizConfig
+    from mcqpy.cli.grade import _export_grades
+    from mcqpy.compile.manifest import Manifest
+    from mcqpy.grade import MCQGrader
+    from mcqpy.grade.answer_store import AnswerStore
+
+    config = QuizConfig.read_yaml(config)
+    file_name = Path(config.file_name).stem
+    output_directory = Path(config.output_directory)
+    manifest_path = manifest_path or output_directory / f"{file_name}_manifest.json"
+    store_path = store_path or output_directory / f"{file_name}_answers.npz"
+
+    if not store_path.exists():
+        raise click.ClickException(
+            f"No answer store found at {store_path}, run `mcqpy grade` first."
+        )
+
+    manifest = Manifest.load_from_file(manifest_path)
+    store = AnswerStore.load(store_path)
+
+    grader = MCQGrader(manifest, config.grading.get_rubric())
+    graded_sets = grader.grade_store(store)
+
+    output_path = Path(config.submission_directory).parent / f"{file_name}_grades.{file_format}"
+    _export_grades(graded_sets, output_path, file_format)
+    click.echo(f"Regraded {len(graded_sets)} submissions from {store_path} into {output_path}")
@@ -0,0 +1,164 @@
+import re
+import subprocess
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from mcqpy.compile.latex_errors import MARKER_PREFIX, LatexError, log_excerpt, parse_latex_log
+from mcqpy.question import Question
+from mcqpy.utils.parallel import process_pool, resolve_workers, split_chunks
+
+_MARKER = re.compile(rf"^%{MARKER_PREFIX}:(\d+):.*$", re.MULTILINE)
+
+
+@dataclass
+class FragmentFailure:
+    """Questions whose LaTeX fails to compile, empty for the preamble and front matter."""
+
+    indices: list[int]
+    questions: list[Question]
+    errors: list[LatexError]
+    excerpt: str
+
+    @property
+    def slugs(self) -> list[str]:
+        return [question.slug for question in self.questions]
+
+    @property
+    def paths(self) -> list[Path | None]:
+        return [question.path for question in self.questions]
+
+
+@dataclass
+class BisectResult:
+    failures: list[FragmentFailure] = field(default_factory=list)
+    rounds: int = 0
+    compiles: int = 0
+
+
+class QuizCompileError(subprocess.CalledProcessError):
+    """A failed quiz compile, with the failing questions found by bisection."""
+
+    def __init__(self, error: subprocess.CalledProcessError, result: BisectResult):
+        super().__init__(error.returncode, error.cmd, error.output, error.stderr)
+        self.result = result
+
+    def __str__(self) -> str:
+        culprits = ", ".join(
+            "/".join(failure.slugs) if failure.questions else "preamble" for failure in self.result.failures
+        )
+        return f"{super().__str__()} Failing LaTeX: {culprits or 'not found'}."
+
+
+def split_fragments(tex: str) -> tuple[str, list[str], str]:
+    """Split a quiz source at its question markers.
+
+    Returns:
+        tuple: The source before the first question (preamble and front
+            matter), the source of each question and the end of the document.
+    """
+    starts = [match.start() for match in _MARKER.finditer(tex)]
+    end = tex.rindex(r"\end{document}")
+    if not starts:
+        return tex[:end], [], tex[end:]
+    bounds = starts + [end]
+    questions = [tex[bounds[k] : bounds[k + 1]] for k in range(len(starts))]
+    return tex[: starts[0]], questions, tex[end:]
+
+
+def _compile_fragment(tex: str, name: str, directory: str, cwd: str, compiler: str) -> tuple[bool, str]:
+    """Compile a fragment once without writing a PDF, returning (success, log)."""
+    path = Path(directory) / f"{name}.tex"
+    path.write_text(tex, encoding="utf-8")
+    command = [
+        compiler,
+        "-interaction=nonstopmode",
+        "-halt-on-error",
+        "-draftmode",
+        f"-output-directory={directory}",
+        str(path),
+    ]
+    process = subprocess.run(command, cwd=cwd, capture_output=True)
+    log_path = path.with_suffix(".log")
+    log = log_path.read_text(errors="replace") if log_path.exists() else process.stdout.decode(errors="replace")
+    return process.returncode == 0, log
+
+
+def bisect_compile_errors(
+    tex: str,
+    questions: list[Question],
+    cwd: Path | str = ".",
+    workers: int | None = None,
+    compiler: str = "pdflatex",
+) -> BisectResult:
+    """Find the questions that break the compile of a quiz.
+
+    The quiz source is split at its question markers, and fragments made of
+    the preamble and a batch of questions are compiled in parallel. Failing
+    batches are split into as many parts as there are workers until single
+    questions remain, so locating one bad question among n takes about
+    log(n) / log(workers) rounds.
+
+    Args:
+        tex: Source of the quiz, with question markers.
+        questions: Questions of the quiz, in order.
+        cwd: Directory relative paths in the source are resolved from.
+        workers: Number of parallel compiles, None uses all CPUs.
+        compiler: LaTeX compiler to run.
+    Returns:
+        BisectResult: Failing questions, or batches of questions that only
+            fail together, with the errors and an excerpt of their log.
+    """
+    head, fragments, tail = split_fragments(tex)
+    n_workers = resolve_workers(workers, max(len(fragments), 1))
+    result = BisectResult()
+
+    # The first round also compiles the preamble and front matter on their own.
+    batches = [[]] + (split_chunks(list(range(len(fragments))), max(2, n_workers)) if fragments else [])
+    pending = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        executor = process_pool(n_workers) if n_workers > 1 else None
+        try:
+            while batches:
+                result.rounds += 1
+                args = [
+                    (head + "".join(fragments[k] for k in batch) + tail, f"round{result.rounds}_{number}", directory, str(cwd), compiler)
+                    for number, batch in enumerate(batches)
+                ]
+                if executor is None:
+                    outcomes = [_compile_fragment(*arg) for arg in args]
+                else:
+                    outcomes = list(executor.map(_compile_fragment, *zip(*args)))
+                result.compiles += len(batches)
+
+                failing = [(batch, log) for batch, (ok, log) in zip(batches, outcomes) if not ok]
+                if failing and not failing[0][0]:
+                    # Every fragment contains the preamble, so nothing else can be located.
+                    result.failures.append(_failure([], questions, failing[0][1]))
+                    break
+
+                # A batch failed although all of its parts compile: its questions only fail together.
+                failed = {tuple(batch) for batch, _ in failing}
+                for parent, (log, parts) in pending.items():
+                    if not any(tuple(part) in failed for part in parts):
+                        result.failures.append(_failure(list(parent), questions, log))
+
+                pending, batches = {}, []
+                for batch, log in failing:
+                    if len(batch) == 1:
+                        result.failures.append(_failure(batch, questions, log))
+                        continue
+                    parts = split_chunks(batch, max(2, n_workers // len(failing)))
+                    pending[tuple(batch)] = (log, parts)
+                    batches.extend(parts)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    result.failures.sort(key=lambda failure: failure.indices[:1])
+    return result
+
+
+def _failure(batch: list[int], questions: list[Question], log: str) -> FragmentFailure:
+    return FragmentFailure(batch, [questions[k] for k in batch], parse_latex_log(log), log_excerpt(log))
@@ -0,0 +1,117 @@
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from pypdf import PdfReader
+
+# Names of the answer checkboxes made by `latex_helpers.multi_checkbox`, the
+# groups are quiz index, option, slug and qid. The slug is matched greedily
+# so the qid is whatever follows the last '-qid='.
+CHECKBOX_NAME_PATTERN = re.compile(r"Q(\d+)-opt=(\d+)-slug=(.*)-qid=(.*)")
+
+
+def checkbox_name(quiz_index: int, option: int, slug: str, qid: str) -> str:
+    """Name of an answer checkbox, the inverse of `parse_checkbox_name`."""
+    return f"Q{quiz_index}-opt={option}-slug={slug}-qid={qid}"
+
+
+def parse_checkbox_name(name: str) -> tuple[int, int, str, str] | None:
+    """Split a checkbox name into (quiz index, option, slug, qid).
+
+    Returns None for names of other fields, e.g. the student name.
+    """
+    match = CHECKBOX_NAME_PATTERN.fullmatch(name)
+    if match is None:
+        return None
+    quiz_index, option, slug, qid = match.groups()
+    return int(quiz_index), int(option), slug, qid
+
+
+@dataclass
+class Widget:
+    """Location of one form field widget in a PDF.
+
+    Attributes:
+        name: Full field name.
+        page: Zero-based page number.
+        annotation: Index of the widget in the page's `/Annots` array.
+        rect: Rectangle (x0, y0, x1, y1) in PDF points.
+    """
+
+    name: str
+    page: int
+    annotation: int
+    rect: tuple[float, float, float, float]
+
+
+@dataclass
+class CheckboxWidget(Widget):
+    """Widget of an answer checkbox, with the parts of its name.
+
+    Attributes:
+        quiz_index: Position of the question in the quiz.
+        option: Option index within the question.
+        slug: Question slug.
+        qid: Question ID.
+    """
+
+    quiz_index: int = 0
+    option: int = 0
+    slug: str = ""
+    qid: str = ""
+
+
+def widget_name(annotation) -> str | None:
+    """Field name of a widget annotation, which may be on its parent field."""
+    name = annotation.get("/T")
+    if name is None and "/Parent" in annotation:
+        name = annotation["/Parent"].get_object().get("/T")
+    return str(name) if name is not None else None
+
+
+def read_widgets(pdf: str | Path | PdfReader) -> tuple[list[Widget], list[tuple[float, float, float, float]]]:
+    """Read all form field widgets from the page annotations of a PDF.
+
+    Args:
+        pdf: Path to the PDF or an open reader.
+    Returns:
+        tuple: The widgets in page order and the media box of every page.
+    """
+    reader = pdf if isinstance(pdf, PdfReader) else PdfReader(pdf)
+    widgets, page_boxes = [], []
+    for page_number, page in enumerate(reader.pages):
+        box = page.mediabox
+        page_boxes.append((float(box.left), float(box.bottom), float(box.right), float(box.top)))
+        for index, annotation in enumerate(page.get("/Annots") or []):
+            annotation = annotation.get_object()
+            if annotation.get("/Subtype") != "/Widget":
+                continue
+            name = widget_name(annotation)
+            if name is None:
+                continue
+            x0, y0, x1, y1 = (float(v) for v in annotation["/Rect"])
+            rect = (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+            widgets.append(Widget(name, page_number, index, rect))
+    return widgets, page_boxes
+
+
+def checkbox_widgets(widgets: list[Widget]) -> list[CheckboxWidget]:
+    """The answer checkboxes among `widgets`."""
+    checkboxes = []
+    for widget in widgets:
+        parsed = parse_checkbox_name(widget.name)
+        if parsed is not None:
+            checkboxes.append(CheckboxWidget(widget.name, widget.page, widget.annotation, widget.rect, *parsed))
+    return checkboxes
+
+
+def read_checkbox_widgets(pdf: str | Path | PdfReader) -> tuple[list[CheckboxWidget], list[tuple[float, float, float, float]]]:
+    """Read the answer checkboxes from the widget annotations of a quiz PDF.
+
+    Args:
+        pdf: Path to the PDF or an open reader.
+    Returns:
+        tuple: The checkboxes in page order and the media box of every page.
+    """
+    widgets, page_boxes = read_widgets(pdf)
+    return checkbox_widgets(widgets), page_boxes
@@ -0,0 +1,97 @@
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+
+from pylatex.utils import NoEscape
+
+MARKER_PREFIX = "mcqpy-question"
+
+_MARKER = re.compile(rf"^%{MARKER_PREFIX}:(\d+):")
+_ERROR = re.compile(r"^! (.*)$")
+_FILE_LINE_ERROR = re.compile(r"^.*\.tex:(\d+): (.*)$")
+_LINE = re.compile(r"^l\.(\d+) ?(.*)$")
+
+# Lines of a log searched for the line number of an error.
+_ERROR_CONTEXT = 12
+
+
+@dataclass(frozen=True)
+class LatexError:
+    message: str
+    line: int | None = None
+    context: str = ""
+
+    def __str__(self) -> str:
+        location = f" (line {self.line}: {self.context.strip()})" if self.line is not None else ""
+        return f"{self.message}{location}"
+
+
+def question_marker(index: int, label: str = "") -> NoEscape:
+    """LaTeX comment marking the start of question `index` in a document."""
+    return NoEscape(f"%{MARKER_PREFIX}:{index}:{label}\n")
+
+
+def parse_latex_log(log: str) -> list[LatexError]:
+    """Errors in a LaTeX log, with the line of the .tex file they occurred on.
+
+    Both the default error format ('! message' followed by 'l.<line>') and
+    the -file-line-error format ('file.tex:<line>: message') are recognized.
+
+    Args:
+        log: Contents of the .log file or the compiler output.
+    Returns:
+        list[LatexError]: Errors in the order they were reported.
+    """
+    lines = log.splitlines()
+    errors = []
+    for index, text in enumerate(lines):
+        if match := _FILE_LINE_ERROR.match(text):
+            errors.append(LatexError(match.group(2).strip(), int(match.group(1))))
+            continue
+        if not (match := _ERROR.match(text)):
+            continue
+        # Errors reported as file-line errors are repeated in the default format.
+        if errors and errors[-1].message == match.group(1).strip() and errors[-1].line is not None:
+            continue
+        line, context = None, ""
+        for following in lines[index + 1 : index + 1 + _ERROR_CONTEXT]:
+            if _ERROR.match(following):
+                break
+            if found := _LINE.match(following):
+                line, context = int(found.group(1)), found.group(2)
+                break
+        errors.append(LatexError(match.group(1).strip(), line, context))
+    return errors
+
+
+def log_excerpt(log: str, n_lines: int = 8) -> str:
+    """Lines of a LaTeX log from its first error on, or its last lines if no error is found."""
+    lines = log.splitlines()
+    start = next(
+        (index for index, text in enumerate(lines) if _ERROR.match(text) or _FILE_LINE_ERROR.match(text)),
+        max(len(lines) - n_lines, 0),
+    )
+    return "\n".join(lines[start : start + n_lines]).rstrip()
+
+
+def locate_errors(tex: str, errors: list[LatexError]) -> list[tuple[int | None, LatexError]]:
+    """Assign errors to the questions of a document using the question markers.
+
+    Args:
+        tex: Source of the document the errors were reported for.
+        errors: Errors reported by the compiler.
+    Returns:
+        list[tuple[int | None, LatexError]]: Index of the question each error
+            occurred in, None for errors outside a question or without a line.
+    """
+    marker_lines, indices = [], []
+    for number, text in enumerate(tex.splitlines(), start=1):
+        if match := _MARKER.match(text):
+            marker_lines.append(number)
+            indices.append(int(match.group(1)))
+
+    located = []
+    for error in errors:
+        position = bisect_right(marker_lines, error.line) if error.line is not None else 0
+        located.append((indices[position - 1] if position else None, error))
+    return located
@@ -1,5 +1,8 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, Field
 
+from mcqpy.compile.fields import read_widgets, parse_checkbox_name
 from mcqpy.question import Question, compute_question_sha256
 
 
@@ -33,6 +36,14 @@ class ManifestItem(BaseModel):
 
     sha256: str | None = Field(..., description="SHA256 hash of the question blob")
     point_value: int | None = Field(..., description="Point value of the question")
+    question_type: Literal["single", "multiple"] | None = Field(
+        None, description="Type of question, used by partial credit rubrics"
+    )
+    option_widgets: list[tuple[int, int, float, float, float, float]] | None = Field(
+        None,
+        description="Page, index in the page's annotations and rectangle (x0, y0, x1, y1) "
+        "of each option's checkbox in the quiz PDF",
+    )
 
     @classmethod
     def from_question(
@@ -61,11 +72,58 @@ class ManifestItem(BaseModel):
             sha256=sha256,
             correct_onehot=correct_onehot,
             point_value=question.point_value,
+            question_type=question.question_type,
         )
 
 
 class Manifest(BaseModel):
     items: list[ManifestItem]
+    page_boxes: list[tuple[float, float, float, float]] | None = Field(
+        None, description="Media box of each page of the quiz PDF"
+    )
+    text_fields: dict[str, tuple[int, int]] | None = Field(
+        None,
+        description="Page and index in the page's annotations of the other form "
+        "fields, e.g. the student name",
+    )
+
+    @property
+    def has_field_geometry(self) -> bool:
+        return self.page_boxes is not None and all(
+            item.option_widgets is not None for item in self.items
+        )
+
+    def add_field_geometry(self, pdf):
+        """Record where the form fields are in the compiled quiz PDF.
+
+        The widget annotations are read once, so parsers can go straight to
+        the right page and annotation instead of walking every field.
+        """
+        widgets, page_boxes = read_widgets(pdf)
+        options, text_fields = {}, {}
+        for widget in widgets:
+            parsed = parse_checkbox_name(widget.name)
+            if parsed is None:
+                text_fields[widget.name] = (widget.page, widget.annotation)
+                continue
+            _, option, _, qid = parsed
+            rect = tuple(round(v, 2) for v in widget.rect)
+            options.setdefault(qid, {})[option] = (widget.page, widget.annotation, *rect)
+
+        self.items = [
+            item.model_copy(
+                update={
+                    "option_widgets": [
+                        options[item.qid][option] for option in sorted(options[item.qid])
+                    ]
+                }
+            )
+            if item.qid in options
+            else item
+            for item in self.items
+        ]
+        self.page_boxes = [tuple(round(v, 2) for v in box) for box in page_boxes]
+        self.text_fields = text_fields
 
     def save_to_file(self, path):
         with open(path, "w") as f:
@@ -1,3 +1,4 @@
+import subprocess
 from pathlib import Path
 
 from pylatex import (
@@ -12,11 +13,14 @@ from pylatex.utils import NoEscape
 from pylatex.base_classes import Environment
 
 from mcqpy.compile import FrontMatterOptions, HeaderFooterOptions
+from mcqpy.compile.error_bisect import QuizCompileError, bisect_compile_errors
+from mcqpy.compile.latex_errors import question_marker
 from mcqpy.compile.latex_helpers import Form
 from mcqpy.compile.latex_questions import build_question
 from mcqpy.compile.manifest import Manifest, ManifestItem
 from mcqpy.compile.preamble import add_preamble
 from mcqpy.question import Question
+from mcqpy.utils.profiling import stage
 
 class SamePage(Environment):
     """SamePage environment to keep content on the same page."""
@@ -55,21 +59,38 @@ class MultipleChoiceQuiz(Document):
     # Build the document
     ############################################################################
 
-    def build(self, generate_pdf: bool = False, **kwargs):
+    def build(self, generate_pdf: bool = False, bisect_errors: bool = False, **kwargs):
+        """Build the quiz, and compile it if `generate_pdf`.
+
+        With `bisect_errors`, a failed compile is followed by compiles of parts
+        of the quiz to find the failing questions, which are reported by the
+        raised QuizCompileError. Other keyword arguments go to `generate_pdf`.
+        """
         # Front matter
-        add_preamble(self)
-        self._build_front_matter()
-        self._build_header()
+        with stage("quiz.front_matter"):
+            add_preamble(self)
+            self._build_front_matter()
+            self._build_header()
 
         # Questions:
         questions = self.get_questions()
-        manifest_items = self._build_questions(questions)
+        with stage("quiz.questions", n_questions=len(questions)):
+            manifest_items = self._build_questions(questions)
 
         if generate_pdf:
             default_kwargs = {"clean_tex": True}
             default_kwargs.update(kwargs)
-            self.generate_pdf(self.file.with_suffix(""), **default_kwargs)
-            self._build_manifest(manifest_items)
+            try:
+                with stage("quiz.compile"):
+                    self.generate_pdf(self.file.with_suffix(""), **default_kwargs)
+            except subprocess.CalledProcessError as error:
+                if not bisect_errors:
+                    raise
+                with stage("quiz.bisect_errors"):
+                    result = bisect_compile_errors(self.dumps(), questions, cwd=self.file.absolute().parent)
+                raise QuizCompileError(error, result) from error
+            with stage("quiz.manifest"):
+                self._build_manifest(manifest_items)
             print(f"Generated quiz PDF at: {self.file}")
 
     def _build_header(self):
@@ -105,6 +126,8 @@ class MultipleChoiceQuiz(Document):
 
     def _build_manifest(self, manifest_items: list[ManifestItem]):
         manifest = Manifest(items=manifest_items)
+        if self.file.exists():
+            manifest.add_field_geometry(self.file)
         manifest_path = self.get_manifest_path()
         manifest.save_to_file(manifest_path)
         print(f"Generated manifest file at: {manifest_path}")
@@ -171,6 +194,9 @@ class MultipleChoiceQuiz(Document):
         return manifest_items
 
     def _build_question(self, question: Question, quiz_index: int):
+        # Marks where the question starts, for locating compile errors. The slug
+        # keeps the source free of local paths, so it is the same on every machine.
+        self.append(question_marker(quiz_index, question.slug))
         self.append(Command("pagebreak"))
 
         build_question(self, question, quiz_index)
\ No newline at end of file
@@ -0,0 +1,141 @@
+import contextlib
+import io
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal
+
+from pylatex import Command, Document
+from pylatex.utils import NoEscape, escape_latex
+from pylatexenc.latexencode import unicode_to_latex
+
+from mcqpy.compile.latex_errors import LatexError, locate_errors, parse_latex_log, question_marker
+from mcqpy.compile.latex_questions import build_question
+from mcqpy.compile.preamble import add_preamble
+from mcqpy.question import Question
+from mcqpy.utils.parallel import process_pool, resolve_workers
+
+
+class QuestionReview(Document):
+    """Document rendering questions one per page, with a bookmark per question."""
+
+    def __init__(self, questions: list[Question], file: Path | str | None = None):
+        super().__init__(
+            documentclass="article",
+            geometry_options={
+                "paper": "a4paper",
+                "includeheadfoot": True,
+                "left": "2cm",
+                "right": "3cm",
+                "top": "2.5cm",
+                "bottom": "2.5cm",
+            },
+        )
+        self.file = Path(file) if file is not None else Path("questions.pdf")
+        self._questions = questions
+
+    def get_questions(self) -> list[Question]:
+        return self._questions
+
+    def build(self, generate_pdf: bool = False, **kwargs):
+        add_preamble(self)
+        for index, question in enumerate(self._questions):
+            self._build_question(question, index)
+
+        if generate_pdf:
+            default_kwargs = {"clean_tex": True}
+            default_kwargs.update(kwargs)
+            self.generate_pdf(self.file.with_suffix(""), **default_kwargs)
+
+    def _build_question(self, question: Question, index: int):
+        label = str(question.path) if question.path else question.slug
+        # The marker maps compile errors back to the question, see locate_errors.
+        self.append(question_marker(index, label))
+        if index > 0:
+            self.append(Command("pagebreak"))
+        self.append(NoEscape(rf"\pdfbookmark[0]{{{index + 1}. {unicode_to_latex(question.slug)}}}{{question-{index}}}"))
+        self.append(NoEscape(rf"\noindent{{\small\texttt{{{escape_latex(label)}}}}}"))
+        build_question(self, question, quiz_index=index)
+
+
+@dataclass
+class RenderResult:
+    file: Path
+    questions: list[Question]
+    status: Literal["ok", "invalid", "error"] = "ok"
+    errors: list[tuple[int | None, LatexError]] = field(default_factory=list)
+    message: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    @property
+    def log(self) -> Path:
+        return self.file.with_suffix(".log")
+
+
+def render_review(questions: list[Question], file: Path | str) -> RenderResult:
+    """Compile `questions` into one PDF, locating compile errors by question.
+
+    Args:
+        questions: Questions to render.
+        file: Path of the PDF.
+    Returns:
+        RenderResult: Outcome of the compile. For invalid LaTeX the .tex and
+            .log files are kept next to the PDF.
+    """
+    file = Path(file).absolute()
+    document = QuestionReview(questions, file=file)
+    result = RenderResult(file, questions)
+    try:
+        # pylatex prints the full compiler output on failure, the errors are read from the log instead.
+        with contextlib.redirect_stdout(io.StringIO()):
+            document.build(generate_pdf=True)
+    except subprocess.CalledProcessError as error:
+        result.status = "invalid"
+        output = error.output.decode(errors="replace") if isinstance(error.output, bytes) else str(error.output or "")
+        log = result.log.read_text(errors="replace") if result.log.exists() else output
+        tex_path = file.with_suffix(".tex")
+        tex = tex_path.read_text() if tex_path.exists() else document.dumps()
+        result.errors = locate_errors(tex, parse_latex_log(log))
+        if len(questions) == 1:
+            result.errors = [(0, latex_error) for _, latex_error in result.errors]
+    except Exception as error:
+        result.status = "error"
+        result.message = str(error)
+    return result
+
+
+def render_questions(
+    questions: list[Question],
+    file: Path | str,
+    chunk_size: int | None = None,
+    workers: int | None = None,
+) -> list[RenderResult]:
+    """Render questions for review, in chunks compiled in parallel.
+
+    Args:
+        questions: Questions to render.
+        file: Path of the PDF, chunks are numbered, e.g. questions_1.pdf.
+        chunk_size: Number of questions per PDF, None renders one PDF.
+        workers: Number of worker processes, None uses all CPUs.
+    Returns:
+        list[RenderResult]: One result per PDF.
+    """
+    if not questions:
+        return []
+    file = Path(file)
+    chunk_size = chunk_size or len(questions)
+    chunks = [questions[start : start + chunk_size] for start in range(0, len(questions), chunk_size)]
+    if len(chunks) == 1:
+        return [render_review(chunks[0], file)]
+
+    files = [file.with_name(f"{file.stem}_{index + 1}{file.suffix}") for index in range(len(chunks))]
+    n_workers = resolve_workers(workers, len(chunks))
+    if n_workers == 1:
+        return [render_review(chunk, chunk_file) for chunk, chunk_file in zip(chunks, files)]
+
+    with process_pool(n_workers) as executor:
+        futures = [executor.submit(render_review, chunk, chunk_file) for chunk, chunk_file in zip(chunks, files)]
+        return [future.result() for future in futures]
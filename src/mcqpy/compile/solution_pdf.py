@@ -12,6 +12,7 @@ from mcqpy.compile.latex_questions import build_question
 from mcqpy.compile.manifest import Manifest
 from mcqpy.compile.preamble import add_preamble
 from mcqpy.question import Question
+from mcqpy.utils.profiling import stage
 
 
 
@@ -52,14 +53,15 @@ class SolutionPDF(Document):
 
 
     def build(self, generate_pdf: bool = False, **kwargs):        
-        add_preamble(self)
-
-        self._build_solution_table()
-        self._build_questions()
+        with stage("solution.questions", n_questions=len(self._questions)):
+            add_preamble(self)
+            self._build_solution_table()
+            self._build_questions()
         if generate_pdf:
             default_kwargs = {"clean_tex": True}
             default_kwargs.update(kwargs)
-            self.generate_pdf(self.file.with_suffix(""), **default_kwargs)
+            with stage("solution.compile"):
+                self.generate_pdf(self.file.with_suffix(""), **default_kwargs)
             print(f"Generated solution file at: {self.file}")
 
 
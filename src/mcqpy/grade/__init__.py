@@ -1,2 +1,2 @@
 from .grader import MCQGrader
-from .analysis import get_grade_dataframe
\ No newline at end of file
+from .export import get_grade_dataframe, GradeWriter
\ No newline at end of file
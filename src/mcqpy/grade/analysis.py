@@ -1,5 +1,9 @@
+import hashlib
+import json
+from dataclasses import dataclass
 from pathlib import Path
 
+import matplotlib.figure
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -11,6 +15,7 @@ from pylatex import (
     Figure,
     Foot,
     Head,
+    Itemize,
     LongTable,
     MultiColumn,
     NewPage,
@@ -21,59 +26,96 @@ from pylatex import (
     SubFigure,
 )
 from rich.console import Console
-from rich.progress import track
 
+from mcqpy.grade.cohort import Cohort
+from mcqpy.grade.export import get_grade_dataframe
+from mcqpy.grade.item_statistics import item_statistics, reliability_statistics
 from mcqpy.grade.utils import GradedQuestion, GradedSet
 from mcqpy.question import Question, QuestionBank
+from mcqpy.utils.parallel import process_pool, resolve_workers, split_chunks
 
 
-def get_grade_dataframe(graded_sets: list[GradedSet]) -> pd.DataFrame:
-    records = []
-    for graded_set in graded_sets:
-        record = {
-            "student_id": graded_set.student_id,
-            "student_name": graded_set.student_name,
-            "total_points": graded_set.points,
-            "max_points": graded_set.max_points,
-        }
+# Bump to re-render cached figures after changing how they are drawn
+FIGURE_VERSION = "1"
+FIGURE_HASHES_FILE = "figure_hashes.json"
 
-        for index, graded_question in enumerate(graded_set.graded_questions):
-            record[f"Q{index + 1}_points"] = graded_question.point_value
 
-        records.append(record)
+@dataclass
+class QuestionFigureData:
+    """The data shown in one question's analysis figure."""
 
-    df = pd.DataFrame.from_records(records)
-    df.sort_values(by="student_name", inplace=True)
-    return df
+    slug: str
+    answer_sums: np.ndarray
+    correct_answers: np.ndarray
+    scores: np.ndarray
 
+    @property
+    def name(self) -> str:
+        return f"{self.slug}.pdf"
 
-def question_analysis(
-    graded_questions: list[GradedQuestion], out_directory: str | Path = None
-):
-    fig, axes = plt.subplots(1, 2, figsize=(10, 5), layout="constrained")
+    @classmethod
+    def from_graded_questions(cls, graded_questions: list[GradedQuestion]) -> "QuestionFigureData":
+        all_onehots = np.vstack([q.student_answers for q in graded_questions])
+        return cls(
+            slug=graded_questions[0].slug,
+            answer_sums=all_onehots.sum(axis=0),
+            correct_answers=np.asarray(graded_questions[0].correct_answers),
+            scores=np.array([q.point_value for q in graded_questions]),
+        )
 
-    fig.suptitle(f"Question Analysis: {graded_questions[0].slug}")
+    @classmethod
+    def from_cohort(cls, cohort: Cohort, index: int) -> "QuestionFigureData":
+        """Figure data of the question in column `index` of the cohort.
+
+        Only submissions that contain the question are counted.
+        """
+        answered = cohort.answered[:, index]
+        return cls(
+            slug=cohort.slugs[index],
+            answer_sums=cohort.question_selections(index).sum(axis=0, where=answered[:, None]),
+            correct_answers=cohort.keys[index, : cohort.n_options[index]].astype(int),
+            scores=cohort.points[answered, index],
+        )
 
-    # Answer distribution:
-    all_onehots = np.vstack([q.student_answers for q in graded_questions])
-    answer_sums = all_onehots.sum(axis=0)
-    answer_labels = [f"{chr(i + 65)}" for i in range(all_onehots.shape[1])]
+    def digest(self) -> str:
+        h = hashlib.sha256(f"{FIGURE_VERSION}|{self.slug}".encode())
+        for array in (self.answer_sums, self.correct_answers, self.scores):
+            array = np.ascontiguousarray(array, dtype=float)
+            h.update(str(array.shape).encode())
+            h.update(array.tobytes())
+        return h.hexdigest()
+
+
+def plot_question_analysis(data: QuestionFigureData, output_path: str | Path = None, fig=None, axes=None):
+    """Draw the analysis figure of one question.
 
-    correct_answers = graded_questions[0].correct_answers
+    Pass `fig` and `axes` from a previous call to draw on the same figure
+    instead of setting up a new one.
+    """
+    reuse = fig is not None
+    if reuse:
+        for ax in axes:
+            ax.clear()
+    else:
+        fig, axes = plt.subplots(1, 2, figsize=(10, 5), layout="constrained")
 
+    fig.suptitle(f"Question Analysis: {data.slug}")
+
+    # Answer distribution:
+    answer_labels = [f"{chr(i + 65)}" for i in range(len(data.answer_sums))]
     colors = [
-        "green" if correct_answers[i] == 1 else "red"
-        for i in range(len(correct_answers))
+        "green" if data.correct_answers[i] == 1 else "red"
+        for i in range(len(data.correct_answers))
     ]
 
     ax = axes[0]
-    ax.bar(answer_labels, answer_sums, color=colors, alpha=0.7, edgecolor="black")
+    ax.bar(answer_labels, data.answer_sums, color=colors, alpha=0.7, edgecolor="black")
     ax.set_xlabel("Answer Options")
     ax.set_ylabel("Number of Selections")
     ax.set_title("Distribution of Selected Answers")
 
     # Score distribution:
-    scores = [q.point_value for q in graded_questions]
+    scores = data.scores
     ax = axes[1]
     ax.hist(
         scores,
@@ -88,13 +130,95 @@ def question_analysis(
     ax.set_title("Distribution of Points Awarded")
 
     # Save figure
-    name = f"{graded_questions[0].slug}.pdf"
-    output_path = Path(out_directory) / name
+    if output_path:
+        fig.savefig(output_path)
+    if not reuse:
+        plt.close(fig)
 
-    plt.savefig(output_path) if out_directory else None
-    plt.close(fig)
 
-    return name
+def question_analysis(
+    graded_questions: list[GradedQuestion], out_directory: str | Path = None
+):
+    data = QuestionFigureData.from_graded_questions(graded_questions)
+    output_path = Path(out_directory) / data.name if out_directory else None
+    plot_question_analysis(data, output_path)
+    return data.name
+
+
+def _use_agg_backend():
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _question_figure():
+    # Drawn without pyplot, so rendering neither needs nor changes the backend.
+    fig = matplotlib.figure.Figure(figsize=(10, 5), layout="constrained")
+    return fig, fig.subplots(1, 2)
+
+
+def _render_figures(jobs: list[tuple[QuestionFigureData, Path]], reuse_figure: bool):
+    fig = axes = None
+    for data, output_path in jobs:
+        if fig is None or not reuse_figure:
+            fig, axes = _question_figure()
+        plot_question_analysis(data, output_path, fig=fig, axes=axes)
+
+
+def render_question_figures(
+    figure_data: list[QuestionFigureData],
+    out_directory: str | Path,
+    workers: int | None = None,
+    reuse_figure: bool = True,
+    use_cache: bool = True,
+) -> list[str]:
+    """Render question figures on a process pool.
+
+    A figure is skipped if it exists and its data hash matches the one
+    recorded in `figure_hashes.json` by the previous run.
+
+    Args:
+        figure_data: Data of each figure.
+        out_directory: Directory for the figures.
+        workers: Number of processes, None uses all CPUs and 1 renders in
+            this process.
+        reuse_figure: Draw all figures of a worker on a single figure.
+        use_cache: Skip figures whose data is unchanged.
+    Returns:
+        list[str]: File names of the figures, in the order of `figure_data`.
+    """
+    out_directory = Path(out_directory)
+    hashes_path = out_directory / FIGURE_HASHES_FILE
+    hashes = {}
+    if use_cache and hashes_path.exists():
+        with open(hashes_path, "r") as f:
+            hashes = json.load(f)
+
+    jobs, new_hashes = [], {}
+    for data in figure_data:
+        digest = data.digest()
+        new_hashes[data.name] = digest
+        output_path = out_directory / data.name
+        if hashes.get(data.name) != digest or not output_path.exists():
+            jobs.append((data, output_path))
+
+    n_workers = resolve_workers(workers, len(jobs))
+    if n_workers == 1:
+        if jobs:
+            _render_figures(jobs, reuse_figure)
+    else:
+        with process_pool(n_workers, initializer=_use_agg_backend) as executor:
+            futures = [
+                executor.submit(_render_figures, chunk, reuse_figure)
+                for chunk in split_chunks(jobs, n_workers)
+            ]
+            for future in futures:
+                future.result()
+
+    with open(hashes_path, "w") as f:
+        json.dump({**hashes, **new_hashes}, f, indent=2)
+
+    return [data.name for data in figure_data]
 
 
 def make_quiz_analysis(graded_sets: list[GradedSet], output_dir: str | Path):
@@ -131,6 +255,7 @@ class QuizAnalysis(Document):
         question_bank: QuestionBank,
         output_dir: str | Path = None,
         console: Console = None,
+        workers: int | None = None,
     ):
         super().__init__(
             documentclass="article",
@@ -149,6 +274,9 @@ class QuizAnalysis(Document):
         self.figure_directory.mkdir(parents=True, exist_ok=True)
         self.console = console or Console()
         self.question_bank = question_bank
+        self.workers = workers
+        # Questions are aligned by qid, so exam variants are analysed together
+        self.cohort = Cohort.from_graded_sets(graded_sets)
 
     def build(self):
         # Added TOC
@@ -162,6 +290,8 @@ class QuizAnalysis(Document):
 
         self.console.log("Building quiz analysis...")
         self.build_quiz_analysis()
+        self.console.log("Building item statistics...")
+        self.build_item_statistics()
         self.console.log("Building question analysis...")
         self.build_question_analyses()
         self.console.log("Building grade table...")
@@ -180,20 +310,63 @@ class QuizAnalysis(Document):
 
             self.append(NewPage())
 
+    def build_item_statistics(self):
+        cohort = self.cohort
+        df = item_statistics(cohort)
+        summary = reliability_statistics(cohort)
+
+        with self.create(Section("Item Statistics")):
+            with self.create(Itemize()) as itemize:
+                itemize.add_item(f"Students: {summary['n_students']}, items: {summary['n_items']}")
+                itemize.add_item(f"Mean total: {summary['mean']:.2f} (SD {summary['std']:.2f})")
+                itemize.add_item(f"KR-20: {summary['kr20']:.3f}")
+                itemize.add_item(f"Cronbach's alpha: {summary['cronbach_alpha']:.3f}")
+                itemize.add_item(f"Standard error of measurement: {summary['sem']:.2f}")
+
+            self.append(
+                NoEscape(
+                    r"Difficulty is the mean fraction of points obtained, $r_{pb}$ the "
+                    r"correlation with the score on the remaining items and $D_{27}$ the "
+                    r"difference in difficulty between the upper and lower 27\% of students."
+                )
+            )
+
+            with self.create(LongTable("r l r r r")) as data_table:
+                data_table.add_hline()
+                data_table.add_row(["#", "Slug", "Difficulty", NoEscape(r"$r_{pb}$"), NoEscape(r"$D_{27}$")])
+                data_table.add_hline()
+                data_table.end_table_header()
+
+                for row in df.itertuples(index=False):
+                    data_table.add_row(
+                        [
+                            row.question,
+                            row.slug,
+                            f"{row.difficulty:.2f}",
+                            f"{row.point_biserial:.2f}",
+                            f"{row.discrimination:.2f}",
+                        ]
+                    )
+                data_table.add_hline()
+
+            self.append(NewPage())
+
     def build_question_analyses(self):
-        num_questions = len(self.graded_sets[0].graded_questions)
-        for q_index in track(
-            range(num_questions), description="Generating question analyses"
-        ):
+        cohort = self.cohort
+        figure_data = [
+            QuestionFigureData.from_cohort(cohort, index)
+            for index in range(cohort.n_questions)
+        ]
+        fig_names = render_question_figures(
+            figure_data, self.figure_directory, workers=self.workers
+        )
+
+        for q_index, qid in enumerate(cohort.qids):
             with self.create(Section(f"Question {q_index + 1} Analysis")):
-                graded_questions = [
-                    gs.graded_questions[q_index] for gs in self.graded_sets
-                ]
-                fig_name = question_analysis(
-                    graded_questions, out_directory=self.figure_directory
-                )
+                slug = cohort.slugs[q_index]
+                fig_name = fig_names[q_index]
 
-                question = self.question_bank.get_by_qid(graded_questions[0].qid)
+                question = self.question_bank.get_by_qid(qid)
 
                 self.append(NoEscape(question.text))
 
@@ -208,7 +381,7 @@ class QuizAnalysis(Document):
                         (Path("figures") / fig_name).as_posix(), width="400px"
                     )
                     fig.add_caption(
-                        f"Analysis for Question {q_index + 1}: {graded_questions[0].slug}"
+                        f"Analysis for Question {q_index + 1}: {slug}"
                     )
 
                 self.append(NewPage())
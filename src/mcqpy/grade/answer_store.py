@@ -0,0 +1,221 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from mcqpy.grade.utils import ParsedQuestion, ParsedSet
+
+
+def _to_str_array(values: list[str | None]) -> np.ndarray:
+    return np.array(["" if v is None else str(v) for v in values], dtype=str)
+
+
+def _from_str_array(values: np.ndarray) -> list[str | None]:
+    return [str(v) if v != "" else None for v in values]
+
+
+@dataclass
+class AnswerStore:
+    """Compact, columnar store of the answers of a cohort.
+
+    Selections of all questions are concatenated along the columns of a single
+    boolean matrix, question `k` occupies the columns
+    `offsets[k]:offsets[k + 1]`. On disk the matrix is bit-packed.
+
+    Attributes:
+        student_ids: Student ID per submission, shape (n_students,).
+        student_names: Student name per submission, shape (n_students,).
+        files: Source file per submission, shape (n_students,).
+        qids: Question IDs, shape (n_questions,).
+        slugs: Question slugs, shape (n_questions,).
+        n_options: Number of options per question, shape (n_questions,).
+        answered: Whether a submission contains the question, shape (n_students, n_questions).
+        bits: One-hot selections, shape (n_students, n_options.sum()).
+        order: Position of each question within its submission, shape
+            (n_students, n_questions), None if the submissions follow the
+            column order.
+    """
+
+    student_ids: np.ndarray
+    student_names: np.ndarray
+    files: np.ndarray
+    qids: np.ndarray
+    slugs: np.ndarray
+    n_options: np.ndarray
+    answered: np.ndarray
+    bits: np.ndarray
+    order: np.ndarray | None = None
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return np.concatenate([[0], np.cumsum(self.n_options)])
+
+    @property
+    def n_students(self) -> int:
+        return len(self.student_ids)
+
+    @property
+    def n_questions(self) -> int:
+        return len(self.qids)
+
+    def __len__(self) -> int:
+        return self.n_students
+
+    def question_index(self, qid: str) -> int:
+        indices = np.flatnonzero(self.qids == qid)
+        if len(indices) == 0:
+            raise KeyError(f"QID {qid} not found in answer store")
+        return int(indices[0])
+
+    def submission_columns(self, row: int) -> np.ndarray:
+        """Columns of the questions in submission `row`, in the order of the submission."""
+        columns = np.flatnonzero(self.answered[row])
+        if self.order is None:
+            return columns
+        return columns[np.argsort(self.order[row, columns], kind="stable")]
+
+    def _order_or_default(self) -> np.ndarray:
+        if self.order is not None:
+            return self.order
+        return np.broadcast_to(np.arange(self.n_questions), self.answered.shape)
+
+    def selections(self, qid: str) -> np.ndarray:
+        """Selections of all students for one question, shape (n_students, n_options).
+
+        The returned array is a view into `bits`.
+        """
+        index = self.question_index(qid)
+        offsets = self.offsets
+        return self.bits[:, offsets[index] : offsets[index + 1]]
+
+    ############################################################################
+    # Conversion
+    ############################################################################
+
+    @classmethod
+    def from_parsed_sets(cls, parsed_sets: list[ParsedSet]) -> "AnswerStore":
+        # Questions are aligned by qid so submissions may order them differently.
+        question_info = {}
+        for parsed_set in parsed_sets:
+            for question in parsed_set.questions:
+                if question.qid not in question_info:
+                    question_info[question.qid] = (question.slug, len(question.onehot))
+
+        qids = list(question_info)
+        column = {qid: index for index, qid in enumerate(qids)}
+        n_options = np.array([question_info[qid][1] for qid in qids], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(n_options)])
+
+        answered = np.zeros((len(parsed_sets), len(qids)), dtype=bool)
+        bits = np.zeros((len(parsed_sets), offsets[-1]), dtype=bool)
+        order = np.zeros((len(parsed_sets), len(qids)), dtype=np.int32)
+        for row, parsed_set in enumerate(parsed_sets):
+            for position, question in enumerate(parsed_set.questions):
+                index = column[question.qid]
+                answered[row, index] = True
+                order[row, index] = position
+                bits[row, offsets[index] : offsets[index + 1]] = question.onehot
+
+        return cls(
+            student_ids=_to_str_array([ps.student_id for ps in parsed_sets]),
+            student_names=_to_str_array([ps.student_name for ps in parsed_sets]),
+            files=_to_str_array([ps.file for ps in parsed_sets]),
+            qids=np.array(qids, dtype=str),
+            slugs=_to_str_array([question_info[qid][0] for qid in qids]),
+            n_options=n_options,
+            answered=answered,
+            bits=bits,
+            order=order,
+        )
+
+    def to_parsed_sets(self) -> list[ParsedSet]:
+        offsets = self.offsets
+        qids = self.qids.tolist()
+        slugs = _from_str_array(self.slugs)
+        ids = _from_str_array(self.student_ids)
+        names = _from_str_array(self.student_names)
+        files = _from_str_array(self.files)
+
+        parsed_sets = []
+        for row in range(self.n_students):
+            questions = []
+            for index in self.submission_columns(row):
+                onehot = self.bits[row, offsets[index] : offsets[index + 1]]
+                questions.append(
+                    ParsedQuestion(
+                        qid=qids[index],
+                        slug=slugs[index],
+                        answers=np.flatnonzero(onehot).tolist(),
+                        onehot=onehot.astype(int).tolist(),
+                    )
+                )
+            parsed_sets.append(
+                ParsedSet(
+                    student_id=ids[row],
+                    student_name=names[row],
+                    questions=questions,
+                    file=files[row],
+                )
+            )
+        return parsed_sets
+
+    @classmethod
+    def concatenate(cls, stores: list["AnswerStore"]) -> "AnswerStore":
+        """Stack the students of stores that have the same questions."""
+        first = stores[0]
+        for store in stores[1:]:
+            if not (np.array_equal(store.qids, first.qids) and np.array_equal(store.n_options, first.n_options)):
+                raise ValueError("Answer stores with different questions can not be concatenated")
+        return cls(
+            student_ids=np.concatenate([s.student_ids for s in stores]),
+            student_names=np.concatenate([s.student_names for s in stores]),
+            files=np.concatenate([s.files for s in stores]),
+            qids=first.qids,
+            slugs=first.slugs,
+            n_options=first.n_options,
+            answered=np.concatenate([s.answered for s in stores]),
+            bits=np.concatenate([s.bits for s in stores]),
+            order=None
+            if all(s.order is None for s in stores)
+            else np.concatenate([s._order_or_default() for s in stores]),
+        )
+
+    ############################################################################
+    # Persistence
+    ############################################################################
+
+    def save(self, path: str | Path):
+        """Save the store as a compressed `.npz` file with bit-packed selections."""
+        order = {} if self.order is None else {"order": self.order}
+        np.savez_compressed(
+            path,
+            student_ids=self.student_ids,
+            student_names=self.student_names,
+            files=self.files,
+            qids=self.qids,
+            slugs=self.slugs,
+            n_options=self.n_options,
+            answered=np.packbits(self.answered, axis=1),
+            bits=np.packbits(self.bits, axis=1),
+            **order,
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "AnswerStore":
+        with np.load(path, allow_pickle=False) as data:
+            n_options = data["n_options"]
+            n_questions = len(data["qids"])
+            answered = np.unpackbits(data["answered"], axis=1, count=n_questions)
+            bits = np.unpackbits(data["bits"], axis=1, count=int(n_options.sum()))
+            return cls(
+                student_ids=data["student_ids"],
+                student_names=data["student_names"],
+                files=data["files"],
+                qids=data["qids"],
+                slugs=data["slugs"],
+                n_options=n_options,
+                answered=answered.astype(bool),
+                bits=bits.astype(bool),
+                # Stores saved before the order was recorded follow the column order.
+                order=data["order"] if "order" in data.files else None,
+            )
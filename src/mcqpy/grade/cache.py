@@ -0,0 +1,106 @@
+import hashlib
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+from mcqpy.grade.utils import ParsedQuestion, ParsedSet
+
+
+def compute_file_sha256(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    """Compute the SHA256 hash of a file's content.
+
+    Args:
+        path: Path to the file.
+        chunk_size: Number of bytes to read at a time.
+    Returns:
+        str: Hex digest of the file content.
+    """
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class ParseCache:
+    """Persistent cache of parsed submissions.
+
+    Entries are keyed by the SHA256 hash of the submission file, so renamed
+    files are still cache hits while edited files are re-parsed. The whole
+    cache is invalidated when the parser version changes.
+
+    Args:
+        path: Path to the JSON cache file.
+        parser_version: Version of the parser that produced the entries.
+    """
+
+    def __init__(self, path: str | Path, parser_version: str):
+        self.path = Path(path)
+        self.parser_version = parser_version
+        self._entries = self._load()
+        self._used = set()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}  # A broken cache is simply rebuilt.
+
+        if data.get("parser_version") != self.parser_version:
+            return {}
+        return data.get("entries", {})
+
+    def get(self, sha256: str) -> ParsedSet | None:
+        entry = self._entries.get(sha256)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._used.add(sha256)
+        questions = [ParsedQuestion(**q) for q in entry["questions"]]
+        return ParsedSet(
+            student_id=entry["student_id"],
+            student_name=entry["student_name"],
+            questions=questions,
+            file=entry.get("file"),
+        )
+
+    def put(self, sha256: str, parsed_set: ParsedSet):
+        self._entries[sha256] = asdict(parsed_set)
+        self._used.add(sha256)
+
+    def parse(self, path: str | Path, parse_func) -> ParsedSet:
+        """Return the cached parse of `path`, calling `parse_func(path)` on a miss."""
+        sha256 = compute_file_sha256(path)
+        parsed_set = self.get(sha256)
+        if parsed_set is None:
+            parsed_set = parse_func(path)
+            self.put(sha256, parsed_set)
+        parsed_set.file = str(path)
+        return parsed_set
+
+    def save(self, prune: bool = True):
+        """Write the cache to disk.
+
+        Args:
+            prune: If True, drop entries that were not used since loading, e.g.
+                submissions that have been removed or replaced.
+        """
+        entries = self._entries
+        if prune:
+            entries = {k: v for k, v in entries.items() if k in self._used}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"parser_version": self.parser_version, "entries": entries}, f
+            )
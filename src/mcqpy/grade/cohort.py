@@ -0,0 +1,143 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from mcqpy.compile.manifest import Manifest
+from mcqpy.grade.answer_store import AnswerStore
+from mcqpy.grade.utils import GradedSet
+
+
+@dataclass
+class Cohort:
+    """Answers and points of a cohort as dense arrays aligned by qid.
+
+    Questions are columns in order of first appearance, so submissions with a
+    different question order (e.g. exam variants) line up. Options beyond a
+    question's `n_options` are padding and never selected.
+
+    Attributes:
+        student_ids: Student ID per submission, length n_students.
+        student_names: Student name per submission, length n_students.
+        qids: Question IDs, length n_questions.
+        slugs: Question slugs, length n_questions.
+        n_options: Number of options per question, shape (n_questions,).
+        selections: Selected options, shape (n_students, n_questions, max_options).
+        keys: Correct options, shape (n_questions, max_options).
+        points: Points awarded, shape (n_students, n_questions).
+        max_points: Point value per question, shape (n_questions,).
+        answered: Whether a submission contains the question, shape (n_students, n_questions).
+    """
+
+    student_ids: list[str]
+    student_names: list[str]
+    qids: list[str]
+    slugs: list[str]
+    n_options: np.ndarray
+    selections: np.ndarray
+    keys: np.ndarray
+    points: np.ndarray
+    max_points: np.ndarray
+    answered: np.ndarray
+
+    @property
+    def n_students(self) -> int:
+        return len(self.student_ids)
+
+    @property
+    def n_questions(self) -> int:
+        return len(self.qids)
+
+    @property
+    def totals(self) -> np.ndarray:
+        return self.points.sum(axis=1)
+
+    def question_index(self, qid: str) -> int:
+        try:
+            return self.qids.index(qid)
+        except ValueError:
+            raise KeyError(f"QID {qid} not found in cohort") from None
+
+    def question_selections(self, index: int) -> np.ndarray:
+        """Selections of all students for one question, shape (n_students, n_options).
+
+        The returned array is a view into `selections`.
+        """
+        return self.selections[:, index, : self.n_options[index]]
+
+    @classmethod
+    def from_graded_sets(cls, graded_sets: list[GradedSet]) -> "Cohort":
+        column = {}
+        slugs, n_options, keys, max_points = [], [], [], []
+        for graded_set in graded_sets:
+            for question in graded_set.graded_questions:
+                if question.qid in column:
+                    continue
+                column[question.qid] = len(column)
+                slugs.append(question.slug)
+                n_options.append(len(question.correct_answers))
+                keys.append(question.correct_answers)
+                max_points.append(question.max_point_value)
+
+        n_students, n_questions = len(graded_sets), len(column)
+        max_options = max(n_options, default=0)
+
+        selections = np.zeros((n_students, n_questions, max_options), dtype=bool)
+        points = np.zeros((n_students, n_questions), dtype=float)
+        answered = np.zeros((n_students, n_questions), dtype=bool)
+        key_array = np.zeros((n_questions, max_options), dtype=bool)
+        for index, key in enumerate(keys):
+            key_array[index, : len(key)] = key
+
+        for row, graded_set in enumerate(graded_sets):
+            for question in graded_set.graded_questions:
+                index = column[question.qid]
+                selections[row, index, : len(question.student_answers)] = question.student_answers
+                points[row, index] = question.point_value
+                answered[row, index] = True
+
+        return cls(
+            student_ids=[gs.student_id for gs in graded_sets],
+            student_names=[gs.student_name for gs in graded_sets],
+            qids=list(column),
+            slugs=slugs,
+            n_options=np.array(n_options, dtype=np.int64),
+            selections=selections,
+            keys=key_array,
+            points=points,
+            max_points=np.array(max_points, dtype=float),
+            answered=answered,
+        )
+
+    @classmethod
+    def from_store(cls, store: AnswerStore, manifest: Manifest, points: np.ndarray) -> "Cohort":
+        """Cohort straight from stored answers, without building graded sets.
+
+        Args:
+            store: Answers of the cohort.
+            manifest: Manifest with the answer keys and point values.
+            points: Points of every student and question, e.g. from
+                `MCQGrader.score_store`, shape (n_students, n_questions).
+        """
+        items = [manifest.get_item_by_qid(str(qid)) for qid in store.qids]
+        n_options = np.asarray(store.n_options, dtype=np.int64)
+        max_options = int(n_options.max(initial=0))
+        offsets = store.offsets
+
+        selections = np.zeros((store.n_students, store.n_questions, max_options), dtype=bool)
+        keys = np.zeros((store.n_questions, max_options), dtype=bool)
+        for index, item in enumerate(items):
+            selections[:, index, : n_options[index]] = store.bits[:, offsets[index] : offsets[index + 1]]
+            keys[index, : n_options[index]] = item.correct_onehot
+
+        return cls(
+            student_ids=[str(v) for v in store.student_ids],
+            student_names=[str(v) for v in store.student_names],
+            qids=[str(qid) for qid in store.qids],
+            slugs=[str(slug) for slug in store.slugs],
+            n_options=n_options,
+            selections=selections & store.answered[:, :, None],
+            keys=keys,
+            points=np.asarray(points, dtype=float) * store.answered,
+            max_points=np.array([item.point_value for item in items], dtype=float),
+            answered=store.answered.copy(),
+        )
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from mcqpy.compile.manifest import Manifest
+from mcqpy.grade.answer_store import AnswerStore
+
+# Upper bound on the number of 64-bit words compared at once, about 32 MB
+BLOCK_WORDS = 1 << 22
+
+
+def _pack(matrix: np.ndarray) -> np.ndarray:
+    """Bit-pack the rows of a boolean matrix into 64-bit words."""
+    packed = np.packbits(matrix, axis=1)
+    padding = -packed.shape[1] % 8
+    if padding or packed.shape[1] == 0:
+        packed = np.pad(packed, ((0, 0), (0, padding or 8)))
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+def incorrect_patterns(store: AnswerStore, manifest: Manifest) -> tuple[np.ndarray, np.ndarray, float]:
+    """Encode every student's incorrect answers as bits.
+
+    Each distinct incorrect selection of a question is a category, so two
+    students share a set bit in `patterns` exactly when they gave the same
+    incorrect answer to the same question. Blank answers are not counted as
+    incorrect, shared omissions say little about copying.
+
+    Returns:
+        tuple: `patterns` of shape (n_students, n_categories), `incorrect` of
+            shape (n_students, n_questions) and the probability that two
+            students who both answered a question incorrectly chose the same
+            answer, pooled over all questions.
+    """
+    offsets = store.offsets
+    incorrect = np.zeros((store.n_students, store.n_questions), dtype=bool)
+    columns = []
+    matching_pairs = incorrect_pairs = 0
+    for index, qid in enumerate(store.qids):
+        key = np.asarray(manifest.get_item_by_qid(str(qid)).correct_onehot, dtype=bool)
+        selections = store.bits[:, offsets[index] : offsets[index + 1]]
+        wrong = store.answered[:, index] & selections.any(axis=1) & np.any(selections != key, axis=1)
+        incorrect[:, index] = wrong
+
+        rows = np.flatnonzero(wrong)
+        if len(rows) == 0:
+            continue
+        _, category, counts = np.unique(selections[rows], axis=0, return_inverse=True, return_counts=True)
+        onehot = np.zeros((store.n_students, len(counts)), dtype=bool)
+        onehot[rows, category.ravel()] = True
+        columns.append(onehot)
+
+        matching_pairs += (counts * (counts - 1)).sum() // 2
+        incorrect_pairs += len(rows) * (len(rows) - 1) // 2
+
+    patterns = np.hstack(columns) if columns else np.zeros((store.n_students, 0), dtype=bool)
+    match_probability = matching_pairs / incorrect_pairs if incorrect_pairs else 0.0
+    return patterns, incorrect, float(match_probability)
+
+
+def binomial_sf_table(n_max: int, p: float) -> np.ndarray:
+    """Table of `P(X >= x)` for `X ~ Binomial(n, p)`, indexed `[n, x]`."""
+    n = np.arange(n_max + 1)[:, None]
+    x = np.arange(n_max + 1)[None, :]
+    log_factorial = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, n_max + 1)))])
+    p = min(max(p, 1e-12), 1 - 1e-12)
+    with np.errstate(invalid="ignore"):
+        log_pmf = (
+            log_factorial[n]
+            - log_factorial[x]
+            - log_factorial[np.maximum(n - x, 0)]
+            + x * np.log(p)
+            + (n - x) * np.log1p(-p)
+        )
+    pmf = np.where(x <= n, np.exp(log_pmf), 0.0)
+    return np.clip(pmf[:, ::-1].cumsum(axis=1)[:, ::-1], 0.0, 1.0)
+
+
+def detect_collusion(
+    store: AnswerStore,
+    manifest: Manifest,
+    alpha: float = 0.001,
+    min_shared: int = 3,
+    block_size: int | None = None,
+) -> pd.DataFrame:
+    """Find pairs of students with improbably many identical incorrect answers.
+
+    Incorrect answers are bit-packed per student and all pairs are compared
+    with popcounts over the packed words, a block of rows at a time so memory
+    stays bounded. For a pair that both answered `n` questions incorrectly the
+    number of identical incorrect answers is modelled as
+    `Binomial(n, p)`, with `p` the pooled chance that two incorrect answers to
+    a question agree. Pairs are flagged if their Bonferroni-adjusted p-value
+    is below `alpha`.
+
+    Args:
+        store: Answers of the cohort.
+        manifest: Manifest with the answer keys.
+        alpha: Family-wise significance level over all pairs.
+        min_shared: Minimum number of identical incorrect answers to flag a pair.
+        block_size: Number of students compared against all others at once,
+            chosen from the number of packed words if not given.
+    Returns:
+        pd.DataFrame: Flagged pairs ranked by p-value.
+    """
+    patterns, incorrect, match_probability = incorrect_patterns(store, manifest)
+    packed_patterns = _pack(patterns)
+    packed_incorrect = _pack(incorrect)
+
+    n_students = store.n_students
+    n_pairs = n_students * (n_students - 1) // 2
+    sf = binomial_sf_table(store.n_questions, match_probability)
+
+    if block_size is None:
+        words = packed_patterns.shape[1] + packed_incorrect.shape[1]
+        block_size = max(1, BLOCK_WORDS // max(1, n_students * words))
+
+    found = []
+    for start in range(0, n_students, block_size):
+        stop = min(start + block_size, n_students)
+        # Compare the block with itself and all later students
+        shared = np.bitwise_count(packed_patterns[start:stop, None, :] & packed_patterns[None, start:, :]).sum(axis=-1, dtype=np.int64)
+        both = np.bitwise_count(packed_incorrect[start:stop, None, :] & packed_incorrect[None, start:, :]).sum(axis=-1, dtype=np.int64)
+
+        rows, cols = np.nonzero(np.triu(shared >= min_shared, k=1))
+        if len(rows) == 0:
+            continue
+        shared, both = shared[rows, cols], both[rows, cols]
+        p_value = sf[both, shared]
+        flagged = p_value * n_pairs < alpha
+        found.append((rows[flagged] + start, cols[flagged] + start, shared[flagged], both[flagged], p_value[flagged]))
+
+    if found:
+        a, b, shared, both, p_value = (np.concatenate(columns) for columns in zip(*found))
+    else:
+        a = b = shared = both = np.zeros(0, dtype=np.int64)
+        p_value = np.zeros(0)
+
+    order = np.lexsort((-shared, p_value))
+    a, b, shared, both, p_value = a[order], b[order], shared[order], both[order], p_value[order]
+    return pd.DataFrame(
+        {
+            "student_id_a": store.student_ids[a],
+            "student_name_a": store.student_names[a],
+            "student_id_b": store.student_ids[b],
+            "student_name_b": store.student_names[b],
+            "shared_incorrect": shared,
+            "both_incorrect": both,
+            "expected_shared": both * match_probability,
+            "p_value": p_value,
+            "adjusted_p_value": np.minimum(p_value * n_pairs, 1.0),
+        }
+    )
@@ -0,0 +1,238 @@
+import csv
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mcqpy.compile.manifest import Manifest
+from mcqpy.grade.answer_store import AnswerStore
+from mcqpy.grade.utils import GradedSet
+from mcqpy.utils.profiling import stage
+
+
+def grade_record(graded_set: GradedSet) -> dict:
+    """Flatten a graded set into one row of the grade table."""
+    record = {
+        "student_id": graded_set.student_id,
+        "student_name": graded_set.student_name,
+        "total_points": graded_set.points,
+        "max_points": graded_set.max_points,
+    }
+
+    for index, graded_question in enumerate(graded_set.graded_questions):
+        record[f"Q{index + 1}_points"] = graded_question.point_value
+
+    return record
+
+
+def get_grade_dataframe(graded_sets: list[GradedSet], sort: bool = True) -> pd.DataFrame:
+    records = [grade_record(graded_set) for graded_set in graded_sets]
+    df = pd.DataFrame.from_records(records)
+    if sort:
+        df.sort_values(by="student_name", inplace=True)
+    return df
+
+
+def get_store_grade_dataframe(
+    store: AnswerStore, manifest: Manifest, points: np.ndarray, sort: bool = True
+) -> pd.DataFrame:
+    """Grade table of a whole cohort from stored answers and their points.
+
+    Same columns as `get_grade_dataframe` for cohorts where every submission
+    contains all questions, built column by column instead of row by row.
+
+    Args:
+        store: Answers of the cohort.
+        manifest: Manifest with the point values.
+        points: Points of every student and question, e.g. from
+            `MCQGrader.score_store`, shape (n_students, n_questions).
+        sort: Sort the rows by student name.
+    """
+    points = np.asarray(points) * store.answered
+    max_points = np.array([manifest.get_item_by_qid(str(qid)).point_value for qid in store.qids])
+    columns = {
+        "student_id": store.student_ids.astype(object),
+        "student_name": store.student_names.astype(object),
+        "total_points": points.sum(axis=1),
+        "max_points": (store.answered * max_points).sum(axis=1),
+    }
+    for index in range(store.n_questions):
+        columns[f"Q{index + 1}_points"] = points[:, index]
+    df = pd.DataFrame(columns)
+    if sort:
+        df.sort_values(by="student_name", inplace=True)
+    return df
+
+
+def get_selection_dataframe(graded_sets: list[GradedSet]) -> pd.DataFrame:
+    """Long-format table with one row per student and question.
+
+    The selected and correct options are stored as bitmasks where bit `i` is
+    set if option `i` (in the order shown in the quiz) is selected/correct.
+    Identifiers are categorical and numbers use the smallest sensible dtype,
+    which keeps columnar exports (Parquet/Feather) compact.
+    """
+    columns = {
+        "student_id": [],
+        "question": [],
+        "qid": [],
+        "slug": [],
+        "selected": [],
+        "correct": [],
+        "points": [],
+        "max_points": [],
+    }
+
+    for graded_set in graded_sets:
+        for index, graded_question in enumerate(graded_set.graded_questions):
+            if len(graded_question.correct_answers) > 32:
+                raise ValueError(
+                    f"Question {graded_question.slug} has more than 32 options."
+                )
+            columns["student_id"].append(graded_set.student_id)
+            columns["question"].append(index + 1)
+            columns["qid"].append(graded_question.qid)
+            columns["slug"].append(graded_question.slug)
+            columns["selected"].append(_to_bitmask(graded_question.student_answers))
+            columns["correct"].append(_to_bitmask(graded_question.correct_answers))
+            columns["points"].append(graded_question.point_value)
+            columns["max_points"].append(graded_question.max_point_value)
+
+    return pd.DataFrame(
+        {
+            "student_id": pd.Categorical(columns["student_id"]),
+            "question": np.array(columns["question"], dtype=np.int16),
+            "qid": pd.Categorical(columns["qid"]),
+            "slug": pd.Categorical(columns["slug"]),
+            "selected": np.array(columns["selected"], dtype=np.uint32),
+            "correct": np.array(columns["correct"], dtype=np.uint32),
+            "points": np.array(columns["points"], dtype=np.float32),
+            "max_points": np.array(columns["max_points"], dtype=np.int16),
+        }
+    )
+
+
+def _to_bitmask(onehot: list[int]) -> int:
+    return sum(1 << i for i, value in enumerate(onehot) if value)
+
+
+def _require_pyarrow(file_format: str):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            f"Exporting to {file_format} requires pyarrow, "
+            "install it with `pip install pyarrow`."
+        ) from e
+
+
+def write_grades(
+    graded_sets: list[GradedSet],
+    output_path: str | Path,
+    file_format: str,
+    sort: bool = True,
+):
+    """Write the grade table in the given format.
+
+    For the columnar formats (`parquet`, `feather`) the long-format selection
+    table from `get_selection_dataframe` is written next to the grades as
+    `<stem>_selections.<format>`.
+    """
+    output_path = Path(output_path)
+    with stage("grade.dataframe", n_students=len(graded_sets)):
+        df = get_grade_dataframe(graded_sets, sort=sort)
+
+    with stage("grade.export", format=file_format):
+        _write_grade_table(graded_sets, df, output_path, file_format)
+
+
+def _write_grade_table(graded_sets: list[GradedSet], df: pd.DataFrame, output_path: Path, file_format: str):
+    if file_format == "xlsx":
+        df.to_excel(output_path, index=False)
+    elif file_format == "csv":
+        df.to_csv(output_path, index=False)
+    elif file_format in ("parquet", "feather"):
+        _require_pyarrow(file_format)
+        selections = get_selection_dataframe(graded_sets)
+        selections_path = output_path.with_name(
+            f"{output_path.stem}_selections.{file_format}"
+        )
+        if file_format == "parquet":
+            df.to_parquet(output_path, index=False, compression="zstd")
+            selections.to_parquet(selections_path, index=False, compression="zstd")
+        else:
+            df.reset_index(drop=True).to_feather(output_path, compression="zstd")
+            selections.to_feather(selections_path, compression="zstd")
+    else:
+        raise ValueError(f"Unknown grade file format: {file_format}")
+
+
+class GradeWriter:
+    """Stream graded submissions to a CSV file, one row at a time.
+
+    Rows are appended as they are written so memory use does not grow with the
+    number of submissions. The columns are fixed by the first graded set, all
+    submissions are expected to contain the same number of questions.
+
+    The output matches `get_grade_dataframe(...).to_csv(path, index=False)`
+    when closed with `sort_by="student_name"`; rows with identical names keep
+    the order in which they were written.
+
+    Args:
+        path: Path of the CSV file, an existing file is overwritten.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.rows = 0
+        self._columns = None
+        self._file = open(self.path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file, lineterminator=os.linesep)
+
+    def __enter__(self) -> "GradeWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, graded_set: GradedSet):
+        record = grade_record(graded_set)
+        if self._columns is None:
+            self._columns = list(record)
+            self._writer.writerow(self._columns)
+        elif len(record) != len(self._columns):
+            raise ValueError(
+                f"Submission from {graded_set.student_id} has {len(record) - 4} questions, "
+                f"expected {len(self._columns) - 4}."
+            )
+
+        self._writer.writerow(record.values())
+        self.rows += 1
+
+    def close(self, sort_by: str | None = None):
+        """Close the file, optionally sorting the written rows by a column.
+
+        Sorting reads the rows back as text, so only the final step holds the
+        whole table in memory.
+        """
+        if self._file.closed:
+            return
+        self._file.close()
+
+        if sort_by is None or self._columns is None:
+            return
+
+        with open(self.path, "r", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            rows = list(reader)
+
+        # Empty cells are missing values, these are placed last like pandas does.
+        column = header.index(sort_by)
+        rows.sort(key=lambda row: (row[column] == "", row[column]))
+
+        with open(self.path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(header)
+            writer.writerows(rows)
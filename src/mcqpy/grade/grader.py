@@ -1,16 +1,28 @@
 from pathlib import Path
 
+import numpy as np
+
 from mcqpy.compile.manifest import Manifest
+from mcqpy.grade.answer_store import AnswerStore
+from mcqpy.grade.cache import ParseCache
 from mcqpy.grade.utils import GradedQuestion, GradedSet, ParsedSet
 from mcqpy.grade.rubric import Rubric
 from mcqpy.grade.parse_pdf import MCQPDFParser
+from mcqpy.utils.profiling import stage
 
 
 class MCQGrader:
-    def __init__(self, manifest: Manifest, rubric: Rubric):
+    def __init__(self, manifest: Manifest, rubric: Rubric, cache: ParseCache | None = None):
         self.manifest = manifest
         self.rubric = rubric
-        self.parser = MCQPDFParser()
+        self.parser = MCQPDFParser(manifest)
+        self.cache = cache
+
+    def parse(self, student_answer: str | Path) -> ParsedSet:
+        with stage("grade.parse_pdf"):
+            if self.cache is None:
+                return self.parser.parse_pdf(student_answer)
+            return self.cache.parse(student_answer, self.parser.parse_pdf)
 
     ############################################################################
     # Grade the parsed student answers
@@ -18,7 +30,11 @@ class MCQGrader:
 
     def grade(self, student_answer: str | Path = None, parsed_set: ParsedSet = None) -> GradedSet:
         if parsed_set is None:
-            parsed_set = self.parser.parse_pdf(student_answer)
+            parsed_set = self.parse(student_answer)
+        with stage("grade.score"):
+            return self._grade_parsed(parsed_set)
+
+    def _grade_parsed(self, parsed_set: ParsedSet) -> GradedSet:
         graded_set = GradedSet(
             student_id=parsed_set.student_id,
             student_name=parsed_set.student_name,
@@ -35,6 +51,7 @@ class MCQGrader:
                 student_answers=parsed_question.onehot,
                 correct_answers=manifest_item.correct_onehot,
                 max_point_value=manifest_item.point_value,
+                question_type=manifest_item.question_type,
             )
 
             # Apply rubric to determine point value earned
@@ -47,4 +64,67 @@ class MCQGrader:
         graded_set.max_points = sum(q.max_point_value for q in graded_set.graded_questions)
         return graded_set
 
+    ############################################################################
+    # Grade a whole cohort at once
+    ############################################################################
+
+    def score_store(self, store: AnswerStore) -> np.ndarray:
+        """Points of every student and question, shape (n_students, n_questions).
+
+        Each question is scored for the whole cohort with a single call to
+        `Rubric.score_matrix`. Questions missing from a submission score 0.
+        """
+        with stage("grade.score_store", n_students=store.n_students):
+            return self._score_store(store)
 
+    def _score_store(self, store: AnswerStore) -> np.ndarray:
+        offsets = store.offsets
+        columns = []
+        for index, qid in enumerate(store.qids):
+            item = self.manifest.get_item_by_qid(str(qid))
+            single = None if item.question_type is None else item.question_type == "single"
+            columns.append(
+                self.rubric.score_matrix(
+                    store.bits[:, offsets[index] : offsets[index + 1]],
+                    item.correct_onehot,
+                    item.point_value,
+                    single=single,
+                )
+            )
+
+        if not columns:
+            return np.zeros((store.n_students, 0))
+        return np.column_stack(columns) * store.answered
+
+    def grade_store(self, store: AnswerStore) -> list[GradedSet]:
+        points = self.score_store(store)
+        items = [self.manifest.get_item_by_qid(str(qid)) for qid in store.qids]
+
+        graded_sets = []
+        for row, parsed_set in enumerate(store.to_parsed_sets()):
+            graded_questions = []
+            indices = store.submission_columns(row)
+            for index, parsed_question in zip(indices, parsed_set.questions):
+                item = items[index]
+                graded_questions.append(
+                    GradedQuestion(
+                        qid=parsed_question.qid,
+                        slug=parsed_question.slug,
+                        student_answers=parsed_question.onehot,
+                        correct_answers=item.correct_onehot,
+                        max_point_value=item.point_value,
+                        point_value=points[row, index].item(),
+                        question_type=item.question_type,
+                    )
+                )
+
+            graded_sets.append(
+                GradedSet(
+                    student_id=parsed_set.student_id,
+                    student_name=parsed_set.student_name,
+                    graded_questions=graded_questions,
+                    points=sum(q.point_value for q in graded_questions),
+                    max_points=sum(q.max_point_value for q in graded_questions),
+                )
+            )
+        return graded_sets
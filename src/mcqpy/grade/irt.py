@@ -0,0 +1,232 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from mcqpy.compile.manifest import Manifest
+from mcqpy.grade.answer_store import AnswerStore
+
+IRTModel = Literal["1PL", "2PL"]
+
+# Name of the parameter file kept in a question directory
+ITEM_PARAMETERS_FILE = "irt_parameters.json"
+
+
+@dataclass
+class IRTResult:
+    """Item parameters from `fit_irt`.
+
+    The probability of a correct response for ability `theta` is
+    `1 / (1 + exp(-discrimination * (theta - difficulty)))`.
+    """
+
+    model: str
+    discrimination: np.ndarray
+    difficulty: np.ndarray
+    n_responses: np.ndarray
+    log_likelihood: float
+    n_iterations: int
+    converged: bool
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def fit_irt(
+    responses: np.ndarray,
+    model: IRTModel = "2PL",
+    n_quadrature: int = 21,
+    max_iter: int = 500,
+    tol: float = 1e-3,
+    newton_steps: int = 3,
+) -> IRTResult:
+    """Fit a 1PL or 2PL model by marginal maximum likelihood (Bock-Aitkin EM).
+
+    Abilities are integrated out over a standard normal prior using
+    Gauss-Hermite quadrature. Each EM iteration is a handful of matrix
+    products over the full response matrix, and the M-step takes Newton
+    steps for all items at once.
+
+    Args:
+        responses: Response matrix of shape (n_persons, n_items) with 1 for
+            correct, 0 for incorrect and NaN for items a person did not see.
+        model: '1PL' (all discriminations fixed at 1) or '2PL'.
+        n_quadrature: Number of quadrature nodes.
+        max_iter: Maximum number of EM iterations.
+        tol: Convergence tolerance on the largest change of an item parameter
+            between iterations.
+        newton_steps: Newton steps per M-step.
+    Returns:
+        IRTResult: Estimated item parameters.
+    """
+    if model not in ("1PL", "2PL"):
+        raise ValueError(f"Unknown IRT model: {model}")
+
+    responses = np.asarray(responses, dtype=np.float32)
+    observed = ~np.isnan(responses)
+    correct = np.where(observed, responses, 0).astype(np.float32)
+    observed = observed.astype(np.float32)
+    incorrect = observed - correct
+    n_items = responses.shape[1]
+
+    nodes, weights = np.polynomial.hermite_e.hermegauss(n_quadrature)
+    log_weights = np.log(weights / weights.sum())
+
+    # Slope-intercept form, P = sigmoid(a * theta + c)
+    slope = np.ones(n_items)
+    n_correct = correct.sum(axis=0)
+    n_observed = observed.sum(axis=0)
+    p = np.clip((n_correct + 0.5) / (n_observed + 1.0), 1e-3, 1 - 1e-3)
+    intercept = np.log(p / (1 - p))
+
+    converged = False
+    for iteration in range(1, max_iter + 1):
+        previous_slope, previous_intercept = slope, intercept
+
+        # E-step: posterior over quadrature nodes for every person
+        prob = np.clip(_sigmoid(slope[:, None] * nodes[None, :] + intercept[:, None]), 1e-9, 1 - 1e-9)
+        log_p, log_q = np.log(prob).astype(np.float32), np.log1p(-prob).astype(np.float32)
+        log_like = correct @ log_p + incorrect @ log_q + log_weights
+        norm = log_like.max(axis=1, keepdims=True)
+        posterior = np.exp(log_like - norm)
+        marginal = posterior.sum(axis=1, keepdims=True)
+        posterior /= marginal
+        log_likelihood = float((np.log(marginal) + norm).sum())
+
+        # Expected number of correct responses and of responses per node,
+        # kept in float32 to avoid upcasting the response matrix.
+        posterior = posterior.astype(np.float32)
+        r = (correct.T @ posterior).astype(float)
+        n = (observed.T @ posterior).astype(float)
+
+        # M-step: Newton steps on each item's expected log-likelihood
+        for _ in range(newton_steps):
+            prob = _sigmoid(slope[:, None] * nodes[None, :] + intercept[:, None])
+            residual = r - n * prob
+            information = n * prob * (1 - prob)
+            g_c = residual.sum(axis=1)
+            h_cc = information.sum(axis=1) + 1e-6
+            if model == "1PL":
+                intercept = intercept + g_c / h_cc
+            else:
+                g_a = (residual * nodes).sum(axis=1)
+                h_aa = (information * nodes**2).sum(axis=1) + 1e-6
+                h_ac = (information * nodes).sum(axis=1)
+                det = h_aa * h_cc - h_ac**2
+                det = np.where(np.abs(det) > 1e-12, det, 1e-12)
+                slope = slope + (h_cc * g_a - h_ac * g_c) / det
+                intercept = intercept + (h_aa * g_c - h_ac * g_a) / det
+                slope = np.clip(slope, -8.0, 8.0)
+            intercept = np.clip(intercept, -30.0, 30.0)
+
+        change = max(np.abs(slope - previous_slope).max(), np.abs(intercept - previous_intercept).max())
+        if change < tol:
+            converged = True
+            break
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        difficulty = np.where(slope != 0, -intercept / slope, np.nan)
+
+    return IRTResult(
+        model=model,
+        discrimination=slope,
+        difficulty=difficulty,
+        n_responses=n_observed.astype(np.int64),
+        log_likelihood=log_likelihood,
+        n_iterations=iteration,
+        converged=converged,
+    )
+
+
+################################################################################
+# Response matrices
+################################################################################
+
+
+def responses_from_store(store: AnswerStore, manifest: Manifest) -> tuple[list[str], np.ndarray]:
+    """Dichotomous response matrix from stored answers.
+
+    A response is correct if the selection matches the key exactly.
+
+    Returns:
+        tuple: The qids and the (n_students, n_questions) response matrix with
+            NaN for questions a submission does not contain.
+    """
+    offsets = store.offsets
+    responses = np.full((store.n_students, store.n_questions), np.nan)
+    for index, qid in enumerate(store.qids):
+        key = np.asarray(manifest.get_item_by_qid(str(qid)).correct_onehot, dtype=bool)
+        answers = store.bits[:, offsets[index] : offsets[index + 1]]
+        responses[:, index] = np.all(answers == key, axis=1)
+    responses[~store.answered] = np.nan
+    return [str(qid) for qid in store.qids], responses
+
+
+def stack_responses(blocks: list[tuple[list[str], np.ndarray]]) -> tuple[list[str], np.ndarray]:
+    """Stack response matrices of several exams, aligning the columns by qid."""
+    qids = list(dict.fromkeys(qid for block_qids, _ in blocks for qid in block_qids))
+    column = {qid: index for index, qid in enumerate(qids)}
+
+    n_persons = sum(block.shape[0] for _, block in blocks)
+    responses = np.full((n_persons, len(qids)), np.nan)
+    row = 0
+    for block_qids, block in blocks:
+        columns = [column[qid] for qid in block_qids]
+        responses[row : row + block.shape[0], columns] = block
+        row += block.shape[0]
+    return qids, responses
+
+
+################################################################################
+# Storage
+################################################################################
+
+
+class ItemParameters(BaseModel):
+    qid: str
+    slug: str | None = None
+    model: str
+    discrimination: float
+    difficulty: float
+    n_responses: int = Field(0, description="Number of responses used for calibration")
+
+
+class ItemParameterBank(BaseModel):
+    """Calibrated IRT parameters keyed by qid, stored next to the question files."""
+
+    items: dict[str, ItemParameters] = Field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, qid: str) -> bool:
+        return qid in self.items
+
+    def get(self, qid: str) -> ItemParameters | None:
+        return self.items.get(qid)
+
+    def update(self, qids: list[str], result: IRTResult, slugs: list[str | None] | None = None):
+        """Add or replace the parameters of `qids` with those in `result`."""
+        slugs = slugs or [None] * len(qids)
+        for index, qid in enumerate(qids):
+            self.items[qid] = ItemParameters(
+                qid=qid,
+                slug=slugs[index],
+                model=result.model,
+                discrimination=float(result.discrimination[index]),
+                difficulty=float(result.difficulty[index]),
+                n_responses=int(result.n_responses[index]),
+            )
+
+    def save_to_file(self, path: str | Path):
+        with open(path, "w") as f:
+            f.write(self.model_dump_json(indent=2))
+
+    @classmethod
+    def load_from_file(cls, path: str | Path) -> "ItemParameterBank":
+        with open(path, "r") as f:
+            data = f.read()
+        return cls.model_validate_json(data)
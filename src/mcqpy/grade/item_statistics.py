@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+from mcqpy.grade.cohort import Cohort
+
+
+def _columnwise_corr(x: np.ndarray, y: np.ndarray, mask: np.ndarray | None = None) -> np.ndarray:
+    """Pearson correlation between matching columns of `x` and `y`, over the rows where `mask` is set."""
+    weights = np.ones(x.shape, dtype=float) if mask is None else mask.astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n = weights.sum(axis=0)
+        xc = (x - (weights * x).sum(axis=0) / n) * weights
+        yc = (y - (weights * y).sum(axis=0) / n) * weights
+        numerator = (xc * yc).sum(axis=0)
+        denominator = np.sqrt((xc**2).sum(axis=0) * (yc**2).sum(axis=0))
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def _item_scores(cohort: Cohort) -> np.ndarray:
+    """Points as a fraction of each question's point value."""
+    max_points = np.where(cohort.max_points > 0, cohort.max_points, 1.0)
+    return cohort.points / max_points
+
+
+def item_statistics(cohort: Cohort, group_fraction: float = 0.27) -> pd.DataFrame:
+    """Classical item analysis of every question in one pass over the cohort.
+
+    Columns:
+        - `difficulty`: Mean fraction of the points obtained (p-value).
+        - `point_biserial`: Correlation between the item score and the total
+          score of the remaining items (corrected item-total correlation).
+        - `discrimination`: Difference in difficulty between the upper and
+          lower `group_fraction` of students ranked by total score.
+        - `option_<letter>`: Fraction of students selecting each option.
+
+    Every column of a question is computed over the students whose submission
+    contains it (`n_answered`). The total score used to rank students and in
+    the item-total correlation counts missing questions as zero points.
+
+    Args:
+        cohort: Cohort to analyse.
+        group_fraction: Size of the upper and lower groups.
+    Returns:
+        pd.DataFrame: One row per question.
+    """
+    scores = _item_scores(cohort)
+    totals = cohort.totals
+    answered = cohort.answered
+    n_answered = answered.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        difficulty = (scores * answered).sum(axis=0) / n_answered
+        option_rates = (cohort.selections * answered[..., None]).sum(axis=0) / n_answered[:, None]
+
+    point_biserial = _columnwise_corr(scores, totals[:, None] - cohort.points, mask=answered)
+
+    n_group = max(1, int(round(group_fraction * cohort.n_students)))
+    order = np.argsort(totals, kind="stable")
+    upper, lower = order[-n_group:], order[:n_group]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discrimination = (scores[upper] * answered[upper]).sum(axis=0) / answered[upper].sum(axis=0) - (
+            scores[lower] * answered[lower]
+        ).sum(axis=0) / answered[lower].sum(axis=0)
+
+    data = {
+        "question": np.arange(1, cohort.n_questions + 1),
+        "qid": cohort.qids,
+        "slug": cohort.slugs,
+        "n_answered": n_answered,
+        "difficulty": difficulty,
+        "point_biserial": point_biserial,
+        "discrimination": discrimination,
+    }
+    padding = np.arange(option_rates.shape[1]) >= cohort.n_options[:, None]
+    option_rates = np.where(padding, np.nan, option_rates)
+    for option in range(option_rates.shape[1]):
+        data[f"option_{chr(65 + option)}"] = option_rates[:, option]
+
+    return pd.DataFrame(data)
+
+
+def reliability_statistics(cohort: Cohort) -> dict:
+    """Test-level statistics of the total scores.
+
+    Returns:
+        dict: Number of students and items, mean and standard deviation of the
+            total score, KR-20 (on items scored as fully correct or not),
+            Cronbach's alpha (on points) and the standard error of measurement.
+    """
+    k = cohort.n_questions
+    totals = cohort.totals
+    total_variance = totals.var()
+
+    correct = (cohort.points >= cohort.max_points) & cohort.answered
+    p = correct.mean(axis=0)
+    correct_variance = correct.sum(axis=1).var()
+
+    if k > 1 and total_variance > 0:
+        alpha = k / (k - 1) * (1 - cohort.points.var(axis=0).sum() / total_variance)
+    else:
+        alpha = np.nan
+
+    if k > 1 and correct_variance > 0:
+        kr20 = k / (k - 1) * (1 - (p * (1 - p)).sum() / correct_variance)
+    else:
+        kr20 = np.nan
+
+    sem = np.sqrt(total_variance) * np.sqrt(1 - alpha) if alpha <= 1 else np.nan
+
+    return {
+        "n_students": cohort.n_students,
+        "n_items": k,
+        "mean": float(totals.mean()) if cohort.n_students else np.nan,
+        "std": float(np.sqrt(total_variance)) if cohort.n_students else np.nan,
+        "kr20": float(kr20),
+        "cronbach_alpha": float(alpha),
+        "sem": float(sem),
+    }
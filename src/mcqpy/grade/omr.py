@@ -0,0 +1,308 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from pypdf import PdfReader
+
+from mcqpy.compile.fields import CheckboxWidget, checkbox_name, read_checkbox_widgets
+from mcqpy.compile.manifest import Manifest
+from mcqpy.grade.utils import ParsedQuestion, ParsedSet
+from mcqpy.utils.parallel import process_pool, resolve_workers, split_chunks
+
+
+@dataclass
+class SheetLayout:
+    """Where the answer checkboxes are on the pages of one answer sheet.
+
+    Attributes:
+        page_boxes: Media box (x0, y0, x1, y1) of each page, shape (n_pages, 4).
+        qids: Question IDs in quiz order.
+        slugs: Question slugs in quiz order.
+        n_options: Number of options per question.
+        box_page: Page of each checkbox, shape (n_boxes,).
+        box_rect: Rectangle of each checkbox in PDF points, shape (n_boxes, 4).
+        box_question: Question index of each checkbox, shape (n_boxes,).
+        box_option: Option index of each checkbox, shape (n_boxes,).
+    """
+
+    page_boxes: np.ndarray
+    qids: list[str]
+    slugs: list[str]
+    n_options: np.ndarray
+    box_page: np.ndarray
+    box_rect: np.ndarray
+    box_question: np.ndarray
+    box_option: np.ndarray
+
+    @property
+    def n_pages(self) -> int:
+        return len(self.page_boxes)
+
+    @classmethod
+    def from_widgets(cls, widgets: list[CheckboxWidget], page_boxes) -> "SheetLayout":
+        widgets = sorted(widgets, key=lambda w: (w.quiz_index, w.option))
+        questions = {}
+        for widget in widgets:
+            questions.setdefault(widget.quiz_index, (widget.qid, widget.slug))
+        column = {index: i for i, index in enumerate(questions)}
+
+        n_options = np.zeros(len(questions), dtype=np.int64)
+        for widget in widgets:
+            n_options[column[widget.quiz_index]] = max(n_options[column[widget.quiz_index]], widget.option + 1)
+
+        return cls(
+            page_boxes=np.array(page_boxes, dtype=float).reshape(-1, 4),
+            qids=[qid for qid, _ in questions.values()],
+            slugs=[slug for _, slug in questions.values()],
+            n_options=n_options,
+            box_page=np.array([w.page for w in widgets], dtype=np.int64),
+            box_rect=np.array([w.rect for w in widgets], dtype=float).reshape(-1, 4),
+            box_question=np.array([column[w.quiz_index] for w in widgets], dtype=np.int64),
+            box_option=np.array([w.option for w in widgets], dtype=np.int64),
+        )
+
+    @classmethod
+    def from_manifest(cls, manifest: Manifest) -> "SheetLayout":
+        """Layout from the field geometry recorded in the manifest at build time."""
+        if not manifest.has_field_geometry:
+            raise ValueError("Manifest has no field geometry, rebuild the quiz to record it")
+        widgets = [
+            CheckboxWidget(
+                name=checkbox_name(index, option, item.slug, item.qid),
+                page=page,
+                annotation=annotation,
+                rect=rect,
+                quiz_index=index,
+                option=option,
+                slug=item.slug,
+                qid=item.qid,
+            )
+            for index, item in enumerate(manifest.items)
+            for option, (page, annotation, *rect) in enumerate(item.option_widgets)
+        ]
+        return cls.from_widgets(widgets, manifest.page_boxes)
+
+    @classmethod
+    def from_pdf(cls, path: str | Path) -> "SheetLayout":
+        """Read the layout from the widget annotations of the quiz PDF."""
+        return cls.from_widgets(*read_checkbox_widgets(path))
+
+
+################################################################################
+# Images
+################################################################################
+
+
+def _rasterize(path: str | Path, page_number: int, dpi: int) -> np.ndarray:
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        raise ImportError(
+            "Page has no scanned image, rasterizing it requires pypdfium2. "
+            "Install it with `pip install mcqpy[omr]`."
+        ) from None
+    document = pdfium.PdfDocument(str(path))
+    try:
+        bitmap = document[page_number].render(scale=dpi / 72, grayscale=True)
+        return np.asarray(bitmap.to_pil().convert("L"))
+    finally:
+        document.close()
+
+
+def page_image(reader: PdfReader, path: str | Path, page_number: int, dpi: int = 150) -> np.ndarray:
+    """Grayscale image of a page.
+
+    Scanned pages hold a single image that covers the page, which is used
+    as is. Other pages are rasterized at `dpi`.
+    """
+    images = reader.pages[page_number].images
+    if len(images) == 1:
+        return np.asarray(images[0].image.convert("L"))
+    return _rasterize(path, page_number, dpi)
+
+
+def fill_ratios(
+    image: np.ndarray,
+    page_box,
+    rects: np.ndarray,
+    inset: float = 0.2,
+    dark_threshold: int = 128,
+) -> np.ndarray:
+    """Fraction of dark pixels inside each rectangle.
+
+    Rectangles in PDF points are mapped onto the image, which is assumed to
+    cover the whole page, and shrunk by `inset` of their size on each side to
+    leave out the printed border. The pixels of all rectangles are gathered
+    at once on a common grid of sample points.
+
+    Args:
+        image: Grayscale image, shape (height, width).
+        page_box: Media box (x0, y0, x1, y1) of the page.
+        rects: Rectangles (x0, y0, x1, y1), shape (n, 4).
+        inset: Fraction of the width and height removed on each side.
+        dark_threshold: Pixels below this value count as dark.
+    Returns:
+        np.ndarray: Fill ratio of each rectangle, shape (n,).
+    """
+    height, width = image.shape
+    x0, y0, x1, y1 = page_box
+    scale_x, scale_y = width / (x1 - x0), height / (y1 - y0)
+
+    left = (rects[:, 0] - x0) * scale_x
+    right = (rects[:, 2] - x0) * scale_x
+    top = (y1 - rects[:, 3]) * scale_y
+    bottom = (y1 - rects[:, 1]) * scale_y
+    dx, dy = (right - left) * inset, (bottom - top) * inset
+
+    c0 = np.clip(np.floor(left + dx).astype(np.int64), 0, width - 1)
+    c1 = np.clip(np.ceil(right - dx).astype(np.int64), c0 + 1, width)
+    r0 = np.clip(np.floor(top + dy).astype(np.int64), 0, height - 1)
+    r1 = np.clip(np.ceil(bottom - dy).astype(np.int64), r0 + 1, height)
+    if len(rects) == 0:
+        return np.zeros(0)
+
+    # Every pixel of the largest rectangle is sampled once, smaller ones
+    # have some rows and columns sampled twice.
+    n_samples = int(max((r1 - r0).max(), (c1 - c0).max()))
+    steps = np.arange(n_samples) / n_samples
+    rows = r0[:, None] + (steps * (r1 - r0)[:, None]).astype(np.int64)
+    cols = c0[:, None] + (steps * (c1 - c0)[:, None]).astype(np.int64)
+    pixels = image[rows[:, :, None], cols[:, None, :]]
+    return (pixels < dark_threshold).mean(axis=(1, 2))
+
+
+def _scan_pages(path: str, page_numbers: list[int], layout: SheetLayout, dpi: int, inset: float, dark_threshold: int):
+    """Fill ratios of all checkboxes for some pages of a scan.
+
+    Returns an array of shape (len(page_numbers), n_boxes) that is zero for
+    checkboxes on other pages of the sheet.
+    """
+    reader = PdfReader(path)
+    ratios = np.zeros((len(page_numbers), len(layout.box_page)))
+    for row, page_number in enumerate(page_numbers):
+        sheet_page = page_number % layout.n_pages
+        boxes = np.flatnonzero(layout.box_page == sheet_page)
+        if len(boxes) == 0:
+            continue
+        image = page_image(reader, path, page_number, dpi)
+        ratios[row, boxes] = fill_ratios(image, layout.page_boxes[sheet_page], layout.box_rect[boxes], inset, dark_threshold)
+    return ratios
+
+
+################################################################################
+# Parser
+################################################################################
+
+
+class OMRParser:
+    """Reads answers from scanned paper answer sheets.
+
+    Each scan may hold several answer sheets back to back, every sheet having
+    the pages of the quiz PDF. Checkboxes are located with the `SheetLayout`
+    of the quiz and marked as selected if their fill ratio exceeds
+    `fill_threshold`. Scans should be upright and cover the whole page.
+
+    Student names and IDs are handwritten and not read; every sheet gets the
+    ID `<scan file stem>-<sheet number>`.
+
+    Args:
+        layout: Checkbox layout of the quiz.
+        dpi: Resolution used for pages that have to be rasterized.
+        fill_threshold: Fill ratio above which a checkbox counts as selected.
+        inset: Fraction of each checkbox border left out of the fill ratio.
+        dark_threshold: Gray value below which a pixel counts as dark.
+        workers: Number of processes, None uses all CPUs.
+    """
+
+    # Bump when the parsed output changes
+    version = "1"
+
+    def __init__(
+        self,
+        layout: SheetLayout,
+        dpi: int = 150,
+        fill_threshold: float = 0.25,
+        inset: float = 0.2,
+        dark_threshold: int = 128,
+        workers: int | None = None,
+    ):
+        self.layout = layout
+        self.dpi = dpi
+        self.fill_threshold = fill_threshold
+        self.inset = inset
+        self.dark_threshold = dark_threshold
+        self.workers = workers
+
+    def parse_pdf(self, scan: str | Path) -> list[ParsedSet]:
+        return self.parse_batch([scan])
+
+    def parse_batch(self, scans: list[str | Path]) -> list[ParsedSet]:
+        """Parse all sheets in the scans, pages are read on a process pool."""
+        tasks, page_counts = [], []
+        for scan in scans:
+            n_pages = len(PdfReader(scan).pages)
+            page_counts.append(n_pages)
+            if n_pages % self.layout.n_pages:
+                raise ValueError(
+                    f"{scan} has {n_pages} pages, which is not a multiple of the "
+                    f"{self.layout.n_pages} pages of the quiz"
+                )
+            tasks.extend((str(scan), page_number) for page_number in range(n_pages))
+
+        ratios = self._page_ratios(tasks)
+
+        parsed_sets = []
+        row = 0
+        for scan, n_pages in zip(scans, page_counts):
+            for sheet in range(n_pages // self.layout.n_pages):
+                sheet_ratios = ratios[row : row + self.layout.n_pages].sum(axis=0)
+                row += self.layout.n_pages
+                parsed_sets.append(self._sheet_to_parsed_set(sheet_ratios, scan, sheet))
+        return parsed_sets
+
+    def _page_ratios(self, tasks: list[tuple[str, int]]) -> np.ndarray:
+        # Consecutive pages of one file form a chunk, so each worker opens
+        # a file once per chunk.
+        chunks = []
+        n_workers = resolve_workers(self.workers, len(tasks))
+        for chunk in split_chunks(tasks, n_workers * 4):
+            start = 0
+            for index in range(1, len(chunk) + 1):
+                if index == len(chunk) or chunk[index][0] != chunk[start][0]:
+                    chunks.append((chunk[start][0], [page for _, page in chunk[start:index]]))
+                    start = index
+
+        args = (self.layout, self.dpi, self.inset, self.dark_threshold)
+        if n_workers == 1:
+            results = [_scan_pages(path, pages, *args) for path, pages in chunks]
+        else:
+            with process_pool(n_workers) as executor:
+                futures = [executor.submit(_scan_pages, path, pages, *args) for path, pages in chunks]
+                results = [future.result() for future in futures]
+
+        if not results:
+            return np.zeros((0, len(self.layout.box_page)))
+        return np.vstack(results)
+
+    def _sheet_to_parsed_set(self, ratios: np.ndarray, scan: str | Path, sheet: int) -> ParsedSet:
+        layout = self.layout
+        selected = ratios >= self.fill_threshold
+        onehots = [np.zeros(n, dtype=int) for n in layout.n_options]
+        for box in np.flatnonzero(selected):
+            onehots[layout.box_question[box]][layout.box_option[box]] = 1
+
+        questions = [
+            ParsedQuestion(
+                qid=qid,
+                slug=slug,
+                answers=np.flatnonzero(onehot).tolist(),
+                onehot=onehot.tolist(),
+            )
+            for qid, slug, onehot in zip(layout.qids, layout.slugs, onehots)
+        ]
+        return ParsedSet(
+            student_id=f"{Path(scan).stem}-{sheet + 1}",
+            student_name=None,
+            questions=questions,
+            file=str(scan),
+        )
@@ -2,16 +2,40 @@ from pathlib import Path
 
 from pypdf import PdfReader
 
+from mcqpy.compile.fields import CHECKBOX_NAME_PATTERN, checkbox_name, widget_name
+from mcqpy.compile.manifest import Manifest
 from mcqpy.grade.utils import ParsedQuestion, ParsedSet
 
 
 class MCQPDFParser:
+    """Reads the answers from the form fields of a filled-in quiz PDF.
+
+    If the manifest has the field geometry recorded at build time, each field
+    is looked up directly by its page and annotation index. PDFs where a
+    field is not where the manifest says, e.g. because another program
+    rewrote the form, are parsed by walking all fields.
+    """
+
+    # Bump when the parsed output changes, this invalidates cached parses.
+    version = "2"
+
+    def __init__(self, manifest: Manifest | None = None):
+        if manifest is not None and not manifest.has_field_geometry:
+            manifest = None
+        self.manifest = manifest
+
     def parse_pdf(self, student_answer: str | Path) -> str:
         reader = PdfReader(student_answer)
 
-        split_by_id = self._split_by_id(reader.get_fields())
-        student_name, student_id = self._find_student_info(reader.get_fields())
-        parsed_questions = self._parse_questions(split_by_id)
+        if self.manifest is not None:
+            try:
+                return self._parse_with_geometry(reader, student_answer)
+            except KeyError:
+                pass
+
+        fields = reader.get_fields()
+        student_name, student_id = self._find_student_info(fields)
+        parsed_questions = self._parse_questions(fields)
 
         # Make ParsedQuestion objects
         parsed_set = ParsedSet(
@@ -23,21 +47,58 @@ class MCQPDFParser:
 
         return parsed_set
 
-    def _split_by_id(self, fields):
-        split_by_id = {}
-        for name, field in fields.items():
-            # Find the id in the field name
-            qid_start = name.find("qid")
-            if qid_start == -1:
-                continue  # Not a question field, hopefully.
+    def _parse_with_geometry(self, reader: PdfReader, student_answer: str | Path) -> ParsedSet:
+        annotations = {}
+
+        def field(page: int, index: int, name: str):
+            if page not in annotations:
+                if page >= len(reader.pages):
+                    raise KeyError(name)
+                annotations[page] = reader.pages[page].get("/Annots") or []
+            if index >= len(annotations[page]):
+                raise KeyError(name)
+            annotation = annotations[page][index].get_object()
+            if widget_name(annotation) != name:
+                raise KeyError(name)
+            if "/V" not in annotation and "/Parent" in annotation:
+                return annotation["/Parent"].get_object()
+            return annotation
+
+        student_info = {}
+        for name in ("studentname", "studentid"):
+            if name in self.manifest.text_fields:
+                student_info[name] = field(*self.manifest.text_fields[name], name).get("/V")
+
+        parsed_questions = []
+        for quiz_index, item in enumerate(self.manifest.items):
+            answers, onehot = [], []
+            for option, (page, index, *_) in enumerate(item.option_widgets):
+                name = checkbox_name(quiz_index, option, item.slug, item.qid)
+                selected = field(page, index, name).get("/V") == "/Yes"
+                onehot.append(int(selected))
+                if selected:
+                    answers.append(option)
+            parsed_questions.append(
+                ParsedQuestion(qid=item.qid, slug=item.slug, answers=answers, onehot=onehot)
+            )
 
-            qid = name[qid_start + 4 :]  # +4 to skip 'qid='
+        return ParsedSet(
+            student_id=student_info.get("studentid"),
+            student_name=student_info.get("studentname"),
+            questions=parsed_questions,
+            file=str(student_answer),
+        )
 
-            if qid not in split_by_id:
-                split_by_id[qid] = [(name, field)]
-            else:
-                split_by_id[qid].append((name, field))
-        return split_by_id
+    @staticmethod
+    def _parse_field_names(fields):
+        """Yield (quiz index, option, slug, qid, selected) for each checkbox field."""
+        match = CHECKBOX_NAME_PATTERN.fullmatch
+        for name, field in fields.items():
+            parsed = match(name)
+            if parsed is None:
+                continue  # Not a question field, e.g. the student name.
+            quiz_index, option, slug, qid = parsed.groups()
+            yield int(quiz_index), int(option), slug, qid, field.get("/V") == "/Yes"
 
     def _find_student_info(self, fields):
         student_name = None
@@ -50,29 +111,20 @@ class MCQPDFParser:
 
         return student_name, student_id
 
-    def _parse_questions(self, split_by_id):
-        parsed = []
-        for qid, entries in split_by_id.items():
-            slug = None
-            answers = []
-            onehot = []
-            for name, field in entries:
-                # Find the slug in the field name
-                slug_start = name.find("slug")
-                if slug_start != -1:
-                    slug = name[slug_start + 5 :]  # +5 to skip 'slug='
-
-                # Find the answer index in the field name
-                opt_start = name.find("opt")
-                if opt_start != -1:
-                    opt_str = name[opt_start + 4 :].split("-")[0]  # +4 to skip 'opt='
-                    opt_index = int(opt_str)
-                    if field.get("/V") == "/Yes":
-                        answers.append(opt_index)
-                        onehot.append(1)
-                    else:
-                        onehot.append(0)
+    def _parse_questions(self, fields):
+        # Questions in order of first appearance, options by their index
+        questions = {}
+        for _, option, slug, qid, selected in self._parse_field_names(fields):
+            if qid not in questions:
+                questions[qid] = (slug, {})
+            questions[qid][1][option] = selected
 
+        parsed = []
+        for qid, (slug, options) in questions.items():
+            onehot = [0] * (max(options) + 1)
+            for option, selected in options.items():
+                onehot[option] = int(selected)
+            answers = [option for option, value in enumerate(onehot) if value]
             parsed.append(
                 ParsedQuestion(qid=qid, slug=slug, answers=answers, onehot=onehot)
             )
@@ -0,0 +1,261 @@
+import html
+import json
+import math
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from mcqpy.grade.cohort import Cohort
+from mcqpy.grade.export import get_grade_dataframe
+from mcqpy.grade.item_statistics import item_statistics, reliability_statistics
+from mcqpy.grade.utils import GradedSet
+from mcqpy.question import QuestionBank
+
+CSS = """
+body { font-family: system-ui, sans-serif; margin: 2em auto; max-width: 60em; color: #222; }
+h1, h2, h3 { font-weight: 600; }
+table { border-collapse: collapse; margin: 1em 0; }
+th, td { padding: 0.25em 0.75em; border-bottom: 1px solid #ddd; text-align: right; }
+th { border-bottom: 2px solid #444; }
+td.text, th.text { text-align: left; }
+.charts { display: flex; flex-wrap: wrap; gap: 1em; }
+.question { border-top: 1px solid #ccc; margin-top: 2em; }
+.question-text { white-space: pre-wrap; }
+"""
+
+
+def _finite(value):
+    """JSON-safe value, NaN and infinities become None."""
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    return value
+
+
+def _records(df) -> list[dict]:
+    return [{key: _finite(value) for key, value in row.items()} for row in df.to_dict(orient="records")]
+
+
+def _format(value, digits: int = 2) -> str:
+    if value is None or (isinstance(value, float) and not math.isfinite(value)):
+        return "&ndash;"
+    if isinstance(value, float):
+        return f"{value:.{digits}f}"
+    return html.escape(str(value))
+
+
+def svg_bar_chart(
+    labels: list[str],
+    values,
+    title: str,
+    xlabel: str,
+    ylabel: str,
+    colors: list[str] | None = None,
+    width: int = 420,
+    height: int = 260,
+) -> str:
+    """Minimal inline SVG bar chart."""
+    values = [float(v) for v in values]
+    colors = colors or ["steelblue"] * len(values)
+    left, right, top, bottom = 45, 10, 30, 45
+    plot_width, plot_height = width - left - right, height - top - bottom
+    y_max = max(values, default=0) or 1
+    bar_width = plot_width / max(len(values), 1)
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" role="img">',
+        f'<text x="{width / 2}" y="18" text-anchor="middle" font-size="14">{html.escape(title)}</text>',
+        f'<line x1="{left}" y1="{top + plot_height}" x2="{left + plot_width}" y2="{top + plot_height}" stroke="black"/>',
+        f'<line x1="{left}" y1="{top}" x2="{left}" y2="{top + plot_height}" stroke="black"/>',
+        f'<text x="{left - 5}" y="{top + 4}" text-anchor="end" font-size="11">{y_max:g}</text>',
+        f'<text x="{left - 5}" y="{top + plot_height}" text-anchor="end" font-size="11">0</text>',
+    ]
+    for index, (label, value, color) in enumerate(zip(labels, values, colors)):
+        bar_height = plot_height * value / y_max
+        x = left + index * bar_width
+        parts.append(
+            f'<rect x="{x + 0.1 * bar_width:.1f}" y="{top + plot_height - bar_height:.1f}" '
+            f'width="{0.8 * bar_width:.1f}" height="{bar_height:.1f}" fill="{color}" '
+            f'fill-opacity="0.7" stroke="black"><title>{html.escape(str(label))}: {value:g}</title></rect>'
+        )
+        parts.append(
+            f'<text x="{x + bar_width / 2:.1f}" y="{top + plot_height + 14}" text-anchor="middle" '
+            f'font-size="11">{html.escape(str(label))}</text>'
+        )
+    parts.append(
+        f'<text x="{left + plot_width / 2}" y="{height - 8}" text-anchor="middle" font-size="12">{html.escape(xlabel)}</text>'
+    )
+    parts.append(
+        f'<text x="12" y="{top + plot_height / 2}" text-anchor="middle" font-size="12" '
+        f'transform="rotate(-90 12 {top + plot_height / 2})">{html.escape(ylabel)}</text>'
+    )
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def _points_histogram(points: np.ndarray, max_points: float) -> tuple[list[int], list[int]]:
+    """Counts of points in unit bins centred on 0, 1, ..., max_points."""
+    top = int(max(max_points, points.max(initial=0)))
+    counts, _ = np.histogram(points, bins=np.arange(-0.5, top + 1.5, 1))
+    return list(range(top + 1)), counts.tolist()
+
+
+def analysis_summary(graded_sets: list[GradedSet]) -> dict:
+    """All statistics shown in the analysis reports as plain JSON data."""
+    cohort = Cohort.from_graded_sets(graded_sets)
+    items = item_statistics(cohort)
+    max_points = graded_sets[0].max_points if graded_sets else 0
+    totals = np.array([gs.points for gs in graded_sets], dtype=float)
+    bins, counts = _points_histogram(totals, max_points)
+
+    questions = []
+    for index, qid in enumerate(cohort.qids):
+        answered = cohort.answered[:, index]
+        points = cohort.points[answered, index]
+        point_bins, point_counts = _points_histogram(points, cohort.max_points[index])
+        questions.append(
+            {
+                "question": index + 1,
+                "qid": qid,
+                "slug": cohort.slugs[index],
+                "answer_counts": cohort.question_selections(index).sum(axis=0, where=answered[:, None]).tolist(),
+                "correct_answers": cohort.keys[index, : cohort.n_options[index]].astype(int).tolist(),
+                "points": {"bins": point_bins, "counts": point_counts},
+            }
+        )
+
+    return {
+        "generated": date.today().isoformat(),
+        "max_points": _finite(max_points),
+        "total_points": {"bins": bins, "counts": counts},
+        "reliability": {key: _finite(value) for key, value in reliability_statistics(cohort).items()},
+        "items": _records(items),
+        "questions": questions,
+        "grades": _records(get_grade_dataframe(graded_sets)),
+    }
+
+
+def _render_html(summary: dict, question_bank: QuestionBank | None) -> str:
+    reliability = summary["reliability"]
+    out = [
+        "<!DOCTYPE html>",
+        '<html lang="en"><head><meta charset="utf-8">',
+        "<title>Quiz Analysis Report</title>",
+        f"<style>{CSS}</style></head><body>",
+        "<h1>Quiz Analysis Report</h1>",
+        f"<p>Generated by MCQPy on {summary['generated']}.</p>",
+        "<h2>Overall Quiz Analysis</h2>",
+        svg_bar_chart(
+            summary["total_points"]["bins"],
+            summary["total_points"]["counts"],
+            "Distribution of Total Points",
+            "Total Points",
+            "Number of Students",
+            width=560,
+        ),
+        "<h2>Item Statistics</h2>",
+        "<ul>",
+        f"<li>Students: {reliability['n_students']}, items: {reliability['n_items']}</li>",
+        f"<li>Mean total: {_format(reliability['mean'])} (SD {_format(reliability['std'])})</li>",
+        f"<li>KR-20: {_format(reliability['kr20'], 3)}</li>",
+        f"<li>Cronbach's alpha: {_format(reliability['cronbach_alpha'], 3)}</li>",
+        f"<li>Standard error of measurement: {_format(reliability['sem'])}</li>",
+        "</ul>",
+        "<p>Difficulty is the mean fraction of points obtained, r<sub>pb</sub> the correlation with "
+        "the score on the remaining items and D<sub>27</sub> the difference in difficulty between "
+        "the upper and lower 27% of students.</p>",
+        '<table><tr><th>#</th><th class="text">Slug</th><th>Difficulty</th>'
+        "<th>r<sub>pb</sub></th><th>D<sub>27</sub></th></tr>",
+    ]
+    for item in summary["items"]:
+        out.append(
+            f"<tr><td>{item['question']}</td><td class=\"text\">{_format(item['slug'])}</td>"
+            f"<td>{_format(item['difficulty'])}</td><td>{_format(item['point_biserial'])}</td>"
+            f"<td>{_format(item['discrimination'])}</td></tr>"
+        )
+    out.append("</table>")
+
+    for question in summary["questions"]:
+        out.append('<section class="question">')
+        out.append(f"<h2>Question {question['question']} Analysis</h2>")
+        if question_bank is not None:
+            try:
+                bank_question = question_bank.get_by_qid(question["qid"])
+            except KeyError:
+                bank_question = None
+            if bank_question is not None:
+                out.append(f'<p class="question-text">{html.escape(bank_question.text)}</p>')
+                out.append('<ol type="a">')
+                out.extend(f"<li>{html.escape(choice)}</li>" for choice in bank_question.choices)
+                out.append("</ol>")
+        labels = [chr(65 + i) for i in range(len(question["answer_counts"]))]
+        colors = ["green" if correct else "red" for correct in question["correct_answers"]]
+        out.append('<div class="charts">')
+        out.append(
+            svg_bar_chart(
+                labels,
+                question["answer_counts"],
+                "Distribution of Selected Answers",
+                "Answer Options",
+                "Number of Selections",
+                colors=colors,
+            )
+        )
+        out.append(
+            svg_bar_chart(
+                question["points"]["bins"],
+                question["points"]["counts"],
+                "Distribution of Points Awarded",
+                "Points Awarded",
+                "Number of Students",
+                colors=["blue"] * len(question["points"]["bins"]),
+            )
+        )
+        out.append("</div>")
+        out.append(f"<p>Analysis for Question {question['question']}: {html.escape(question['slug'])}</p>")
+        out.append("</section>")
+
+    out.append("<h2>Grade Summary Table</h2>")
+    out.append('<table><tr><th class="text">ID</th><th class="text">Name</th><th>Points</th></tr>')
+    for grade in summary["grades"]:
+        out.append(
+            f"<tr><td class=\"text\">{_format(grade['student_id'])}</td>"
+            f"<td class=\"text\">{_format(grade['student_name'])}</td>"
+            f"<td>{_format(grade['total_points'])}</td></tr>"
+        )
+    out.append("</table></body></html>")
+    return "\n".join(out)
+
+
+def write_html_report(
+    graded_sets: list[GradedSet],
+    output_dir: str | Path,
+    question_bank: QuestionBank | None = None,
+) -> tuple[Path, Path]:
+    """Write the analysis as one self-contained HTML file and a JSON summary.
+
+    The statistics are the same as in the PDF report from `QuizAnalysis`,
+    but no LaTeX is needed and charts are inline SVG.
+
+    Args:
+        graded_sets: Graded submissions.
+        output_dir: Directory for `quiz_analysis.html` and `quiz_analysis.json`.
+        question_bank: If given, question texts and choices are included.
+    Returns:
+        tuple[Path, Path]: Paths of the HTML and JSON files.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary = analysis_summary(graded_sets)
+
+    json_path = output_dir / "quiz_analysis.json"
+    with open(json_path, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    html_path = output_dir / "quiz_analysis.html"
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(_render_html(summary, question_bank))
+
+    return html_path, json_path
@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from mcqpy.compile.manifest import Manifest
+from mcqpy.grade.irt import ItemParameterBank, _sigmoid
+
+
+@dataclass
+class OptionLayout:
+    """The options of all questions of a manifest side by side.
+
+    Options are columns in the layout of `AnswerStore.bits`: question `k`
+    occupies the columns `offsets[k]:offsets[k + 1]`.
+
+    Attributes:
+        qids: Question IDs, length n_questions.
+        keys: Whether each option is correct, shape (n_columns,).
+        question: Question index of each option, shape (n_columns,).
+        offsets: First column of each question, shape (n_questions + 1,).
+        multiple: Whether each question allows several selections, shape (n_questions,).
+        point_values: Point value of each question, shape (n_questions,).
+    """
+
+    qids: list[str]
+    keys: np.ndarray
+    question: np.ndarray
+    offsets: np.ndarray
+    multiple: np.ndarray
+    point_values: np.ndarray
+
+    @property
+    def n_questions(self) -> int:
+        return len(self.multiple)
+
+    @classmethod
+    def from_manifest(cls, manifest: Manifest) -> "OptionLayout":
+        items = manifest.items
+        n_options = np.array([len(item.correct_onehot) for item in items], dtype=np.int64)
+        multiple = [
+            item.question_type == "multiple" if item.question_type is not None else sum(item.correct_onehot) > 1
+            for item in items
+        ]
+        return cls(
+            qids=[item.qid for item in items],
+            keys=np.array([v for item in items for v in item.correct_onehot], dtype=bool),
+            question=np.repeat(np.arange(len(items)), n_options),
+            offsets=np.concatenate([[0], np.cumsum(n_options)]),
+            multiple=np.array(multiple, dtype=bool),
+            point_values=np.array([item.point_value or 1 for item in items], dtype=float),
+        )
+
+    def first_keys(self) -> np.ndarray:
+        """The first correct option of each question, shape (n_columns,)."""
+        columns = np.flatnonzero(self.keys)
+        _, first = np.unique(self.question[columns], return_index=True)
+        selected = np.zeros(len(self.keys), dtype=bool)
+        selected[columns[first]] = True
+        return selected
+
+    def pick_one(self, scores: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """Select the candidate option with the highest score in each question.
+
+        Args:
+            scores: Score of each option, e.g. uniform draws, shape (n, n_columns).
+            candidates: Options that may be picked, broadcastable to `scores`.
+        Returns:
+            np.ndarray: Boolean selections, at most one per question and row.
+        """
+        masked = np.where(candidates, scores, -np.inf)
+        if masked.shape[1] == 0:
+            return np.zeros(masked.shape, dtype=bool)
+        best = np.maximum.reduceat(masked, self.offsets[:-1], axis=1)
+        return candidates & (masked == best[:, self.question])
+
+
+class ResponseModel:
+    """Draws the answers of a whole cohort at once.
+
+    Subclasses implement `select`, which returns the selections of all
+    students as one boolean array in the column layout of `AnswerStore.bits`.
+    `draw` then blanks whole questions with probability `blank_rate`.
+
+    Args:
+        blank_rate: Probability that a student leaves a question blank.
+    """
+
+    def __init__(self, blank_rate: float = 0.0):
+        if not 0 <= blank_rate <= 1:
+            raise ValueError("blank_rate must be in [0, 1]")
+        self.blank_rate = blank_rate
+
+    def select(self, layout: OptionLayout, n_students: int, rng: np.random.Generator) -> np.ndarray:
+        raise NotImplementedError("Subclasses should implement this method.")  # pragma: no cover
+
+    def draw(self, manifest: Manifest, n_students: int, rng: np.random.Generator) -> np.ndarray:
+        """Selections of `n_students` students, shape (n_students, n_options.sum())."""
+        layout = OptionLayout.from_manifest(manifest)
+        selections = self.select(layout, n_students, rng)
+        if self.blank_rate > 0:
+            blank = rng.random((n_students, layout.n_questions)) < self.blank_rate
+            selections &= ~blank[:, layout.question]
+        return selections
+
+
+class CorrectResponses(ResponseModel):
+    """Every student selects exactly the correct options."""
+
+    def select(self, layout, n_students, rng):
+        return np.tile(layout.keys, (n_students, 1))
+
+
+class PointValueResponses(ResponseModel):
+    """One box per question, the original `test-autofill` behaviour.
+
+    The first correct option is ticked with probability `1 / point_value`,
+    or 0.5 for one-point questions, otherwise one of the other options.
+    """
+
+    def select(self, layout, n_students, rng):
+        p_correct = np.where(layout.point_values > 1, 1 / layout.point_values, 0.5)
+        first_correct = layout.first_keys()
+        correct = rng.random((n_students, layout.n_questions)) < p_correct
+        other = layout.pick_one(rng.random((n_students, len(layout.keys))), ~first_correct)
+        return np.where(correct[:, layout.question], first_correct, other)
+
+
+class IRTResponses(ResponseModel):
+    """Answers driven by student ability under a 2PL model.
+
+    A student of ability `theta` knows a question with probability
+    `guessing + (1 - guessing) / (1 + exp(-discrimination * (theta - difficulty)))`.
+    For single-choice questions a student who knows it selects the key,
+    otherwise one wrong option. For multiple-choice questions every option is
+    judged on its own: correct options are selected with that probability and
+    wrong ones with its complement times `false_selection`, so partial and
+    over-complete answers occur.
+
+    Args:
+        ability_mean: Mean ability.
+        ability_std: Standard deviation of the abilities.
+        difficulty: Difficulty, for all questions or per question. If not
+            given the questions are spread evenly over [-1.5, 1.5].
+        discrimination: Discrimination, for all questions or per question.
+        guessing: Probability of knowing a question at very low ability.
+        item_parameters: Calibrated parameters from `mcqpy calibrate`, they
+            replace `difficulty` and `discrimination` for the questions they cover.
+        false_selection: Scale of the probability of selecting a wrong option
+            of a multiple-choice question.
+        blank_rate: Probability that a student leaves a question blank.
+    """
+
+    def __init__(
+        self,
+        ability_mean: float = 0.0,
+        ability_std: float = 1.0,
+        difficulty=None,
+        discrimination=1.0,
+        guessing: float = 0.0,
+        item_parameters: ItemParameterBank | None = None,
+        false_selection: float = 0.3,
+        blank_rate: float = 0.0,
+    ):
+        super().__init__(blank_rate)
+        if not 0 <= guessing < 1:
+            raise ValueError("guessing must be in [0, 1)")
+        self.ability_mean = ability_mean
+        self.ability_std = ability_std
+        self.difficulty = difficulty
+        self.discrimination = discrimination
+        self.guessing = guessing
+        self.item_parameters = item_parameters
+        self.false_selection = false_selection
+
+    def parameters(self, layout: OptionLayout) -> tuple[np.ndarray, np.ndarray]:
+        """Difficulty and discrimination of every question."""
+        n_questions = layout.n_questions
+        difficulty = self.difficulty
+        if difficulty is None:
+            difficulty = ((np.arange(n_questions) + 0.5) / max(n_questions, 1) - 0.5) * 3
+        difficulty = np.broadcast_to(np.asarray(difficulty, dtype=float), (n_questions,)).copy()
+        discrimination = np.broadcast_to(np.asarray(self.discrimination, dtype=float), (n_questions,)).copy()
+        if self.item_parameters is not None:
+            for index, qid in enumerate(layout.qids):
+                parameters = self.item_parameters.get(qid)
+                if parameters is not None:
+                    difficulty[index] = parameters.difficulty
+                    discrimination[index] = parameters.discrimination
+        return difficulty, discrimination
+
+    def select(self, layout, n_students, rng):
+        difficulty, discrimination = self.parameters(layout)
+        abilities = rng.normal(self.ability_mean, self.ability_std, size=n_students)
+        p_known = self.guessing + (1 - self.guessing) * _sigmoid(discrimination * (abilities[:, None] - difficulty))
+        known = rng.random(p_known.shape) < p_known
+
+        draws = rng.random((n_students, len(layout.keys)))
+        p_option = p_known[:, layout.question]
+        single = np.where(known[:, layout.question], layout.keys, layout.pick_one(draws, ~layout.keys[None]))
+        multiple = np.where(layout.keys, draws < p_option, draws < (1 - p_option) * self.false_selection)
+        return np.where(layout.multiple[layout.question], multiple, single)
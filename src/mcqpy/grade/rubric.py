@@ -9,9 +9,103 @@ class Rubric:
 
     def score_question(self, question: GradedQuestion) -> int:
         return NotImplementedError("Subclasses should implement this method.") # pragma: no cover
-    
+
+    def score_matrix(self, answers, key, points, single=None) -> np.ndarray:
+        """Score many answers at once.
+
+        Args:
+            answers: One-hot selections, shape (..., n_options), e.g. all students
+                for one question.
+            key: One-hot correct answers, broadcastable to `answers`.
+            points: Point value(s), broadcastable to `answers.shape[:-1]`.
+            single: Whether the question(s) are single-choice. If None it is
+                inferred from the key having exactly one correct option.
+        Returns:
+            np.ndarray: Points awarded, shape `answers.shape[:-1]`.
+        """
+        raise NotImplementedError("Subclasses should implement this method.") # pragma: no cover
+
+    @staticmethod
+    def _is_single(question: GradedQuestion) -> bool | None:
+        if question.question_type is None:
+            return None
+        return question.question_type == "single"
+
 
 class StrictRubric(Rubric):
-    
+    """All-or-nothing: full points only if the selection matches the key exactly."""
+
     def score_question(self, question: GradedQuestion) -> int:
-        return (question.student_answers == question.correct_answers) * question.max_point_value
\ No newline at end of file
+        return (question.student_answers == question.correct_answers) * question.max_point_value
+
+    def score_matrix(self, answers, key, points, single=None) -> np.ndarray:
+        answers = np.asarray(answers, dtype=bool)
+        key = np.asarray(key, dtype=bool)
+        return np.all(answers == key, axis=-1) * np.asarray(points)
+
+
+class PartialCreditRubric(Rubric):
+    """Partial credit for 'multiple' questions, all-or-nothing for 'single'.
+
+    Each selected correct option earns an equal share of the points, and each
+    selected wrong option deducts `penalty` times an equal share of the
+    points of the wrong options. The score never goes below zero, so with the
+    default `penalty=1.0` selecting every option earns nothing.
+
+    Args:
+        penalty: Weight of the deduction for wrong selections, 0 disables it.
+    """
+
+    def __init__(self, penalty: float = 1.0):
+        super().__init__()
+        if penalty < 0:
+            raise ValueError("penalty must be non-negative")
+        self.penalty = penalty
+
+    def score_question(self, question: GradedQuestion) -> float:
+        score = self.score_matrix(
+            question.student_answers,
+            question.correct_answers,
+            question.max_point_value,
+            single=self._is_single(question),
+        )
+        return float(score)
+
+    def score_matrix(self, answers, key, points, single=None) -> np.ndarray:
+        answers = np.asarray(answers, dtype=bool)
+        key = np.asarray(key, dtype=bool)
+        key, answers = np.broadcast_arrays(key, answers)
+
+        n_correct = key.sum(axis=-1)
+        n_wrong = (~key).sum(axis=-1)
+        hits = (answers & key).sum(axis=-1)
+        misses = (answers & ~key).sum(axis=-1)
+
+        credit = hits / np.maximum(n_correct, 1) - self.penalty * misses / np.maximum(n_wrong, 1)
+        credit = np.clip(credit, 0.0, 1.0)
+
+        if single is None:
+            single = n_correct == 1
+        exact = np.all(answers == key, axis=-1)
+        credit = np.where(single, exact, credit)
+
+        return credit * np.asarray(points, dtype=float)
+
+
+class RubricFactory:
+    """Creates rubrics from configuration dictionaries."""
+
+    RUBRIC_MAP = {
+        "strict": StrictRubric,
+        "partial": PartialCreditRubric,
+    }
+
+    @classmethod
+    def from_config(cls, config: dict) -> Rubric:
+        rubric_type = config.get("type")
+        rubric_class = cls.RUBRIC_MAP.get(rubric_type)
+        if not rubric_class:
+            raise ValueError(f"Unknown rubric type: {rubric_type}")
+
+        kwargs = {k: v for k, v in config.items() if k not in ["type"]}
+        return rubric_class(**kwargs)
@@ -0,0 +1,80 @@
+from collections.abc import Iterator
+
+import numpy as np
+
+from mcqpy.compile.manifest import Manifest
+from mcqpy.grade.answer_store import AnswerStore
+from mcqpy.grade.responses import IRTResponses, ResponseModel
+from mcqpy.grade.utils import ParsedSet
+
+
+class CohortSimulator:
+    """Synthetic cohort answering the quiz of a manifest, without any PDFs.
+
+    Answers are drawn by a `ResponseModel`, by default `IRTResponses` where
+    students of normally distributed ability answer under a 2PL model.
+
+    Students are drawn in blocks of `block_size` from generators seeded with
+    `(seed, block)`, so a cohort is the same whether it is drawn at once with
+    `answer_store` or streamed with `answer_stores`/`parsed_sets`.
+
+    Args:
+        manifest: Manifest of the quiz.
+        n_students: Size of the cohort.
+        seed: Random seed, a random one if not given.
+        response_model: Model the answers are drawn from.
+        block_size: Number of students drawn at once.
+    """
+
+    def __init__(
+        self,
+        manifest: Manifest,
+        n_students: int,
+        seed: int | None = None,
+        response_model: ResponseModel | None = None,
+        block_size: int = 10_000,
+    ):
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        self.manifest = manifest
+        self.n_students = n_students
+        self.seed = int(np.random.SeedSequence().entropy % 2**63) if seed is None else seed
+        self.response_model = response_model or IRTResponses()
+        self.block_size = block_size
+
+    @property
+    def n_blocks(self) -> int:
+        return -(-self.n_students // self.block_size)
+
+    def _draw_block(self, block: int) -> AnswerStore:
+        start = block * self.block_size
+        stop = min(start + self.block_size, self.n_students)
+        n = stop - start
+        items = self.manifest.items
+        bits = self.response_model.draw(self.manifest, n, np.random.default_rng([self.seed, block]))
+
+        ids = np.arange(start, stop)
+        return AnswerStore(
+            student_ids=np.char.add("SIM", ids.astype(str)),
+            student_names=np.char.add("Student ", ids.astype(str)),
+            files=np.full(n, "", dtype=str),
+            qids=np.array([item.qid for item in items], dtype=str),
+            slugs=np.array([item.slug for item in items], dtype=str),
+            n_options=np.array([len(item.correct_onehot) for item in items], dtype=np.int64),
+            answered=np.ones((n, len(items)), dtype=bool),
+            bits=bits,
+        )
+
+    def answer_stores(self) -> Iterator[AnswerStore]:
+        """Stream the cohort as one answer store per block of students."""
+        for block in range(self.n_blocks):
+            yield self._draw_block(block)
+
+    def answer_store(self) -> AnswerStore:
+        """The whole cohort in one answer store."""
+        return AnswerStore.concatenate(list(self.answer_stores()) or [self._draw_block(0)])
+
+    def parsed_sets(self) -> Iterator[ParsedSet]:
+        """Stream the cohort as parsed submissions, as if read from filled PDFs."""
+        for store in self.answer_stores():
+            yield from store.to_parsed_sets()
@@ -24,6 +24,7 @@ class GradedQuestion:
     correct_answers: list[int]
     max_point_value: int
     point_value: int = 0
+    question_type: str | None = None
 
 @dataclass
 class GradedSet:
@@ -0,0 +1,68 @@
+import os
+from pathlib import Path
+
+
+class SubmissionWatcher:
+    """Poll a directory for new, changed and removed submissions.
+
+    Each poll is a single `os.scandir` of the directory, files are compared by
+    their modification time and size so unchanged submissions are never
+    reported twice. A new or changed file is only reported once its signature
+    is identical in two consecutive polls, so files that are still being
+    copied into the directory are not picked up half-written.
+
+    Args:
+        directory: Directory to watch.
+        suffix: Only files with this suffix are considered.
+        settle: If False, report files as soon as they are seen.
+    """
+
+    def __init__(self, directory: str | Path, suffix: str = ".pdf", settle: bool = True):
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.settle = settle
+        self._seen: dict[str, tuple[int, int]] = {}
+        self._pending: dict[str, tuple[int, int]] = {}
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        signatures = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(self.suffix) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                signatures[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def mark_seen(self, paths: list[str | Path]):
+        """Record `paths` as handled, e.g. after an initial full grading run."""
+        for path in paths:
+            stat = os.stat(path)
+            self._seen[Path(path).name] = (stat.st_mtime_ns, stat.st_size)
+
+    def poll(self) -> tuple[list[Path], list[Path]]:
+        """Scan the directory once.
+
+        Returns:
+            tuple: Paths of new or changed submissions and paths of removed submissions.
+        """
+        signatures = self._scan()
+
+        changed = []
+        for name, signature in signatures.items():
+            if self._seen.get(name) == signature:
+                continue
+            if self.settle and self._pending.get(name) != signature:
+                self._pending[name] = signature
+                continue
+            self._pending.pop(name, None)
+            self._seen[name] = signature
+            changed.append(self.directory / name)
+
+        removed = [self.directory / name for name in self._seen if name not in signatures]
+        for path in removed:
+            del self._seen[path.name]
+        for name in [name for name in self._pending if name not in signatures]:
+            del self._pending[name]
+
+        return sorted(changed), removed
@@ -0,0 +1,299 @@
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import cache, lru_cache
+
+from pylatexenc import macrospec
+from pylatexenc.latexwalker import (
+    LatexCharsNode,
+    LatexCommentNode,
+    LatexEnvironmentNode,
+    LatexGroupNode,
+    LatexMacroNode,
+    LatexMathNode,
+    LatexSpecialsNode,
+    LatexWalker,
+    LatexWalkerError,
+    LatexWalkerParseError,
+    get_default_latex_context_db,
+)
+
+from mcqpy.question import Question
+
+# fmt: off
+# Environments of LaTeX itself and of the packages in the quiz preamble.
+KNOWN_ENVIRONMENTS = frozenset({
+    # LaTeX
+    "abstract", "array", "center", "description", "displaymath", "enumerate",
+    "eqnarray", "eqnarray*", "figure", "flushleft", "flushright", "itemize", "list",
+    "math", "minipage", "picture", "quotation", "quote", "tabbing", "table", "tabular",
+    "tabular*", "verbatim", "verbatim*", "verse", "tiny", "scriptsize", "footnotesize",
+    "small", "normalsize", "large", "Large", "LARGE", "huge", "Huge",
+    # amsmath
+    "align", "align*", "alignat", "alignat*", "aligned", "alignedat", "Bmatrix",
+    "bmatrix", "cases", "equation", "equation*", "flalign", "flalign*", "gather",
+    "gather*", "gathered", "matrix", "multline", "multline*", "pmatrix", "smallmatrix",
+    "split", "subequations", "Vmatrix", "vmatrix",
+    # tikz, minted, hyperref, subcaption
+    "tikzpicture", "scope", "minted", "Form", "subfigure",
+})
+
+# Environments typeset in math mode, and those that may not appear inside $...$.
+MATH_ENVIRONMENTS = frozenset({
+    "displaymath", "math", "eqnarray", "eqnarray*", "align", "align*", "alignat",
+    "alignat*", "equation", "equation*", "flalign", "flalign*", "gather", "gather*",
+    "multline", "multline*",
+})
+ALIGNMENT_ENVIRONMENTS = frozenset({
+    "array", "tabular", "tabular*", "eqnarray", "eqnarray*", "align", "align*",
+    "alignat", "alignat*", "aligned", "alignedat", "Bmatrix", "bmatrix", "cases",
+    "flalign", "flalign*", "matrix", "pmatrix", "smallmatrix", "split", "Vmatrix",
+    "vmatrix",
+})
+VERBATIM_ENVIRONMENTS = frozenset({"verbatim", "verbatim*", "minted"})
+
+# Macros whose arguments are typeset in text mode, even inside math.
+TEXT_MACROS = frozenset({
+    "text", "mbox", "hbox", "textrm", "textbf", "textit", "texttt", "textsf",
+    "intertext",
+})
+# fmt: on
+VERBATIM_MACROS = frozenset({"verb"})
+# Macros with labels, keys, paths or URLs as arguments, which are not typeset:
+# their argument spec and the indices of the arguments that are not linted.
+# Only the link text of \href is linted.
+REFERENCE_MACROS = {
+    "label": ("{", {0}),
+    "ref": ("{", {0}),
+    "pageref": ("{", {0}),
+    "eqref": ("{", {0}),
+    "autoref": ("*{", {1}),
+    "cite": ("*[[{", {3}),
+    "input": ("{", {0}),
+    "includegraphics": ("*[{", {1, 2}),
+    "url": ("{", {0}),
+    "href": ("[{{", {0, 1}),
+    "mintinline": ("[{{", {0, 1, 2}),
+}
+
+# Strings without any of these characters cannot contain a LaTeX error the lint finds.
+_LATEX_CHARS = re.compile(r"[\\{}$%&#_^]")
+_TEXT_SPECIALS = re.compile(r"[#_^]")
+# Runs of prose that are not part of a macro or environment name. They are
+# tokenized a character at a time by pylatexenc, but only their first two
+# characters can matter (as undelimited macro arguments, e.g. \frac 12).
+_PROSE = re.compile(r"(?<![A-Za-z@\\{])[A-Za-z0-9 \t.,;:!?'\"()<>=/*-]{4,}")
+_NON_SPACE = re.compile(r"\S")
+
+
+@dataclass(frozen=True)
+class LatexIssue:
+    field: str
+    line: int
+    column: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.field}:{self.line}:{self.column}: {self.message}"
+
+
+@cache
+def _latex_context() -> macrospec.LatexContextDb:
+    # The default specials (quotes, dashes, ~) are irrelevant to the lint, and
+    # each one is tested at every character, so only '&' is kept.
+    context = get_default_latex_context_db().filter_context(
+        keep_which=["macros", "environments"]
+    )
+    context.add_context_category("alignment", specials=[macrospec.SpecialsSpec("&")])
+    context.add_context_category(
+        "references",
+        macros=[
+            macrospec.MacroSpec(name, argspec)
+            for name, (argspec, _) in REFERENCE_MACROS.items()
+        ],
+        prepend=True,
+    )
+    return context
+
+
+def _skeleton(source: str) -> tuple[str, list[int], list[int]]:
+    """Shorten prose runs in `source` without changing how it parses.
+
+    Returns:
+        tuple: The skeleton, the skeleton positions where text was removed
+            and the number of characters removed up to each of them.
+    """
+    pieces, cuts, removed = [], [], [0]
+    start = 0
+    for match in _PROSE.finditer(source):
+        kept = [m.end() for m in _NON_SPACE.finditer(match.group())][:2]
+        if len(kept) < 2 or kept[-1] == len(match.group()):
+            continue
+        pieces.append(source[start : match.start() + kept[-1]])
+        start = match.end()
+        cuts.append(match.start() + kept[-1] - removed[-1])
+        removed.append(removed[-1] + len(match.group()) - kept[-1])
+    pieces.append(source[start:])
+    return "".join(pieces), cuts, removed
+
+
+def _line_column(source: str, pos: int) -> tuple[int, int]:
+    line = source.count("\n", 0, pos) + 1
+    return line, pos - source.rfind("\n", 0, pos)
+
+
+class _Linter:
+    def __init__(self, source: str, environments: frozenset[str]):
+        self.source = source
+        self.environments = environments
+        self.skeleton, self.cuts, self.removed = _skeleton(source)
+        self.issues: list[tuple[int, int, str]] = []
+
+    def position(self, pos: int) -> tuple[int, int]:
+        """Line and column in the source of position `pos` in the skeleton."""
+        pos += self.removed[bisect_right(self.cuts, pos)]
+        return _line_column(self.source, pos)
+
+    def add(self, pos: int, message: str):
+        self.issues.append((*self.position(pos), message))
+
+    def run(self) -> list[tuple[int, int, str]]:
+        try:
+            walker = LatexWalker(
+                self.skeleton, latex_context=_latex_context(), tolerant_parsing=False
+            )
+            nodes, _, _ = walker.get_latex_nodes()
+        except LatexWalkerParseError as error:
+            message = error.msg[0].lower() + error.msg[1:]
+            if error.open_contexts:
+                message += "; still open: " + ", ".join(
+                    "{} at {}:{}".format(description, *self.position(pos))
+                    for description, pos, _, _ in error.open_contexts
+                )
+            self.add(len(self.skeleton) if error.pos is None else error.pos, message)
+            return self.issues
+        except LatexWalkerError as error:
+            self.add(len(self.skeleton), str(error))
+            return self.issues
+
+        self.walk(nodes, in_math=False, alignment=False)
+        return self.issues
+
+    def walk(self, nodes, in_math: bool, alignment: bool):
+        for node in nodes or []:
+            if node is None:
+                continue
+            if node.isNodeType(LatexCharsNode):
+                if not in_math:
+                    for match in _TEXT_SPECIALS.finditer(node.chars):
+                        char = match.group()
+                        self.add(
+                            node.pos + match.start(),
+                            f"unescaped '{char}' in text mode, "
+                            f"write '\\{char}' or use math mode",
+                        )
+            elif node.isNodeType(LatexCommentNode):
+                self.add(
+                    node.pos,
+                    "unescaped '%' comments out the rest of the line, write '\\%'",
+                )
+            elif node.isNodeType(LatexSpecialsNode):
+                if node.specials_chars == "&" and not alignment:
+                    self.add(
+                        node.pos,
+                        "unescaped '&' outside a table or alignment, write '\\&'",
+                    )
+            elif node.isNodeType(LatexMathNode):
+                if in_math:
+                    self.add(
+                        node.pos,
+                        f"math delimiter '{node.delimiters[0]}' inside math mode",
+                    )
+                self.walk(node.nodelist, in_math=True, alignment=False)
+            elif node.isNodeType(LatexEnvironmentNode):
+                self.walk_environment(node, in_math)
+            elif node.isNodeType(LatexMacroNode):
+                if node.macroname in VERBATIM_MACROS or node.nodeargd is None:
+                    continue
+                skipped = REFERENCE_MACROS.get(node.macroname, ("", ()))[1]
+                args = [
+                    arg
+                    for index, arg in enumerate(node.nodeargd.argnlist)
+                    if index not in skipped
+                ]
+                arg_math = in_math and node.macroname not in TEXT_MACROS
+                self.walk(args, in_math=arg_math, alignment=False)
+            elif node.isNodeType(LatexGroupNode):
+                self.walk(node.nodelist, in_math=in_math, alignment=alignment)
+
+    def walk_environment(self, node: LatexEnvironmentNode, in_math: bool):
+        name = node.environmentname
+        if name not in self.environments:
+            self.add(node.pos, f"unknown environment '{name}'")
+        if in_math and name in MATH_ENVIRONMENTS:
+            self.add(node.pos, f"environment '{name}' cannot be used inside math mode")
+        if name in VERBATIM_ENVIRONMENTS:
+            return
+        if node.nodeargd is not None:
+            self.walk(node.nodeargd.argnlist, in_math=False, alignment=False)
+        self.walk(
+            node.nodelist,
+            in_math=in_math or name in MATH_ENVIRONMENTS,
+            alignment=name in ALIGNMENT_ENVIRONMENTS,
+        )
+
+
+def lint_latex(
+    source: str, field: str = "text", environments: frozenset[str] = KNOWN_ENVIRONMENTS
+) -> list[LatexIssue]:
+    """Find LaTeX errors in `source` without compiling it.
+
+    Reports unbalanced braces, mismatched or unknown environments, unclosed
+    or nested math delimiters, and '%', '&', '#', '_' and '^' that are not
+    escaped in text mode.
+
+    Args:
+        source: LaTeX source, e.g. a question text.
+        field: Name of the source reported with each issue.
+        environments: Environments considered known.
+    Returns:
+        list[LatexIssue]: Issues, empty if none are found.
+    """
+    if not _LATEX_CHARS.search(source):
+        return []
+    return [
+        LatexIssue(field, line, column, message)
+        for line, column, message in _lint(source, environments)
+    ]
+
+
+# Banks repeat short choices such as "$0$" or "None of the above" many times.
+@lru_cache(maxsize=4096)
+def _lint(
+    source: str, environments: frozenset[str]
+) -> tuple[tuple[int, int, str], ...]:
+    return tuple(_Linter(source, environments).run())
+
+
+def lint_question(
+    question: Question, environments: frozenset[str] = KNOWN_ENVIRONMENTS
+) -> list[LatexIssue]:
+    """Lint the LaTeX of a question's text, choices and explanation.
+
+    Args:
+        question: Question to lint.
+        environments: Environments considered known.
+    Returns:
+        list[LatexIssue]: Issues, with fields named e.g. "text" or "choices[2]".
+    """
+    sources = [("text", question.text)]
+    sources += [
+        (f"choices[{index}]", choice) for index, choice in enumerate(question.choices)
+    ]
+    if question.explanation:
+        sources.append(("explanation", question.explanation))
+
+    issues = []
+    for field, source in sources:
+        issues.extend(lint_latex(source, field, environments))
+    return issues
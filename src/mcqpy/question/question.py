@@ -13,6 +13,7 @@ from mcqpy.question import (
     _norm_caps,
     relativize_paths
 )
+from mcqpy.utils.profiling import stage
 
 # Commit one namespace UUID for your course/repo (don’t change later)
 COURSE_NAMESPACE = uuid.UUID("9f1e0d8c-7f3a-4c02-be3b-3f8f5a2a8f2e")
@@ -20,6 +21,10 @@ COURSE_NAMESPACE = uuid.UUID("9f1e0d8c-7f3a-4c02-be3b-3f8f5a2a8f2e")
 ALLOWED_IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".gif", ".pdf", ".tif", ".tiff"}
 
 
+class ImageNotFoundError(FileNotFoundError):
+    """An image referenced by a question does not exist."""
+
+
 def qid_from_slug(slug: str) -> str:
     return str(uuid.uuid5(COURSE_NAMESPACE, slug))
 
@@ -183,7 +188,7 @@ class Question(BaseModel):
             resolved = p if p.is_absolute() else (base_dir / p).resolve()
 
             if not resolved.exists() or not resolved.is_file():
-                raise FileNotFoundError(f"Image not found: {v} (resolved to: {resolved})")
+                raise ImageNotFoundError(f"Image not found: {v} (resolved to: {resolved})")
             if resolved.suffix.lower() not in ALLOWED_IMAGE_EXTS:
                 raise ValueError(
                     f"Unsupported image extension '{resolved.suffix}'. "
@@ -210,12 +215,15 @@ class Question(BaseModel):
         """Load a Question from a YAML file."""
         import yaml
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        # The libyaml loader is an order of magnitude faster when available.
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with stage("question.load_yaml"), open(filepath, "r", encoding="utf-8") as f:
+            data = yaml.load(f, Loader=loader)
 
         data['path'] = Path(filepath)  # Store the source file path
 
-        return cls.model_validate(data, context={"base_dir": Path(filepath).parent})
+        with stage("question.validate"):
+            return cls.model_validate(data, context={"base_dir": Path(filepath).parent})
 
     def as_yaml(self, path=None) -> str:
         """Serialize the Question to a YAML string."""
@@ -1,6 +1,7 @@
 import numpy as np
 from mcqpy.question import Question
 from mcqpy.question.filter import BaseFilter, CompositeFilter
+from mcqpy.utils.profiling import stage
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal
@@ -29,19 +30,20 @@ class QuestionBank:
     def from_directories(cls, directories: list[str], glob_pattern="*.yaml", **kwargs):
         items = []
         qids, slugs = set(), set()
-        for directory in directories:
-            p = Path(directory)
-            for file_path in p.glob(glob_pattern):
-                question = Question.load_yaml(file_path)
+        with stage("bank.load", directories=len(directories)):
+            for directory in directories:
+                p = Path(directory)
+                for file_path in p.glob(glob_pattern):
+                    question = Question.load_yaml(file_path)
 
-                if question.slug in slugs:
-                    raise ValueError(
-                        f"Duplicate slug found: {question.slug} - {file_path}"
-                    )
+                    if question.slug in slugs:
+                        raise ValueError(
+                            f"Duplicate slug found: {question.slug} - {file_path}"
+                        )
 
-                slugs.add(question.slug)
-                qids.add(question.qid)
-                items.append(BankItem(question, file_path))
+                    slugs.add(question.slug)
+                    qids.add(question.qid)
+                    items.append(BankItem(question, file_path))
 
         return cls(items=items, **kwargs)
 
@@ -70,11 +72,12 @@ class QuestionBank:
         shuffle: bool = False,
         sorting: Literal['none', 'slug'] = "none",
     ) -> list[Question]:
-        if not self._filters:
-            questions = self.get_all_questions()
-        else:
-            comp_filter = CompositeFilter(self._filters)
-            questions = comp_filter.apply(self.get_all_questions())
+        with stage("bank.filter", filters=len(self._filters)):
+            if not self._filters:
+                questions = self.get_all_questions()
+            else:
+                comp_filter = CompositeFilter(self._filters)
+                questions = comp_filter.apply(self.get_all_questions())
 
         if shuffle:
             questions = self._rng.permutation(questions).tolist()
@@ -0,0 +1,153 @@
+import glob
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from mcqpy.utils.parallel import process_pool, resolve_workers, split_chunks
+
+QUESTION_SUFFIXES = (".yaml", ".yml")
+
+# Starting a worker costs about as much as loading a hundred question files.
+MIN_FILES_PER_WORKER = 100
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    path: Path
+    kind: str
+    message: str
+
+
+@dataclass
+class ValidationReport:
+    n_files: int = 0
+    n_valid: int = 0
+    valid_paths: list[Path] = field(default_factory=list)
+    issues: list[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.n_files > 0 and not self.issues
+
+    def counts(self) -> dict[str, int]:
+        """Number of issues of each kind."""
+        counts = defaultdict(int)
+        for issue in self.issues:
+            counts[issue.kind] += 1
+        return dict(counts)
+
+
+def find_question_files(paths: list[str | Path]) -> list[Path]:
+    """Question files given as files, directories (searched recursively) or glob patterns.
+
+    Args:
+        paths: Files, directories or glob patterns.
+    Returns:
+        list[Path]: Sorted question files without duplicates.
+    """
+    files = set()
+    for path in paths:
+        path = Path(path)
+        roots = [path] if path.exists() else [Path(match) for match in glob.glob(str(path), recursive=True)]
+        for root in roots:
+            if root.is_dir():
+                files.update(p for p in root.rglob("*") if p.suffix.lower() in QUESTION_SUFFIXES and p.is_file())
+            elif root == path or root.suffix.lower() in QUESTION_SUFFIXES:
+                files.add(root)
+    return sorted(files)
+
+
+def _describe_error(error: Exception) -> tuple[str, str]:
+    from pydantic import ValidationError
+    from yaml import YAMLError
+
+    from mcqpy.question.question import ImageNotFoundError
+
+    if isinstance(error, ImageNotFoundError):
+        return "missing image", str(error)
+    if isinstance(error, ValidationError):
+        messages = []
+        for detail in error.errors():
+            location = ".".join(str(part) for part in detail["loc"]) or "question"
+            messages.append(f"{location}: {detail['msg']}")
+        return "invalid question", "; ".join(messages)
+    if isinstance(error, YAMLError):
+        return "invalid yaml", " ".join(str(error).split())
+    return "invalid question", f"{type(error).__name__}: {' '.join(str(error).split())}"
+
+
+def _validate_chunk(paths: list[Path], latex: bool = False) -> list[tuple[Path, str | None, str | None, list[tuple[str, str]]]]:
+    """Load each file, returning (path, slug, qid, [(issue kind, message), ...])."""
+    from mcqpy.question import Question
+
+    if latex:
+        from mcqpy.question.latex_lint import lint_question
+
+    results = []
+    for path in paths:
+        try:
+            question = Question.load_yaml(path)
+        except Exception as error:
+            results.append((path, None, None, [_describe_error(error)]))
+            continue
+        issues = [("latex", str(issue)) for issue in lint_question(question)] if latex else []
+        results.append((path, question.slug, question.qid, issues))
+    return results
+
+
+def _duplicates(keys: dict[Path, str], name: str, skip: set[frozenset]) -> list[ValidationIssue]:
+    groups = defaultdict(list)
+    for path, key in keys.items():
+        groups[key].append(path)
+
+    issues = []
+    for key, paths in groups.items():
+        if len(paths) < 2 or frozenset(paths) in skip:
+            continue
+        skip.add(frozenset(paths))
+        for path in paths:
+            others = ", ".join(str(other) for other in paths if other != path)
+            issues.append(ValidationIssue(path, f"duplicate {name}", f"{name} '{key}' also used by {others}"))
+    return issues
+
+
+def validate_questions(paths: list[str | Path], workers: int | None = None, latex: bool = False) -> ValidationReport:
+    """Validate question files and the bank they form.
+
+    Every file is loaded as a Question, on a process pool for large banks,
+    and the loaded questions are checked for duplicate slugs and qids.
+
+    Args:
+        paths: Files, directories (searched recursively) or glob patterns.
+        workers: Number of worker processes, None uses all CPUs.
+        latex: Also lint the LaTeX of each question, see `lint_question`.
+    Returns:
+        ValidationReport: Per-file and bank-level issues.
+    """
+    files = find_question_files(paths)
+    n_workers = resolve_workers(workers, -(-len(files) // MIN_FILES_PER_WORKER))
+    if n_workers == 1:
+        results = _validate_chunk(files, latex)
+    else:
+        with process_pool(n_workers) as executor:
+            futures = [executor.submit(_validate_chunk, chunk, latex) for chunk in split_chunks(files, n_workers * 4)]
+            results = [result for future in futures for result in future.result()]
+
+    report = ValidationReport(n_files=len(files))
+    slugs, qids, invalid = {}, {}, set()
+    for path, slug, qid, issues in results:
+        report.issues.extend(ValidationIssue(path, kind, message) for kind, message in issues)
+        if issues:
+            invalid.add(path)
+        if slug is not None:
+            slugs[path], qids[path] = slug, qid
+
+    # A qid is derived from its slug, so only report qid clashes not explained by a slug clash.
+    seen = set()
+    duplicates = _duplicates(slugs, "slug", seen) + _duplicates(qids, "qid", seen)
+    invalid.update(issue.path for issue in duplicates)
+    report.issues.extend(duplicates)
+    report.issues.sort(key=lambda issue: str(issue.path))
+    report.valid_paths = [path for path in slugs if path not in invalid]
+    report.n_valid = len(report.valid_paths)
+    return report
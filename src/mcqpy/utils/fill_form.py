@@ -1,8 +1,26 @@
+import re
+from io import BytesIO
+from pathlib import Path
+
 import numpy as np
-from pypdf import PdfReader, PdfWriter
+from pypdf import PdfReader
+from pypdf.generic import (
+    ArrayObject,
+    BooleanObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+    TextStringObject,
+)
+
+from mcqpy.compile.fields import parse_checkbox_name, widget_name
+from mcqpy.compile.manifest import Manifest
+from mcqpy.grade.responses import CorrectResponses, PointValueResponses, ResponseModel
+from mcqpy.utils.parallel import process_pool, resolve_workers, split_chunks
 
 
-def get_student_name():
+def get_student_name(rng: np.random.Generator | None = None):
     first_names = [
         "Mikkel",
         "Sofie",
@@ -41,50 +59,339 @@ def get_student_name():
         "Thomsen",
     ]
 
-    return f"{np.random.choice(first_names)} {np.random.choice(last_names)}"
+    rng = rng or np.random.default_rng()
+    return f"{rng.choice(first_names)} {rng.choice(last_names)}"
 
 
-def fill_pdf_form(quiz_path, out_path, index=0, manifest=None, correct_only=False):
-    reader = PdfReader(quiz_path)
-    writer = PdfWriter(fileobj=reader)
+def _serialize(obj) -> bytes:
+    out = BytesIO()
+    obj.write_to_stream(out)
+    return out.getvalue()
 
-    fields = reader.get_fields()
-    keys = list(fields.keys())
-    qid_name_dict = {}
-    for key in keys:
-        qid_idx = key.find("qid")
-        if qid_idx != -1:
-            qid = key[qid_idx + 4 :]
 
-            if qid not in qid_name_dict:
-                qid_name_dict[qid] = [key]
-            else:
-                qid_name_dict[qid].append(key)
+class FormTemplate:
+    """A quiz PDF parsed once and filled many times.
+
+    Filled copies are written as incremental updates: the template bytes
+    followed by new versions of only the changed field objects and a short
+    cross-reference section, a table or a stream like the template's. The
+    template is never cloned, a copy costs little more than writing out the
+    template bytes.
+
+    Args:
+        quiz_path: Path to the quiz PDF.
+    """
+
+    def __init__(self, quiz_path: str | Path):
+        self.path = Path(quiz_path)
+        self._data = Path(quiz_path).read_bytes()
+        reader = PdfReader(BytesIO(self._data))
+        if reader.is_encrypted:
+            raise ValueError(f"{quiz_path} is encrypted and can not be filled")
+
+        # Field name -> (widget reference, field reference), the value is on the
+        # field which is the widget itself or its parent.
+        self._fields: dict[str, tuple[IndirectObject, IndirectObject]] = {}
+        for page in reader.pages:
+            for reference in page.get("/Annots") or []:
+                if not isinstance(reference, IndirectObject):
+                    continue
+                annotation = reference.get_object()
+                name = widget_name(annotation)
+                if name is None:
+                    continue
+                field = reference if "/T" in annotation else annotation.raw_get("/Parent")
+                self._fields[name] = (reference, field)
+
+        options = {}
+        for name in self._fields:
+            parsed = parse_checkbox_name(name)
+            if parsed is not None:
+                options.setdefault(parsed[3], []).append((parsed[1], name))
+        self.questions: dict[str, list[str]] = {
+            qid: [name for _, name in sorted(names)] for qid, names in options.items()
+        }
+
+        startxref = re.findall(rb"startxref\s+(\d+)", self._data[-1024:])
+        if not startxref:
+            raise ValueError(f"{quiz_path} has no cross-reference table")
+
+        # Everything but the changed fields is the same in every copy and is
+        # serialized once here; so are checkbox states, see `_field_update`.
+        self._need_appearances = self._need_appearances_update(reader)
+        size = max([int(reader.trailer["/Size"])] + [ref.idnum + 1 for pair in self._fields.values() for ref in pair])
+        prev = int(startxref[-1])
+        trailer = DictionaryObject(
+            {
+                NameObject("/Size"): NumberObject(size),
+                NameObject("/Root"): reader.trailer.raw_get("/Root"),
+                NameObject("/Prev"): NumberObject(prev),
+            }
+        )
+        for key in ("/Info", "/ID"):
+            if key in reader.trailer:
+                trailer[NameObject(key)] = reader.trailer.raw_get(key)
+        self._trailer = b"trailer\n" + _serialize(trailer)
 
-    update_dict = {}
-    for qid, names in qid_name_dict.items():
-        if manifest:
-            question = manifest.get_item_by_qid(qid)
-            correct_choice = np.argwhere(question.correct_onehot).flatten()[0]
+        # A file with cross-reference streams (PDF 1.5) must be updated with
+        # one, which is a new object numbered `size` with the trailer entries.
+        self._xref_stream = None
+        if not self._data[prev : prev + 32].lstrip().startswith(b"xref"):
+            trailer[NameObject("/Type")] = NameObject("/XRef")
+            trailer[NameObject("/Size")] = NumberObject(size + 1)
+            self._xref_stream = (size, trailer)
+        self._state_updates: dict[tuple[str, str], list[tuple[int, int, bytes]]] = {}
+        self._checkbox_names = None
 
-            if correct_only:
-                name_to_fill = names[correct_choice]
+    def _need_appearances_update(self, reader: PdfReader) -> tuple[int, int, bytes]:
+        """Object that sets `/NeedAppearances`, so viewers draw the filled text."""
+        root_reference = reader.trailer.raw_get("/Root")
+        root = root_reference.get_object()
+        acroform_reference = root.raw_get("/AcroForm")
+        if isinstance(acroform_reference, IndirectObject):
+            reference, acroform = acroform_reference, DictionaryObject(acroform_reference.get_object())
+            updated = acroform
+        else:
+            reference, updated = root_reference, DictionaryObject(root)
+            acroform = DictionaryObject(acroform_reference or {})
+            updated[NameObject("/AcroForm")] = acroform
+        acroform[NameObject("/NeedAppearances")] = BooleanObject(True)
+        return reference.idnum, reference.generation, _serialize(updated)
+
+    @property
+    def field_names(self) -> list[str]:
+        return list(self._fields)
+
+    def checkbox_names(self, manifest: Manifest) -> list[str]:
+        """Checkbox names in the column layout of `AnswerStore.bits` for `manifest`."""
+        if self._checkbox_names is None or self._checkbox_names[0] is not manifest:
+            names = [
+                self.questions[item.qid][option]
+                for item in manifest.items
+                for option in range(len(item.correct_onehot))
+            ]
+            self._checkbox_names = (manifest, names)
+        return self._checkbox_names[1]
+
+    def _field_update(self, name: str, value: str) -> list[tuple[int, int, bytes]]:
+        """New versions of the objects of field `name` holding `value`."""
+        widget_reference, field_reference = self._fields[name]
+        widget = DictionaryObject(widget_reference.get_object())
+        if value.startswith("/"):
+            value = NameObject(value)
+            if value in widget.get("/AP", {}).get("/N", {}):
+                widget[NameObject("/AS")] = value
+        else:
+            value = TextStringObject(value)
+
+        updates = []
+        if field_reference == widget_reference:
+            widget[NameObject("/V")] = value
+        else:
+            field = DictionaryObject(field_reference.get_object())
+            field[NameObject("/V")] = value
+            updates.append((field_reference.idnum, field_reference.generation, _serialize(field)))
+        updates.append((widget_reference.idnum, widget_reference.generation, _serialize(widget)))
+        return updates
+
+    def fill(self, values: dict[str, str]) -> bytes:
+        """Bytes of the template with the fields in `values` filled in.
+
+        Checkbox values are appearance state names such as `/Yes`, any other
+        value is set as text.
+        """
+        objects = [self._need_appearances]
+        for name, value in values.items():
+            if value.startswith("/"):
+                key = (name, value)
+                if key not in self._state_updates:
+                    self._state_updates[key] = self._field_update(name, value)
+                objects.extend(self._state_updates[key])
             else:
-                correct_prob = (
-                    (1 / question.point_value) if question.point_value > 1 else 0.5
-                )
-                other_prob = (1 - correct_prob) / (len(question.correct_onehot) - 1)
-                probs = [other_prob] * len(question.correct_onehot)
-                probs[correct_choice] = correct_prob
-                name_to_fill = np.random.choice(names, p=probs)
+                objects.extend(self._field_update(name, value))
+
+        out = BytesIO()
+        out.write(self._data)
+        if not self._data.endswith(b"\n"):
+            out.write(b"\n")
+        offsets = {}
+        for idnum, generation, body in objects:
+            offsets[idnum] = (out.tell(), generation)
+            out.write(b"%d %d obj\n%s\nendobj\n" % (idnum, generation, body))
+
+        xref = out.tell()
+        if self._xref_stream is not None:
+            out.write(self._xref_stream_object(offsets, xref))
+        else:
+            # Starting with the free-list head keeps readers from treating the
+            # section as a misnumbered table
+            out.write(b"xref\n0 1\n0000000000 65535 f\r\n")
+            for idnum in sorted(offsets):
+                offset, generation = offsets[idnum]
+                out.write(b"%d 1\n%010d %05d n\r\n" % (idnum, offset, generation))
+            out.write(self._trailer)
+        out.write(b"\nstartxref\n%d\n%%%%EOF\n" % xref)
+        return out.getvalue()
+
+    def _xref_stream_object(
+        self, offsets: dict[int, tuple[int, int]], xref: int
+    ) -> bytes:
+        """Cross-reference stream at offset `xref` of the objects at `offsets`."""
+        idnum, trailer = self._xref_stream
+        offsets = {**offsets, idnum: (xref, 0)}
+        width = max(4, (xref.bit_length() + 7) // 8)
+        rows = b"".join(
+            b"\x01" + offset.to_bytes(width, "big") + generation.to_bytes(2, "big")
+            for _, (offset, generation) in sorted(offsets.items())
+        )
+        stream = DictionaryObject(trailer)
+        stream[NameObject("/Index")] = ArrayObject(
+            [NumberObject(value) for number in sorted(offsets) for value in (number, 1)]
+        )
+        stream[NameObject("/W")] = ArrayObject(
+            [NumberObject(1), NumberObject(width), NumberObject(2)]
+        )
+        stream[NameObject("/Length")] = NumberObject(len(rows))
+        return b"%d 0 obj\n%s\nstream\n%s\nendstream\nendobj" % (
+            idnum,
+            _serialize(stream),
+            rows,
+        )
+
+    def write(self, path: str | Path, values: dict[str, str]) -> Path:
+        path = Path(path)
+        path.write_bytes(self.fill(values))
+        return path
+
+
+def random_values(template: FormTemplate, rng: np.random.Generator) -> dict[str, str]:
+    """Tick one box per question, every option equally likely."""
+    return {names[rng.integers(len(names))]: "/Yes" for names in template.questions.values()}
+
+
+def default_response_model(correct_only: bool = False) -> ResponseModel:
+    return CorrectResponses() if correct_only else PointValueResponses()
+
+
+def autofill_path(quiz_path: str | Path, out_path: str | Path, index: int) -> Path:
+    return Path(out_path) / f"{Path(quiz_path).stem}_autofill_{index}.pdf"
+
+
+def fill_pdf_form(
+    quiz_path,
+    out_path,
+    index=0,
+    manifest=None,
+    correct_only=False,
+    rng: np.random.Generator | None = None,
+    template: FormTemplate | None = None,
+    response_model: ResponseModel | None = None,
+    selections: np.ndarray | None = None,
+) -> Path:
+    """Write one randomly answered copy of the quiz form.
+
+    Args:
+        quiz_path: Path to the quiz PDF.
+        out_path: Output directory, the file is named `<quiz>_autofill_<index>.pdf`.
+        index: Index of the form, the student ID is `TID<index>`.
+        manifest: Manifest of the quiz, without it one random box is ticked per question.
+        correct_only: Tick only correct answers.
+        rng: Random generator, a fresh one if not given.
+        template: Parsed quiz form, parsed from `quiz_path` if not given.
+        response_model: Model the answers are drawn from, by default
+            `PointValueResponses` or `CorrectResponses` with `correct_only`.
+        selections: Answers in the column layout of the manifest, drawn from
+            `response_model` if not given.
+    Returns:
+        Path: Path of the filled form.
+    """
+    template = template or FormTemplate(quiz_path)
+    rng = rng or np.random.default_rng()
+    if manifest is None:
+        values = random_values(template, rng)
+    else:
+        if selections is None:
+            model = response_model or default_response_model(correct_only)
+            selections = model.draw(manifest, 1, rng)[0]
+        names = template.checkbox_names(manifest)
+        values = {names[column]: "/Yes" for column in np.flatnonzero(selections)}
+    values.update({"studentname": get_student_name(rng), "studentid": f"TID{index}"})
+    return template.write(autofill_path(quiz_path, out_path, index), values)
+
+
+_worker_template: FormTemplate | None = None
+
+
+def _load_template(quiz_path: str):
+    global _worker_template
+    _worker_template = FormTemplate(quiz_path)
+
+
+def _fill_chunk(quiz_path, out_path, indices, manifest, selections, seed, template=None) -> list[Path]:
+    template = template or _worker_template
+    return [
+        fill_pdf_form(
+            quiz_path,
+            out_path,
+            index=index,
+            manifest=manifest,
+            rng=np.random.default_rng([seed, index]),
+            template=template,
+            selections=None if selections is None else selections[row],
+        )
+        for row, index in enumerate(indices)
+    ]
+
+
+def fill_pdf_forms(
+    quiz_path: str | Path,
+    out_path: str | Path,
+    num_forms: int,
+    manifest: Manifest | None = None,
+    correct_only: bool = False,
+    seed: int | None = None,
+    workers: int | None = None,
+    response_model: ResponseModel | None = None,
+) -> list[Path]:
+    """Write `num_forms` randomly answered copies of the quiz form.
+
+    The answers of all forms are drawn at once from the response model. Every
+    worker process parses the template once and fills a contiguous chunk of
+    forms; form `i` draws its student name from a generator seeded with
+    `(seed, i)`. The output for a given seed does not depend on the number
+    of workers.
 
-        update_dict[name_to_fill] = "/Yes"
+    Args:
+        quiz_path: Path to the quiz PDF.
+        out_path: Output directory.
+        num_forms: Number of forms.
+        manifest: Manifest of the quiz, without it one random box is ticked per question.
+        correct_only: Tick only correct answers.
+        seed: Random seed, a random one if not given.
+        workers: Number of processes, None uses all CPUs.
+        response_model: Model the answers are drawn from, by default
+            `PointValueResponses` or `CorrectResponses` with `correct_only`.
+    Returns:
+        list[Path]: Paths of the filled forms in index order.
+    """
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % 2**63)
+    Path(out_path).mkdir(parents=True, exist_ok=True)
+    quiz_path, out_path = str(quiz_path), str(out_path)
 
-    update_dict.update(
-        {"studentname": f"{get_student_name()}", "studentid": f"TID{index}"}
-    )
+    selections = None
+    if manifest is not None:
+        model = response_model or default_response_model(correct_only)
+        selections = model.draw(manifest, num_forms, np.random.default_rng([seed]))
 
-    writer.update_page_form_field_values(None, update_dict)
+    indices = list(range(num_forms))
+    n_workers = resolve_workers(workers, num_forms)
+    if n_workers == 1:
+        return _fill_chunk(quiz_path, out_path, indices, manifest, selections, seed, template=FormTemplate(quiz_path))
 
-    with open(out_path / f"{quiz_path.stem}_autofill_{index}.pdf", "wb") as output_pdf:
-        writer.write(output_pdf)
+    with process_pool(n_workers, initializer=_load_template, initargs=(quiz_path,)) as executor:
+        futures = []
+        for chunk in split_chunks(indices, n_workers * 4):
+            rows = None if selections is None else selections[chunk[0] : chunk[-1] + 1]
+            futures.append(executor.submit(_fill_chunk, quiz_path, out_path, chunk, manifest, rows, seed))
+        return [path for future in futures for path in future.result()]
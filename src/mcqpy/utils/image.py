@@ -1,5 +1,7 @@
 from pathlib import Path
 
+from mcqpy.utils.profiling import stage
+
 def check_if_url(url: str | Path) -> bool:
     """Check if a given string is a valid URL.
 
@@ -86,7 +88,8 @@ def convert_image(path):
 
 def check_and_download_tmp(url, tmp_name):
     if check_if_url(url):
-        path = download_image(url, tmp_name)
-        convert_image(path)
+        with stage("image.download", url=url):
+            path = download_image(url, tmp_name)
+            convert_image(path)
         return path.resolve()
     return url
\ No newline at end of file
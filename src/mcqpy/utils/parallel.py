@@ -0,0 +1,44 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def resolve_workers(workers: int | None, n_tasks: int) -> int:
+    """Number of worker processes to use for `n_tasks` tasks.
+
+    Args:
+        workers: Requested number of workers, None uses all CPUs.
+        n_tasks: Number of tasks, there is never more than one worker per task.
+    Returns:
+        int: Number of workers, at least 1.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, n_tasks))
+
+
+def split_chunks(items: list, n_chunks: int) -> list[list]:
+    """Split `items` into at most `n_chunks` contiguous chunks of similar size."""
+    n_chunks = max(1, min(n_chunks, len(items)))
+    size, extra = divmod(len(items), n_chunks)
+    chunks, start = [], 0
+    for index in range(n_chunks):
+        stop = start + size + (index < extra)
+        chunks.append(items[start:stop])
+        start = stop
+    return [chunk for chunk in chunks if chunk]
+
+
+def process_pool(workers: int, initializer=None, initargs=()) -> ProcessPoolExecutor:
+    """Process pool that starts workers without forking the calling process.
+
+    Forking a process with running threads (e.g. BLAS or matplotlib) can
+    deadlock, so workers are started by a fork server where available.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(method),
+        initializer=initializer,
+        initargs=initargs,
+    )
@@ -0,0 +1,188 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+_active: "Profiler | None" = None
+_inactive = contextlib.nullcontext()
+
+
+@dataclass
+class StageSummary:
+    name: str
+    depth: int
+    calls: int = 0
+    total: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "args", "start", "depth")
+
+    def __init__(self, profiler: "Profiler", name: str, args: dict):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        stack = self.profiler._stack()
+        self.depth = len(stack)
+        stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+        self.profiler._stack().pop()
+        self.profiler._record(self.name, self.start, end, self.depth, self.args)
+        return False
+
+
+class Profiler:
+    """Records the time spent in named stages.
+
+    Stages are recorded as complete events of the Chrome trace event format,
+    so a trace can be opened in chrome://tracing or https://ui.perfetto.dev.
+    Stages in worker processes of a process pool are not recorded.
+    """
+
+    def __init__(self):
+        self.events: list[dict] = []
+        self.origin = time.perf_counter()
+        self._depths: dict[str, int] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, **args) -> _Stage:
+        """Context manager timing a stage, `args` are stored with the event."""
+        return _Stage(self, name, args)
+
+    def _stack(self) -> list[str]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _record(self, name: str, start: float, end: float, depth: int, args: dict):
+        event = {
+            "name": name,
+            "cat": name.split(".")[0],
+            "ph": "X",
+            "ts": (start - self.origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        with self._lock:
+            self.events.append(event)
+            self._depths.setdefault(name, depth)
+
+    def summary(self) -> list[StageSummary]:
+        """Total time and number of calls of each stage, in order of first start."""
+        stages = {}
+        for event in sorted(self.events, key=lambda event: event["ts"]):
+            name = event["name"]
+            if name not in stages:
+                stages[name] = StageSummary(name, self._depths[name])
+            stages[name].calls += 1
+            stages[name].total += event["dur"] / 1e6
+        return list(stages.values())
+
+    def wall_time(self) -> float:
+        """Seconds from the start of the first to the end of the last stage."""
+        if not self.events:
+            return 0.0
+        start = min(event["ts"] for event in self.events)
+        end = max(event["ts"] + event["dur"] for event in self.events)
+        return (end - start) / 1e6
+
+    def to_chrome_trace(self) -> dict:
+        return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: str | Path) -> Path:
+        """Write the stages as a Chrome trace event JSON file."""
+        path = Path(path)
+        path.write_text(json.dumps(self.to_chrome_trace()))
+        return path
+
+    def table(self, title: str = "Profile"):
+        """Breakdown of the stages as a rich Table, nested stages are indented."""
+        from rich.table import Table
+
+        wall = self.wall_time()
+        table = Table(title=title)
+        table.add_column("Stage")
+        table.add_column("Calls", justify="right")
+        table.add_column("Total (s)", justify="right")
+        table.add_column("Mean (ms)", justify="right")
+        table.add_column("Share", justify="right")
+        for stage in self.summary():
+            share = f"{100 * stage.total / wall:.1f}%" if wall else "-"
+            table.add_row(
+                "  " * stage.depth + stage.name,
+                str(stage.calls),
+                f"{stage.total:.3f}",
+                f"{1e3 * stage.mean:.2f}",
+                share,
+            )
+        return table
+
+
+def stage(name: str, **args):
+    """Time a stage with the active profiler, does nothing if none is active.
+
+    Example:
+        with stage("bank.filter", n_questions=len(questions)):
+            ...
+    """
+    if _active is None:
+        return _inactive
+    return _active.stage(name, **args)
+
+
+@contextlib.contextmanager
+def profiling(profiler: Profiler | None = None):
+    """Make `profiler` (a new one by default) the active profiler within the block."""
+    global _active
+    profiler = profiler or Profiler()
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+
+
+@contextlib.contextmanager
+def profile_command(show: bool, trace: str | Path | None, console, title: str = "Profile"):
+    """Profile a command if `show` or `trace` is set.
+
+    On exit, also after an error, the breakdown is printed if `show` and the
+    Chrome trace is written to `trace` if given.
+
+    Args:
+        show: Print the breakdown of the stages.
+        trace: Path of the Chrome trace event JSON file, or None.
+        console: rich Console to print to.
+        title: Title of the breakdown.
+    """
+    if not (show or trace):
+        yield None
+        return
+
+    profiler = Profiler()
+    try:
+        with profiling(profiler):
+            yield profiler
+    finally:
+        if show:
+            console.print(profiler.table(title))
+        if trace:
+            path = profiler.write_trace(trace)
+            console.print(f"[bold green]Profile trace written to:[/bold green] {path}")